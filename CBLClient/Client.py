@@ -1,17 +1,17 @@
 import json
 
-from requests import Session
 from requests import Response
 from CBLClient.ValueSerializer import ValueSerializer
 from CBLClient.Args import Args
 from keywords.utils import log_info
+from keywords import transport
 
 
 class Client(object):
 
     def __init__(self, base_url):
         self.base_url = base_url
-        self.session = Session()
+        self.session = transport.new_session()
 
     def invokeMethod(self, method, args=None, ignore_deserialize=False):
         resp = Response()
@@ -7,6 +7,7 @@ from keywords import types
 from libraries.data import doc_generators
 from .Document import Document
 from keywords import attachment
+from keywords import document
 
 
 class Database(object):
@@ -221,16 +222,11 @@ class Database(object):
 
         log_info("PUT {} docs to with prefix {}".format(number, id_prefix))
 
-        for i in range(id_start_num, id_start_num + number):
+        if generator not in doc_generators.TEMPLATES:
+            generator = "simple"
+        doc_bodies = doc_generators.generate(generator, number)
 
-            if generator == "four_k":
-                doc_body = doc_generators.four_k()
-            elif generator == "simple_user":
-                doc_body = doc_generators.simple_user()
-            elif generator == "complex_doc":
-                doc_body = doc_generators.complex_doc()
-            else:
-                doc_body = doc_generators.simple()
+        for i, doc_body in enumerate(doc_bodies, start=id_start_num):
 
             if channels is not None:
                 doc_body["channels"] = channels
@@ -253,6 +249,18 @@ class Database(object):
         self.saveDocuments(db, added_docs)
         return list(added_docs.keys())
 
+    def save_bulk_docs(self, database, docs, batch_size=document.BULK_BATCH_SIZE):
+        """
+        Saves 'docs', any iterable of CBL doc bodies keyed by 'id' (ex. document.iter_docs(..., cbl=True)),
+        with one saveDocuments call per 'batch_size' docs. Returns the saved doc ids.
+        """
+
+        doc_ids = []
+        for batch in document.iter_doc_batches(docs, batch_size):
+            self.saveDocuments(database, {doc["id"]: doc for doc in batch})
+            doc_ids.extend(doc["id"] for doc in batch)
+        return doc_ids
+
     def delete_bulk_docs(self, database, doc_ids=[]):
         if not doc_ids:
             doc_ids = self.getDocIds(database)
@@ -1,5 +1,7 @@
 import pytest
 from utilities.xml_parser import custom_rerun_xml_merge, merge_reports
+from keywords import sdk_connections
+from keywords import transport
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -21,6 +23,8 @@ def pytest_runtest_makereport(item, call):
 
 @pytest.hookimpl(trylast=True)
 def pytest_sessionfinish(session, exitstatus):
+    sdk_connections.close()
+    transport.close()
     if session.config.getoption("--merge"):
         paths = session.config.getoption("--merge")
         merge_reports(paths)
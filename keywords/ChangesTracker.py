@@ -2,7 +2,6 @@ import json
 import time
 import logging
 
-import requests
 from requests.exceptions import Timeout
 
 from keywords.MobileRestClient import get_auth_type
@@ -10,6 +9,7 @@ from keywords.constants import AuthType
 from keywords.utils import log_r
 from keywords.utils import log_info
 import keywords.exceptions
+from keywords import transport
 
 
 class ChangesTracker:
@@ -90,7 +90,7 @@ class ChangesTracker:
 
             if auth_type == AuthType.session:
                 try:
-                    resp = requests.post("{}/_changes".format(self.endpoint), data=json.dumps(
+                    resp = transport.post("{}/_changes".format(self.endpoint), data=json.dumps(
                         data), cookies=dict(SyncGatewaySession=self.auth[1]), timeout=request_timeout)
                 except Timeout as to:
                     log_info("Request timed out. Exiting longpoll loop ...")
@@ -98,7 +98,7 @@ class ChangesTracker:
                     break
             elif auth_type == AuthType.http_basic:
                 try:
-                    resp = requests.post("{}/_changes".format(self.endpoint), data=json.dumps(
+                    resp = transport.post("{}/_changes".format(self.endpoint), data=json.dumps(
                         data), auth=self.auth, timeout=request_timeout)
                 except Timeout as to:
                     log_info("Request timed out. Exiting longpoll loop ...")
@@ -106,7 +106,7 @@ class ChangesTracker:
                     break
             else:
                 try:
-                    resp = requests.post("{}/_changes".format(self.endpoint), data=json.dumps(data), timeout=request_timeout)
+                    resp = transport.post("{}/_changes".format(self.endpoint), data=json.dumps(data), timeout=request_timeout)
                 except Timeout as to:
                     log_info("Request timed out. Exiting longpoll loop ...")
                     logging.debug(to)
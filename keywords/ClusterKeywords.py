@@ -259,7 +259,7 @@ class ClusterKeywords:
                 verify_sg_accel_product_info(ac["ip"])
             verify_sg_accel_version(ac["ip"], expected_sync_gateway_version)
 
-    def reset_cluster(self, cluster_config, sync_gateway_config):
+    def reset_cluster(self, cluster_config, sync_gateway_config, fast=None):
         """
         1. Stop sync_gateways
         2. Stop sg_accels
@@ -270,10 +270,13 @@ class ClusterKeywords:
         7. Wait for server to be in 'healthy' state
         8. Deploy sync_gateway config and start
         9. Deploy sg_accel config and start (distributed index mode only)
+
+        With 'fast' (see Cluster.reset) and an unchanged bucket set / configs, 5. and 6. become a bucket flush
+        and playbooks whose inputs have not changed are skipped
         """
 
         cluster = Cluster(config=cluster_config)
-        cluster.reset(sync_gateway_config)
+        cluster.reset(sync_gateway_config, fast=fast)
 
     def provision_cluster(self, cluster_config, server_version, sync_gateway_version, sync_gateway_config, race_enabled=False,
                           sg_ce=False, cbs_platform="centos7", sg_platform="centos", sg_installer_type="msi",
@@ -1,8 +1,6 @@
 import os
 import subprocess
 
-import requests
-
 from keywords.LiteServBase import LiteServBase
 from keywords.constants import LATEST_BUILDS
 from keywords.constants import BINARY_DIR
@@ -11,6 +9,7 @@ from keywords.constants import RELEASED_BUILDS
 from keywords.exceptions import LiteServError
 from keywords.utils import version_and_build
 from keywords.utils import log_info
+from keywords import artifact_cache
 
 
 class LiteServAndroid(LiteServBase):
@@ -49,11 +48,7 @@ class LiteServAndroid(LiteServBase):
             else:
                 url = "{}/couchbase-lite-android/{}/{}/{}".format(LATEST_BUILDS, version, build, package_name)
 
-        log_info("Downloading {} -> {}/{}".format(url, BINARY_DIR, package_name))
-        resp = requests.get(url, verify=False)  # Need to resolve the certificate verification issue for release branch
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, package_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(url, "{}/{}".format(BINARY_DIR, package_name), tls_verify=False)
 
     def install(self):
         """Install the apk to running Android device or emulator"""
@@ -2,8 +2,6 @@ import os
 import subprocess
 from zipfile import ZipFile
 
-import requests
-
 from keywords.LiteServBase import LiteServBase
 from keywords.constants import LATEST_BUILDS
 from keywords.constants import RELEASED_BUILDS
@@ -13,6 +11,7 @@ from keywords.constants import REGISTERED_CLIENT_DBS
 from keywords.exceptions import LiteServError
 from keywords.utils import version_and_build
 from keywords.utils import log_info
+from keywords import artifact_cache
 
 
 class LiteServMacOSX(LiteServBase):
@@ -49,11 +48,7 @@ class LiteServMacOSX(LiteServBase):
         else:
             package_url = "{}/couchbase-lite-ios/{}/ios/{}/{}".format(LATEST_BUILDS, version, build, package_name)
         # Download package to deps/binaries
-        log_info("Downloading: {}".format(package_url))
-        resp = requests.get(package_url, verify=False)
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, package_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(package_url, "{}/{}".format(BINARY_DIR, package_name), tls_verify=False)
 
         # Unzip package
         directory_name = package_name.replace(".zip", "")
@@ -5,7 +5,6 @@ import re
 import time
 from zipfile import ZipFile
 from shutil import copyfile
-import requests
 
 from keywords.LiteServBase import LiteServBase
 from keywords.constants import BINARY_DIR
@@ -17,6 +16,7 @@ from keywords.utils import log_info
 from keywords.utils import log_r
 from keywords.constants import REGISTERED_CLIENT_DBS
 from keywords.constants import CLIENT_REQUEST_TIMEOUT
+from keywords import artifact_cache
 from requests.exceptions import ConnectionError
 
 
@@ -70,11 +70,7 @@ class LiteServiOS(LiteServBase):
         else:
             url = "{}/couchbase-lite-ios/{}/ios/{}/{}".format(LATEST_BUILDS, version, build, package_name)
 
-        log_info("Downloading {} -> {}/{}".format(url, BINARY_DIR, package_name))
-        resp = requests.get(url, verify=False)  # Need to resolve the certificate verification issue for release branch
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, package_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(url, "{}/{}".format(BINARY_DIR, package_name), tls_verify=False)
 
         extracted_directory_name = downloaded_package_zip_name.replace(".zip", "")
         with ZipFile("{}".format(downloaded_package_zip_name)) as zip_f:
@@ -4,13 +4,13 @@ import time
 import uuid
 import re
 
-from requests import Session
 from requests.exceptions import HTTPError
 
 import concurrent.futures
 from concurrent.futures import ThreadPoolExecutor
 
 from keywords import attachment
+from keywords import document
 from libraries.data import doc_generators
 from libraries.provision.ansible_runner import AnsibleRunner
 
@@ -26,6 +26,9 @@ from keywords.SyncGateway import validate_sync_gateway_mode
 
 from keywords.exceptions import RestError, TimeoutException, LiteServError, ChangesError
 from keywords import types
+from keywords import principals
+from keywords import transport
+from libraries.testkit import settings
 
 from requests.auth import HTTPBasicAuth
 
@@ -97,9 +100,8 @@ class MobileRestClient:
 
     def __init__(self):
         headers = {"Content-Type": "application/json"}
-        self._session = Session()
+        self._session = transport.new_session(verify=False)
         self._session.headers = headers
-        self._session.verify = False
 
     def merge(self, *doc_lists):
         """
@@ -403,6 +405,48 @@ class MobileRestClient:
         resp.raise_for_status()
         return name, password
 
+    def create_users(self, url, db, users, auth=None, max_in_flight=settings.MAX_REQUEST_WORKERS):
+        """ Bulk version of create_user. Pipelines PUT /{db}/_user/{name} over the client's keep-alive session.
+
+        'users' is an iterable of dictionaries with 'name', 'password' and optional 'channels' and 'roles'
+        and is consumed lazily. Yields a name password tuple for each user as it is created.
+        Raises BulkProvisioningError (with the failed request bodies in 'failed') once the input
+        is exhausted if any user could not be created.
+        """
+
+        def bodies():
+            for user in users:
+                channels = user.get("channels", user.get("admin_channels", []))
+                roles = user.get("roles", user.get("admin_roles", []))
+                types.verify_is_list(channels)
+                types.verify_is_list(roles)
+                yield principals.user_body(user["name"], user["password"], channels, roles)
+
+        if auth:
+            auth = HTTPBasicAuth(auth[0], auth[1])
+
+        for body in principals.put_principals(self._session, url, db, "user", bodies(), auth=auth, max_in_flight=max_in_flight):
+            yield body["name"], body["password"]
+
+    def create_roles(self, url, db, roles, auth=None, max_in_flight=settings.MAX_REQUEST_WORKERS):
+        """ Bulk version of create_role. Pipelines PUT /{db}/_role/{name} over the client's keep-alive session.
+
+        'roles' is an iterable of dictionaries with 'name' and optional 'channels' and is consumed lazily.
+        Yields each role name as it is created. Failures are reported the same way as create_users.
+        """
+
+        def bodies():
+            for role in roles:
+                channels = role.get("channels", role.get("admin_channels", []))
+                types.verify_is_list(channels)
+                yield principals.role_body(role["name"], channels)
+
+        if auth:
+            auth = HTTPBasicAuth(auth[0], auth[1])
+
+        for body in principals.put_principals(self._session, url, db, "role", bodies(), auth=auth, max_in_flight=max_in_flight):
+            yield body["name"]
+
     def update_user(self, url, db, name, password=None, channels=None, roles=None, disabled=False, auth=None):
         """ Updates a user via the admin REST api
         Returns a name password tuple that can be used for session creation or basic authentication.
@@ -1419,14 +1463,11 @@ class MobileRestClient:
 
         log_info("PUT {} docs to {}/{}/ with prefix {}".format(number, url, db, id_prefix))
 
-        for i in range(number):
+        if generator not in doc_generators.TEMPLATES:
+            generator = "simple"
+        doc_bodies = doc_generators.generate(generator, number)
 
-            if generator == "four_k":
-                doc_body = doc_generators.four_k()
-            elif generator == "simple_user":
-                doc_body = doc_generators.simple_user()
-            else:
-                doc_body = doc_generators.simple()
+        for i, doc_body in enumerate(doc_bodies):
 
             if channels is not None:
                 doc_body["channels"] = channels
@@ -1491,6 +1532,20 @@ class MobileRestClient:
 
         return resp_obj
 
+    def add_bulk_docs_in_batches(self, url, db, docs, auth=None, batch_size=document.BULK_BATCH_SIZE):
+        """
+        Adds 'docs', any iterable of doc bodies (ex. document.iter_docs()), with one POST _bulk_docs per 'batch_size' docs.
+        The docs are consumed lazily, so only one batch is held in memory at a time.
+        Returns the responses for all of the docs.
+        """
+
+        added_docs = []
+        for batch in document.iter_doc_batches(docs, batch_size):
+            added_docs.extend(self.add_bulk_docs(url, db, batch, auth=auth))
+
+        log_info("Added: {} docs to {}/{}".format(len(added_docs), url, db))
+        return added_docs
+
     def delete_bulk_docs(self, url, db, docs, auth=None):
         """
         Issues a bulk delete by setting the _deleted flag to true.
@@ -1,8 +1,6 @@
 import os
 import json
 
-import requests
-from requests import Session
 from requests.auth import HTTPBasicAuth
 from jinja2 import Template
 import time
@@ -23,6 +21,10 @@ from libraries.testkit.syncgateway import get_buckets_from_sync_gateway_config
 from libraries.testkit.cluster import Cluster
 from keywords.utils import host_for_url
 from keywords import document
+from keywords import transport
+from keywords import sdk_connections
+from keywords import sdk_loader
+from keywords import import_monitor
 from keywords.utils import random_string
 from utilities.cluster_config_utils import copy_sgconf_to_temp, replace_string_on_sgw_config, get_cluster
 from utilities.cluster_config_utils import is_centralized_persistent_config_disabled, is_server_tls_skip_verify_enabled, is_admin_auth_disabled, is_tls_server_disabled
@@ -57,7 +59,7 @@ def get_sync_gateway_version(host):
     if sg_ssl_enabled(cluster_config):
         sg_scheme = "https"
 
-    resp = requests.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
+    resp = transport.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
     log_r(resp)
     resp.raise_for_status()
     resp_obj = resp.json()
@@ -89,7 +91,7 @@ def verify_sync_gateway_product_info(host):
     if sg_ssl_enabled(cluster_config):
         sg_scheme = "https"
 
-    resp = requests.get("{}://{}:4984".format(sg_scheme, host), verify=False)
+    resp = transport.get("{}://{}:4984".format(sg_scheme, host), verify=False)
     log_r(resp)
     resp.raise_for_status()
     resp_obj = resp.json()
@@ -151,7 +153,7 @@ def get_sg_accel_version(host):
     if sg_ssl_enabled(cluster_config):
         sg_scheme = "https"
 
-    resp = requests.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
+    resp = transport.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
     log_r(resp)
     resp.raise_for_status()
     resp_obj = resp.json()
@@ -178,7 +180,7 @@ def verify_sg_accel_product_info(host):
     if sg_ssl_enabled(cluster_config):
         sg_scheme = "https"
 
-    resp = requests.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
+    resp = transport.get("{}://{}:4985".format(sg_scheme, host), verify=False, auth=HTTPBasicAuth('sgw_admin', 'password'))
     log_r(resp)
     resp.raise_for_status()
     resp_obj = resp.json()
@@ -372,7 +374,7 @@ def load_sync_gateway_config(sg_conf, server_url, cluster_config):
 class SyncGateway(object):
 
     def __init__(self):
-        self._session = Session()
+        self._session = transport.new_session()
         self.server_port = ""
         self.server_scheme = "couchbase"
 
@@ -1043,14 +1045,12 @@ def create_docs_via_sdk(cbs_url, cbs_cluster, bucket_name, num_docs, doc_name='d
     cbs_host = host_for_url(cbs_url)
     log_info("Adding docs via SDK...")
     if cbs_cluster.ipv6:
-        connection_url = "couchbase://{}?ipv6=allow".format(re.sub(r'[\[\]]', '', cbs_host))
-    else:
-        connection_url = 'couchbase://{}'.format(cbs_host)
+        cbs_host = re.sub(r'[\[\]]', '', cbs_host)
+    connection_url = sdk_connections.connection_url(cbs_host, ipv6=cbs_cluster.ipv6)
     sdk_client = get_cluster(connection_url, bucket_name)
 
-    sdk_doc_bodies = document.create_docs(doc_name, num_docs)
-    sdk_docs = {doc['_id']: doc for doc in sdk_doc_bodies}
-    sdk_client.upsert_multi(sdk_docs)
+    sdk_docs = {doc['_id']: doc for doc in document.iter_docs(doc_name, num_docs)}
+    sdk_loader.load_docs(sdk_client, sdk_docs.items())
 
     log_info("Adding docs done on CBS")
     return sdk_docs, sdk_client
@@ -1130,18 +1130,13 @@ def update_replication_in_sgw_config(sg_conf_name, sg_mode, repl_remote, repl_re
     return temp_sg_config
 
 
-def wait_until_docs_imported_from_server(sg_admin_url, sg_client, sg_db, expected_docs, prev_import_count, auth=None, timeout=5):
-    sg_expvars = sg_client.get_expvars(sg_admin_url, auth=auth)
-    sg_import_count = sg_expvars["syncgateway"]["per_db"][sg_db]["shared_bucket_import"]["import_count"]
-    count = 0
-    while True:
-        sg_expvars = sg_client.get_expvars(sg_admin_url, auth=auth)
-        sg_import_count = sg_expvars["syncgateway"]["per_db"][sg_db]["shared_bucket_import"]["import_count"]
-        import_count = sg_import_count - prev_import_count
-        if count > timeout or import_count >= expected_docs:
-            break
-        time.sleep(1)
-        count += 1
+def wait_until_docs_imported_from_server(sg_admin_url, sg_client, sg_db, expected_docs, prev_import_count, auth=None,
+                                         timeout=import_monitor.IMPORT_TIMEOUT_SECS, stall_timeout=import_monitor.STALL_TIMEOUT_SECS):
+    """ Waits until 'expected_docs' more docs than 'prev_import_count' have been imported on 'sg_db'.
+    Raises if the import stalls or does not finish in 'timeout' seconds, otherwise returns the import report
+    """
+    monitor = import_monitor.ImportMonitor(sg_client, sg_admin_url, [sg_db], auth=auth, baseline={sg_db: prev_import_count})
+    return monitor.wait(expected_docs, timeout=timeout, stall_timeout=stall_timeout)[sg_db]
 
 
 def replace_xattrs_sync_func_in_config(sg_config, channel, enable_xattrs_key=True):
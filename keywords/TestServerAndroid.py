@@ -1,13 +1,13 @@
 import os
 import subprocess
 
-import requests
 from keywords.TestServerBase import TestServerBase
 from keywords.constants import LATEST_BUILDS, RELEASED_BUILDS
 from keywords.constants import BINARY_DIR
 from keywords.exceptions import LiteServError
 from keywords.utils import version_and_build
 from keywords.utils import log_info
+from keywords import artifact_cache
 
 
 class TestServerAndroid(TestServerBase):
@@ -72,11 +72,7 @@ class TestServerAndroid(TestServerBase):
         else:
             url = "{}/{}/{}/{}/{}".format(LATEST_BUILDS, self.download_source, version, build, self.package_name)
 
-        log_info("Downloading {} -> {}/{}".format(url, BINARY_DIR, self.package_name))
-        resp = requests.get(url, verify=False)
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, self.package_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(url, "{}/{}".format(BINARY_DIR, self.package_name), tls_verify=False)
 
     def install(self):
         """Install the apk to running Android device or emulator"""
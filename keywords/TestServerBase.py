@@ -1,8 +1,8 @@
 import time
 
-from requests.sessions import Session
 from requests.exceptions import ConnectionError
 
+from keywords import transport
 from keywords.constants import MAX_RETRIES
 from keywords.exceptions import LiteServError
 from keywords.utils import log_r
@@ -26,8 +26,7 @@ class TestServerBase(object):
         # For the subclasses, this property may be a file handle or a string
         self.logfile = None
 
-        self.session = Session()
-        self.session.headers['Content-Type'] = 'application/json'
+        self.session = transport.new_session(headers={'Content-Type': 'application/json'})
 
     def download(self, version_build):
         raise NotImplementedError()
@@ -4,8 +4,6 @@ import re
 import shutil
 from zipfile import ZipFile
 
-import requests
-
 from keywords.TestServerBase import TestServerBase
 from keywords.constants import LATEST_BUILDS
 from keywords.constants import BINARY_DIR
@@ -15,6 +13,7 @@ from keywords.exceptions import LiteServError
 from keywords.utils import version_and_build
 from keywords.utils import log_info
 from keywords.utils import has_dot_net4_dot_5
+from keywords import artifact_cache
 
 
 class TestServerNetMono(TestServerBase):
@@ -41,11 +40,7 @@ class TestServerNetMono(TestServerBase):
         download_url = "{}/couchbase-lite-net/{}/{}/LiteServ.zip".format(LATEST_BUILDS, version, build)
 
         downloaded_package_zip_name = "couchbase-lite-net-mono-{}-liteserv.zip".format(self.version_build)
-        log_info("Downloading {} -> {}/{}".format(download_url, BINARY_DIR, downloaded_package_zip_name))
-        resp = requests.get(download_url)
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, downloaded_package_zip_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(download_url, "{}/{}".format(BINARY_DIR, downloaded_package_zip_name))
 
         extracted_directory_name = downloaded_package_zip_name.replace(".zip", "")
         with ZipFile("{}/{}".format(BINARY_DIR, downloaded_package_zip_name)) as zip_f:
@@ -4,7 +4,6 @@ import re
 import time
 from zipfile import ZipFile
 from shutil import copyfile
-import requests
 
 from keywords.TestServerBase import TestServerBase
 from keywords.constants import BINARY_DIR
@@ -14,6 +13,7 @@ from keywords.exceptions import LiteServError
 from keywords.utils import version_and_build
 from keywords.utils import log_info
 from keywords.constants import CLIENT_REQUEST_TIMEOUT
+from keywords import artifact_cache
 from requests.exceptions import ConnectionError
 
 
@@ -121,11 +121,7 @@ class TestServeriOS(TestServerBase):
             else:
                 url = "{}/couchbase-lite-net/{}/{}/{}".format(LATEST_BUILDS, self.version, self.build, self.package_name)
 
-        log_info("Downloading {} -> {}/{}".format(url, BINARY_DIR, self.package_name))
-        resp = requests.get(url, verify=False)
-        resp.raise_for_status()
-        with open("{}/{}".format(BINARY_DIR, self.package_name), "wb") as f:
-            f.write(resp.content)
+        artifact_cache.fetch(url, "{}/{}".format(BINARY_DIR, self.package_name), tls_verify=False)
         extracted_directory_name = downloaded_package_zip_name.replace(".zip", "")
         with ZipFile("{}".format(downloaded_package_zip_name)) as zip_f:
             zip_f.extractall("{}".format(extracted_directory_name))
@@ -0,0 +1,216 @@
+""" Shared, content-addressed cache for downloaded product packages.
+
+Downloads are stored once under '<cache>/sha256/<digest>' and indexed by url in
+'<cache>/manifest.json'. Fetching a url that is already in the manifest (and whose blob
+still matches its checksum) does not touch the network. Interrupted downloads are resumed
+from '<cache>/partial' with a Range request, guarded by If-Range with the ETag (or Last-Modified)
+of the original response, so a partial file is never spliced with bytes of a changed package.
+
+File locks make the cache safe to share between test processes on the same host: only
+one process downloads a given url, the others wait and then use the cached copy.
+The cache location can be changed with the MOBILE_TESTKIT_ARTIFACT_CACHE environment variable.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import concurrent.futures
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (ex. Windows). The cache still works for a single process
+    fcntl = None
+
+from keywords import transport
+from keywords.constants import ARTIFACT_CACHE_DIR
+from keywords.exceptions import ProvisioningError
+from keywords.utils import log_info
+
+CACHE_DIR = os.path.abspath(os.environ.get("MOBILE_TESTKIT_ARTIFACT_CACHE", ARTIFACT_CACHE_DIR))
+CHUNK_SIZE = 1024 * 1024
+MAX_DOWNLOAD_WORKERS = 4
+
+
+def _url_key(url):
+    return hashlib.sha1(url.encode()).hexdigest()
+
+
+def _makedirs(path):
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    _makedirs(os.path.dirname(path))
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _manifest_path(cache_dir):
+    return os.path.join(cache_dir, "manifest.json")
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(_manifest_path(cache_dir)) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+
+def _update_manifest(cache_dir, url, entry):
+    with _file_lock(os.path.join(cache_dir, "locks", "manifest.lock")):
+        manifest = _read_manifest(cache_dir)
+        manifest[url] = entry
+        tmp_path = "{}.{}.tmp".format(_manifest_path(cache_dir), os.getpid())
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=4, sort_keys=True)
+        os.rename(tmp_path, _manifest_path(cache_dir))
+
+
+def _sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _blob_path(cache_dir, sha256):
+    return os.path.join(cache_dir, "sha256", sha256)
+
+
+def _cached_blob(cache_dir, url, sha256=None):
+    """ Returns the blob path for 'url' if it is in the manifest and the blob is intact, otherwise None """
+
+    entry = _read_manifest(cache_dir).get(url)
+    if entry is None or (sha256 is not None and entry["sha256"] != sha256):
+        return None
+
+    blob_path = _blob_path(cache_dir, entry["sha256"])
+    if not os.path.isfile(blob_path) or os.path.getsize(blob_path) != entry["size"]:
+        return None
+    if _sha256_of(blob_path) != entry["sha256"]:
+        log_info("Cached {} is corrupt, downloading again".format(url))
+        os.remove(blob_path)
+        return None
+    return blob_path
+
+
+def _read_validator(validator_path):
+    try:
+        with open(validator_path) as f:
+            return f.read().strip() or None
+    except IOError:
+        return None
+
+
+def _write_validator(validator_path, resp):
+    """ Records the ETag (or Last-Modified) of a download, which a resumed request must still match """
+
+    validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+    if validator is None:
+        if os.path.isfile(validator_path):
+            os.remove(validator_path)
+        return
+    with open(validator_path, "w") as f:
+        f.write(validator)
+
+
+def _download(cache_dir, url, sha256, tls_verify):
+    """ Downloads 'url' into the cache, resuming a previous partial download if there is one """
+
+    partial_path = os.path.join(cache_dir, "partial", _url_key(url))
+    validator_path = "{}.validator".format(partial_path)
+    _makedirs(os.path.dirname(partial_path))
+
+    offset = os.path.getsize(partial_path) if os.path.isfile(partial_path) else 0
+    validator = _read_validator(validator_path)
+    headers = {}
+    if offset and validator is not None:
+        # The server only honours the range if the package has not changed, otherwise it sends all of it
+        headers = {"Range": "bytes={}-".format(offset), "If-Range": validator}
+
+    start = time.time()
+    with transport.get(url, headers=headers, stream=True, verify=tls_verify) as resp:
+        if resp.status_code == 416:
+            # The partial file is already complete (or larger than the remote), start over
+            os.remove(partial_path)
+            if os.path.isfile(validator_path):
+                os.remove(validator_path)
+            return _download(cache_dir, url, sha256, tls_verify)
+        resp.raise_for_status()
+
+        mode = "ab"
+        if resp.status_code != 206:
+            # No partial file, or the server ignored the range request because the package changed
+            mode = "wb"
+            offset = 0
+            _write_validator(validator_path, resp)
+        else:
+            log_info("Resuming download of {} at {} bytes".format(url, offset))
+
+        with open(partial_path, mode) as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+
+    digest = _sha256_of(partial_path)
+    if sha256 is not None and digest != sha256:
+        os.remove(partial_path)
+        raise ProvisioningError("Checksum mismatch for {}: expected {} got {}".format(url, sha256, digest))
+
+    size = os.path.getsize(partial_path)
+    blob_path = _blob_path(cache_dir, digest)
+    _makedirs(os.path.dirname(blob_path))
+    os.rename(partial_path, blob_path)
+    if os.path.isfile(validator_path):
+        os.remove(validator_path)
+    _update_manifest(cache_dir, url, {"sha256": digest, "size": size, "downloaded": time.time()})
+
+    elapsed = time.time() - start
+    log_info("Downloaded {} ({} bytes in {:.1f}s)".format(url, size, elapsed))
+    return blob_path
+
+
+def fetch(url, dest_path, sha256=None, tls_verify=True, cache_dir=None):
+    """ Copies the package at 'url' to 'dest_path', downloading it into the cache only if needed.
+    If 'sha256' is given the package must match it, otherwise the digest of the first download is recorded
+    and used to verify the cached copy from then on.
+    """
+
+    cache_dir = cache_dir or CACHE_DIR
+    with _file_lock(os.path.join(cache_dir, "locks", "{}.lock".format(_url_key(url)))):
+        blob_path = _cached_blob(cache_dir, url, sha256)
+        if blob_path is not None:
+            log_info("Using cached {} -> {}".format(url, dest_path))
+        else:
+            log_info("Downloading {} -> {}".format(url, dest_path))
+            blob_path = _download(cache_dir, url, sha256, tls_verify)
+
+    dest_dir = os.path.dirname(os.path.abspath(dest_path))
+    _makedirs(dest_dir)
+    shutil.copyfile(blob_path, dest_path)
+    return dest_path
+
+
+def fetch_many(downloads, tls_verify=True, max_workers=MAX_DOWNLOAD_WORKERS, cache_dir=None):
+    """ Fetches a list of (url, dest_path) concurrently. Returns the destination paths in order """
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(fetch, url, dest_path, tls_verify=tls_verify, cache_dir=cache_dir)
+            for url, dest_path in downloads
+        ]
+        return [future.result() for future in futures]
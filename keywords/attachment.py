@@ -1,13 +1,18 @@
 import base64
-import random
+import functools
+import io
 import uuid
 
+import numpy
 from PIL import Image
 
 from keywords.constants import DATA_DIR
 from keywords.utils import log_info
 from keywords import types
 
+# Number of seeded pngs kept in memory
+PNG_CACHE_SIZE = 64
+
 
 def generate_png_100_100():
     att = generate_png(100, 100)
@@ -45,31 +50,36 @@ def generate_5_png_100_100():
     return att_one_list + att_two_list + att_three_list + att_four_list + att_five_list
 
 
-def generate_png(width, height):
-    """ Generates a noise rgb images for attachment testing. """
+def generate_png(width, height, seed=None):
+    """ Generates a noise rgb image attachment for attachment testing.
+    Images with a 'seed' are reproducible and cached, so asking for the same seed again is free.
+    Without a seed every call returns new noise.
+    """
 
-    img = Image.new("RGBA", (width, height), 255)
-    random_rgb_grid = [(
-        int(random.random() * 256),
-        int(random.random() * 256),
-        int(random.random() * 256)
-    ) for x in [0] * width * height]
+    if seed is None:
+        data = _png_bytes(width, height, numpy.random.default_rng())
+    else:
+        data = _seeded_png_bytes(width, height, seed)
 
-    img.putdata(random_rgb_grid)
+    name = "{}.png".format(str(uuid.uuid4()))
+    log_info("Creating Attachment: {}".format(name))
+    return [Attachment(name, raw=data)]
 
-    image_temp_name = "{}.png".format(str(uuid.uuid4()))
-    image_temp_path = "{}/{}".format(DATA_DIR, image_temp_name)
 
-    # Save temporary image
-    log_info("Saving temporary generated image: {}".format(image_temp_path))
-    img.save(image_temp_path)
+def _png_bytes(width, height, rng):
+    """ Encodes random RGB noise (fully opaque) as a png, in memory """
 
-    # Load and store image data
-    att = load_from_data_dir([image_temp_name])
-    log_info("Creating Attachment: {}".format(image_temp_name))
+    pixels = numpy.full((height, width, 4), 255, dtype=numpy.uint8)
+    pixels[:, :, :3] = rng.integers(0, 256, size=(height, width, 3), dtype=numpy.uint8)
 
-    # Return attachment with generated name and loaded image data
-    return att
+    png = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(png, format="PNG")
+    return png.getvalue()
+
+
+@functools.lru_cache(maxsize=PNG_CACHE_SIZE)
+def _seeded_png_bytes(width, height, seed):
+    return _png_bytes(width, height, numpy.random.default_rng(seed))
 
 
 def load_from_data_dir(names):
@@ -80,14 +90,31 @@ def load_from_data_dir(names):
     for name in names:
         file_path = "{}/{}".format(DATA_DIR, name)
         log_info("Loading attachment from file: {}".format(file_path))
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            data = base64.standard_b64encode(f.read().encode())
-            atts.append(Attachment(name, data))
+        with open(file_path, 'rb') as f:
+            atts.append(Attachment(name, raw=f.read()))
     return atts
 
 
 class Attachment:
+    """ An attachment's name and content. The content is available as 'raw' bytes (ex. for binary attachment PUTs)
+    or as base64 'data' (for a document's '_attachments'). Each form is computed once, only when it is first used.
+    """
 
-    def __init__(self, name, data):
+    def __init__(self, name, data=None, raw=None):
+        if data is None and raw is None:
+            raise ValueError("Attachment needs 'data' or 'raw' content")
         self.name = name
-        self.data = data
+        self._data = data
+        self._raw = raw
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = base64.standard_b64encode(self._raw)
+        return self._data
+
+    @property
+    def raw(self):
+        if self._raw is None:
+            self._raw = base64.standard_b64decode(self._data)
+        return self._raw
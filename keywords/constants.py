@@ -1,6 +1,7 @@
 from enum import Enum
 
 BINARY_DIR = "deps/binaries"
+ARTIFACT_CACHE_DIR = "deps/cache"
 LATEST_BUILDS = "http://latestbuilds.service.couchbase.com/builds/latestbuilds"
 RELEASED_BUILDS = "http://latestbuilds.service.couchbase.com/builds/releases/mobile"
 RESULTS_DIR = "results"
@@ -14,6 +15,8 @@ ENVIRONMENT_FILE = "resources/data/environment_file.txt"
 MAX_RETRIES = 10
 
 CLIENT_REQUEST_TIMEOUT = 180
+# Deadline for retrying transient REST errors, ex. a 503 while a bucket warms up
+REST_RETRY_TIMEOUT_SECS = 30
 REBALANCE_TIMEOUT_SECS = 3600
 REMOTE_EXECUTOR_TIMEOUT = 180
 SDK_TIMEOUT = 3600
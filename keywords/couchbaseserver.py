@@ -1,13 +1,10 @@
-import time
 import json
 import requests
 import re
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 from requests.exceptions import ConnectionError, HTTPError, ChunkedEncodingError
-from requests import Session
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 from couchbase.exceptions import CouchbaseException, DocumentNotFoundException
-from couchbase.cluster import QueryIndexManager, PasswordAuthenticator, ClusterTimeoutOptions, ClusterOptions, Cluster
 import keywords.constants
 from keywords.remoteexecutor import RemoteExecutor
 from keywords.exceptions import CBServerError, ProvisioningError, TimeoutError, RBACUserCreationError
@@ -15,7 +12,13 @@ from libraries.provision.ansible_runner import AnsibleRunner
 from keywords.utils import log_r, log_info, log_debug, log_error, hostname_for_url, host_for_url
 from keywords.utils import version_and_build, random_string
 from keywords import types
-from utilities.cluster_config_utils import is_x509_auth, get_cbs_version, is_magma_enabled, is_cbs_ce_enabled, get_cluster
+from keywords import transport
+from keywords import readiness
+from keywords import sdk_connections
+from keywords import server_docs
+from keywords import sdk_loader
+from utilities.cluster_config_utils import is_x509_auth, get_cbs_version, is_magma_enabled, is_cbs_ce_enabled
+from libraries.testkit import settings
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
 
@@ -29,7 +32,7 @@ def get_server_version(host, cbs_ssl=False):
         server_scheme = "https"
         server_port = 18091
 
-    resp = requests.get("{}://Administrator:password@{}:{}/pools".format(server_scheme, host, server_port), verify=False)
+    resp = transport.get("{}://Administrator:password@{}:{}/pools".format(server_scheme, host, server_port), verify=False)
     log_r(resp)
     resp.raise_for_status()
     resp_obj = resp.json()
@@ -72,7 +75,6 @@ class CouchbaseServer:
     def __init__(self, url):
         self.url = re.sub(r'[\[\]]', '', url)
         self.cbs_ssl = False
-        self.max_retries = 5
 
         # Strip http prefix and port to store host
 
@@ -87,31 +89,51 @@ class CouchbaseServer:
         self.host = host
         self.remote_executor = RemoteExecutor(self.host)
 
-        self._session = Session()
-        self._session.auth = ("Administrator", "password")
+        self._session = transport.new_session(auth=("Administrator", "password"))
 
         if self.cbs_ssl:
             self._session.verify = False
 
+    def _retry_request(self, send, description, retry_statuses=None, retry_on=()):
+        """ Calls 'send' until it returns a 200 response, backing off between attempts, and returns the last response.
+        If 'retry_statuses' is given, only those status codes are retried. Exceptions in 'retry_on' are retried.
+        """
+
+        responses = []
+
+        def succeeded():
+            resp = send()
+            responses.append(resp)
+            if resp.status_code == 200:
+                return True
+            if retry_statuses is not None and resp.status_code not in retry_statuses:
+                return True
+            log_info("Got {} waiting for {}. Retrying ...".format(resp.status_code, description))
+            return False
+
+        readiness.wait_until(succeeded, description, timeout=keywords.constants.REST_RETRY_TIMEOUT_SECS,
+                             retry_on=retry_on, raise_on_timeout=False)
+        if not responses:
+            raise CBServerError("Could not reach {} while waiting for {}".format(self.url, description))
+        return responses[-1]
+
     def get_bucket_names(self):
         """ Returns list of the bucket names for a given Couchbase Server."""
 
         bucket_names = []
 
-        error_count = 0
+        def get_buckets():
+            resp = self._session.get("{}/pools/default/buckets".format(self.url))
+            log_r(resp)
+            resp.raise_for_status()
+            return resp
+
         # Retry to avoid intermittent Connection issues when getting buckets
-        while True:
-            if error_count == self.max_retries:
-                raise CBServerError("Error! Could not get buckets after retries.")
-            try:
-                resp = self._session.get("{}/pools/default/buckets".format(self.url))
-                log_r(resp)
-                resp.raise_for_status()
-                break
-            except ConnectionError:
-                log_info("Hit a ConnectionError while trying to get buckets. Retrying ...")
-                error_count += 1
-                time.sleep(1)
+        try:
+            resp = readiness.wait_until(get_buckets, "bucket list", timeout=keywords.constants.REST_RETRY_TIMEOUT_SECS,
+                                        retry_on=(ConnectionError,))
+        except TimeoutError:
+            raise CBServerError("Error! Could not get buckets after retries.")
 
         obj = json.loads(resp.text)
 
@@ -128,14 +150,8 @@ class CouchbaseServer:
         if server_major_version >= 5:
             self._delete_internal_rbac_bucket_user(name)
 
-        count = 0
-        max_retries = 5
-        while count < max_retries:
-            resp = self._session.delete("{0}/pools/default/buckets/{1}".format(self.url, name))
-            if resp.status_code == 200:
-                log_info("delete bucket request has been successfully processed.")
-                break
-            count += 1
+        resp = self._retry_request(lambda: self._session.delete("{0}/pools/default/buckets/{1}".format(self.url, name)),
+                                   "bucket {} to be deleted".format(name))
         log_r(resp)
         resp.raise_for_status()
 
@@ -144,19 +160,13 @@ class CouchbaseServer:
         If the buckets cannot be deleted after 3 tries, an exception will be raised.
         """
 
-        count = 0
-        max_retries = 5
-        while True:
-
-            if count == max_retries:
-                raise CBServerError("Max retries for bucket creation hit. Could not delete buckets!")
-
+        def buckets_deleted():
             # Get a list of the bucket names
             bucket_names = self.get_bucket_names()
 
             if len(bucket_names) == 0:
-                # No buckets to delete. Exit loop
-                break
+                # No buckets to delete
+                return True
 
             log_info("Existing buckets: {}".format(bucket_names))
             log_info("Deleting buckets: {}".format(bucket_names))
@@ -176,100 +186,90 @@ class CouchbaseServer:
                     log_info("Failed to delete bucket: {} Retrying ...".format(ce))
 
             # A 500 error may have occured, query for buckets and try to delete them again
-            if num_failures > 0:
-                time.sleep(5)
-                count += 1
-            else:
-                # All bucket deletions were successful
-                break
+            return num_failures == 0
+
+        try:
+            readiness.wait_until(buckets_deleted, "buckets to be deleted", timeout=keywords.constants.CLIENT_REQUEST_TIMEOUT)
+        except TimeoutError:
+            raise CBServerError("Max retries for bucket deletion hit. Could not delete buckets!")
 
         # Verify the buckets are gone
         bucket_names = self.get_bucket_names()
         if len(bucket_names) != 0:
             raise CBServerError("Failed to delete all of the server buckets!")
 
+        # Cached SDK bucket handles point at the deleted buckets
+        sdk_connections.close(self.host)
+
         # verify all indexes are deleted
-        count = 0
         index_url = self.url.replace("8091", "9102")
-        while count < 5:
+
+        def index_status_cleared():
             resp = self._session.get("{}/getIndexStatus".format(index_url))
-            resp_obj = resp.json()
-            if "status" not in resp_obj:
-                break
-            count += 1
-            time.sleep(60)
+            return "status" not in resp.json()
+
+        readiness.wait_until(index_status_cleared, "index status to clear", timeout=300, raise_on_timeout=False)
+
         query_url = self.url.replace("8091", "8093")
         del_pdstmt_query_data = {"statement": "delete from system:prepareds"}
         verify_pdstmt_query_data = {"statement": "select * from system:prepareds"}
-        resp = self._session.post("{}/query/service".format(query_url), data=del_pdstmt_query_data)
-        resp_obj = resp.json()
+        self._session.post("{}/query/service".format(query_url), data=del_pdstmt_query_data)
         # add verification to make sure all indexes cleared by checking system indexes
         del_indexstmt_query_data = {"statement": "delete from system:indexes"}
         verify_indexstmt_query_data = {"statement": "select * from system:indexes"}
-        resp = self._session.post("{}/query/service".format(query_url), data=del_indexstmt_query_data)
-        resp_obj = resp.json()
+        self._session.post("{}/query/service".format(query_url), data=del_indexstmt_query_data)
 
-        count = 0
-        while count < 5:
-            resp = self._session.post("{}/query/service".format(query_url), data=verify_pdstmt_query_data)
+        def query_returns_nothing(query_data):
+            resp = self._session.post("{}/query/service".format(query_url), data=query_data)
             resp_obj = resp.json()
-            status = resp_obj["status"]
-            result_count = resp_obj["metrics"]["resultCount"]
-            if status == "success":
-                if result_count == 0:
-                    break
-                count += 1
-                time.sleep(15)
+            return resp_obj["status"] == "success" and resp_obj["metrics"]["resultCount"] == 0
 
-        count = 0
-        while count < 5:
-            resp = self._session.post("{}/query/service".format(query_url), data=verify_indexstmt_query_data)
-            resp_obj = resp.json()
-            status = resp_obj["status"]
-            result_count = resp_obj["metrics"]["resultCount"]
-            if status == "success":
-                if result_count == 0:
-                    break
-                count += 1
-                time.sleep(15)
+        readiness.wait_until(lambda: query_returns_nothing(verify_pdstmt_query_data), "system:prepareds to clear",
+                             timeout=75, raise_on_timeout=False)
+        readiness.wait_until(lambda: query_returns_nothing(verify_indexstmt_query_data), "system:indexes to clear",
+                             timeout=75, raise_on_timeout=False)
+
+    def flush_bucket(self, name):
+        """ Flush all of the data in the bucket 'name'. The bucket must have been created with flushEnabled """
+
+        # Server may respond with a 503 while the bucket is still warming up
+        resp = self._retry_request(lambda: self._session.post("{0}/pools/default/buckets/{1}/controller/doFlush".format(self.url, name)),
+                                   "bucket {} to flush".format(name), retry_statuses=[500, 503])
+        log_r(resp)
+        resp.raise_for_status()
+
+    def flush_buckets(self, bucket_names):
+        """ Flush each bucket in 'bucket_names' instead of deleting and recreating them """
+
+        types.verify_is_list(bucket_names)
+        log_info("Flushing buckets: {}".format(bucket_names))
+        for bucket_name in bucket_names:
+            self.flush_bucket(bucket_name)
 
     def wait_for_ready_state(self):
         """
         Verify all server node is in are in a "healthy" state to avoid sync_gateway startup failures
         Work around for this - https://github.com/couchbase/sync_gateway/issues/1745
         """
-        start = time.time()
-        while True:
-
-            elapsed = time.time()
-            if elapsed - start > keywords.constants.CLIENT_REQUEST_TIMEOUT:
-                raise Exception("Timeout: Server not in ready state! {}s".format(elapsed))
 
+        def all_nodes_healthy():
             # Verfy the server is in a "healthy", not "warmup" state
-            try:
-                resp = self._session.get("{}/pools/nodes".format(self.url))
-                log_r(resp)
-            except ConnectionError:
-                # If bringing a server online, there may be some connnection issues. Continue and try again.
-                time.sleep(1)
-                continue
-
+            resp = self._session.get("{}/pools/nodes".format(self.url))
+            log_r(resp)
             resp_obj = resp.json()
 
-            all_nodes_healthy = True
             for node in resp_obj["nodes"]:
                 if node["status"] != "healthy":
-                    all_nodes_healthy = False
                     log_info("Node is still not healthy. Status: {} Retrying ...".format(node["status"]))
-                    time.sleep(1)
+                    return None
+            return resp_obj
 
-            if not all_nodes_healthy:
-                continue
+        # If bringing a server online, there may be some connnection issues. Continue and try again.
+        resp_obj = readiness.wait_until(all_nodes_healthy, "server nodes to be healthy",
+                                        timeout=keywords.constants.CLIENT_REQUEST_TIMEOUT, retry_on=(ConnectionError,))
 
-            log_info("All nodes are healthy")
-            log_debug(resp_obj)
-            # All nodes are heathy if it made it to here
-            break
+        log_info("All nodes are healthy")
+        log_debug(resp_obj)
 
     def _create_internal_rbac_bucket_user(self, bucketname, cluster_config):
         # Create user with username=bucketname and assign role
@@ -296,23 +296,18 @@ class CouchbaseServer:
 
         rbac_url = "{}/settings/rbac/users/local/{}".format(self.url, bucketname)
 
-        resp = None
-        error_count = 0
-        while True:
-            if error_count == self.max_retries:
-                log_info("Error! Could not create RBAC user after retries. ")
-                raise RBACUserCreationError("Error! Could not create RBAC user after retries. ")
-            try:
-                resp = self._session.put(rbac_url, data=data_user_params, auth=('Administrator', 'password'))
-                log_r(resp)
-                resp.raise_for_status()
-                # If request does not throw, exit retry loop
-                break
-            except HTTPError as h:
-                log_info("Hit a ConnectionError while trying to create RBAC user. Retrying ...")
-                log_info("resp code: {}; error: {}".format(resp, h))
-                error_count += 1
-                time.sleep(1)
+        def user_created():
+            resp = self._session.put(rbac_url, data=data_user_params, auth=('Administrator', 'password'))
+            log_r(resp)
+            resp.raise_for_status()
+            return True
+
+        try:
+            readiness.wait_until(user_created, "RBAC user {} to be created".format(bucketname),
+                                 timeout=keywords.constants.REST_RETRY_TIMEOUT_SECS, retry_on=(HTTPError,))
+        except TimeoutError:
+            log_info("Error! Could not create RBAC user after retries. ")
+            raise RBACUserCreationError("Error! Could not create RBAC user after retries. ")
 
     def _delete_internal_rbac_bucket_user(self, bucketname):
         # Delete user with username=bucketname
@@ -376,16 +371,15 @@ class CouchbaseServer:
         """
         Call the Couchbase REST API to get the total memory available on the machine. RAM returned is in mb
         """
-        count = 0
-        mem_total_lowest = None
-        while count < 5 and mem_total_lowest is None:
+        def mem_total_reported():
             resp = self._session.get("{}/pools/default".format(self.url))
             resp.raise_for_status()
             resp_json = resp.json()
             log_info("resp_json of get_total_ram mb : ", resp_json)
-            mem_total_lowest = self._get_mem_total_lowest(resp_json)
-            time.sleep(5)
-            count += 1
+            return self._get_mem_total_lowest(resp_json)
+
+        mem_total_lowest = readiness.wait_until(mem_total_reported, "nodes to report their RAM",
+                                                timeout=keywords.constants.REST_RETRY_TIMEOUT_SECS, raise_on_timeout=False)
         if mem_total_lowest is None:
             raise ProvisioningError("All nodes reported 0MB of RAM available")
 
@@ -422,6 +416,7 @@ class CouchbaseServer:
         """
         # Figure out what total ram available is
         # Divide by number of buckets
+        # Create all of the buckets concurrently and wait once for the server to be healthy
         """
         types.verify_is_list(bucket_names)
 
@@ -431,9 +426,20 @@ class CouchbaseServer:
 
         # Get the amount of RAM to allocate for each server bucket
         per_bucket_ram_mb = self.get_ram_per_bucket(len(bucket_names))
+        server_version = get_server_version(self.host, self.cbs_ssl)
 
-        for bucket_name in bucket_names:
-            self.create_bucket(cluster_config, bucket_name, per_bucket_ram_mb, ipv6)
+        num_workers = min(len(bucket_names), settings.MAX_REQUEST_WORKERS)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(self._create_bucket_and_user, cluster_config, bucket_name, per_bucket_ram_mb, server_version)
+                for bucket_name in bucket_names
+            ]
+            # Raise the first creation failure, if any
+            for future in futures:
+                future.result()
+
+        self._probe_buckets(bucket_names, ipv6)
+        self.wait_for_ready_state()
 
     def create_bucket(self, cluster_config, name, ram_quota_mb=1024, ipv6=False):
         """
@@ -446,9 +452,17 @@ class CouchbaseServer:
         http://docs.couchbase.com/admin/admin/REST/rest-bucket-create.html
         """
 
+        server_version = get_server_version(self.host, self.cbs_ssl)
+        self._create_bucket_and_user(cluster_config, name, ram_quota_mb, server_version)
+        self._probe_buckets([name], ipv6)
+        self.wait_for_ready_state()
+        return name
+
+    def _create_bucket_and_user(self, cluster_config, name, ram_quota_mb, server_version):
+        """ Create the bucket via REST and, for 5.0.0 onwards, the RBAC user with username=bucketname """
+
         log_info("Creating bucket {} with RAM {}".format(name, ram_quota_mb))
 
-        server_version = get_server_version(self.host, self.cbs_ssl)
         server_major_version = int(server_version.split(".")[0])
         data = {
             "name": name,
@@ -479,84 +493,71 @@ class CouchbaseServer:
         if server_major_version >= 5:
             self._create_internal_rbac_bucket_user(name, cluster_config=cluster_config)
 
-        # Create client an retry until KeyNotFound error is thrown
-        try:
-            if self.cbs_ssl and ipv6:
-                connection_url = "couchbases://{}?ssl=no_verify&ipv6=allow".format(self.host)
-            elif self.cbs_ssl and not ipv6:
-                connection_url = "couchbases://{}?ssl=no_verify".format(self.host)
-            elif not self.cbs_ssl and ipv6:
-                connection_url = "couchbase://{}?ipv6=allow".format(self.host)
-            else:
-                connection_url = "couchbase://{}".format(self.host)
-            cluster = get_cluster(connection_url, name)
-            log_info(connection_url, cluster)
-        except DocumentNotFoundException:
-            log_info("Key not found error: Bucket is ready!")
-        except CouchbaseException as e:
-            log_info("Error from server: {} ...".format(e))
+    def _sdk_connection_url(self, ipv6=False):
+        return sdk_connections.connection_url(self.host, tls=self.cbs_ssl, ipv6=ipv6)
 
-        self.wait_for_ready_state()
-        return name
+    def _probe_buckets(self, bucket_names, ipv6=False):
+        """ Open each new bucket over the shared SDK connection so the client sees them before continuing """
+
+        connection_url = self._sdk_connection_url(ipv6)
+        for bucket_name in bucket_names:
+            try:
+                bucket = sdk_connections.get_bucket(connection_url, bucket_name)
+                log_info(connection_url, bucket)
+            except DocumentNotFoundException:
+                log_info("Key not found error: Bucket is ready!")
+            except CouchbaseException as e:
+                log_info("Error from server: {} ...".format(e))
 
     def delete_couchbase_server_cached_rev_bodies(self, bucket, ipv6=False):
         """
         Deletes docs that follow the below format
         _sync:rev:att_doc:34:1-e7fa9a5e6bb25f7a40f36297247ca93e
         """
-        if self.cbs_ssl and ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify&ipv6=allow".format(self.host)
-        elif self.cbs_ssl and not ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify".format(self.host)
-        elif not self.cbs_ssl and ipv6:
-            connection_url = "couchbase://{}?ipv6=allow".format(self.host)
-        else:
-            connection_url = "couchbase://{}".format(self.host)
-        timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=30), query_timeout=timedelta(seconds=600))
-        options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
-        cluster = Cluster(connection_url, options)
-        bucket_obj = cluster.bucket(bucket)
-        log_info("default collection created {}".format(bucket_obj))
-        index_manager = QueryIndexManager(cluster)
-        index_manager.create_primary_index(bucket, ignore_exists=True)
-        cached_rev_doc_ids = []
-        for row in cluster.query("SELECT meta(`{}`) FROM `{}`".format(bucket, bucket)):
-            if row["$1"]["id"].startswith("_sync:rev"):
-                cached_rev_doc_ids.append(row["$1"]["id"])
-
-        log_info("Found temp rev docs: {}".format(cached_rev_doc_ids))
-        for doc_id in cached_rev_doc_ids:
-            log_debug("Removing: {}".format(doc_id))
-            bucket_obj.remove(doc_id)
+        num_deleted = self.delete_server_docs_with_prefix(bucket, "_sync:rev", ipv6=ipv6)
+        log_info("Removed {} temp rev docs".format(num_deleted))
+
+    def scan_server_docs_with_prefix(self, bucket, prefix, ipv6=False):
+        """
+        Yields server doc ids matching a prefix (ex. '_sync:rev:') without loading them all in memory
+        """
+
+        connection_url = self._sdk_connection_url(ipv6)
+        cluster = sdk_connections.get_cluster(connection_url)
+        collection = sdk_connections.get_bucket(connection_url, bucket).default_collection()
+        return server_docs.scan_doc_ids(cluster, collection, bucket, prefix)
 
     def get_server_docs_with_prefix(self, bucket, prefix, ipv6=False):
         """
         Returns server doc ids matching a prefix (ex. '_sync:rev:')
         """
 
-        if self.cbs_ssl and ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify&ipv6=allow".format(self.host)
-        elif self.cbs_ssl and not ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify".format(self.host)
-        elif not self.cbs_ssl and ipv6:
-            connection_url = "couchbase://{}?ipv6=allow".format(self.host)
-        else:
-            connection_url = "couchbase://{}".format(self.host)
-        timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=30), query_timeout=timedelta(seconds=100))
-        options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
-        cluster = Cluster(connection_url, options)
-        bucket_obj = cluster.bucket(bucket)
-        log_info("default collection created {}".format(bucket_obj))
-        index_manager = QueryIndexManager(cluster)
-        index_manager.create_primary_index(bucket, ignore_exists=True)
-        found_ids = []
-        for row in cluster.query("SELECT meta(`{}`) FROM `{}`".format(bucket, bucket)):
-            log_info(row)
-            if row["$1"]["id"].startswith(prefix):
-                found_ids.append(row["$1"]["id"])
-
+        found_ids = list(self.scan_server_docs_with_prefix(bucket, prefix, ipv6=ipv6))
+        log_info("Found {} docs with prefix '{}'".format(len(found_ids), prefix))
         return found_ids
 
+    def delete_server_docs_with_prefix(self, bucket, prefix, ipv6=False, batch_size=server_docs.DELETE_BATCH_SIZE):
+        """
+        Deletes the server docs matching a prefix in concurrent batches while they are being scanned.
+        Returns the number of docs deleted
+        """
+
+        connection_url = self._sdk_connection_url(ipv6)
+        collection = sdk_connections.get_bucket(connection_url, bucket).default_collection()
+        doc_ids = self.scan_server_docs_with_prefix(bucket, prefix, ipv6=ipv6)
+        return server_docs.delete_docs(collection, doc_ids, batch_size=batch_size)
+
+    def load_docs(self, bucket, docs, ipv6=False, **load_options):
+        """
+        Streams (doc_id, body) pairs into the bucket's default collection with batched, concurrent upserts.
+        See sdk_loader.load_docs for 'load_options' (batch_size, target_ops_per_sec, xattrs ...)
+        Returns the load report
+        """
+
+        connection_url = self._sdk_connection_url(ipv6)
+        collection = sdk_connections.get_bucket(connection_url, bucket).default_collection()
+        return sdk_loader.load_docs(collection, docs, **load_options)
+
     def _get_tasks(self):
         """
         Returns the current tasks from the server
@@ -584,44 +585,28 @@ class CouchbaseServer:
         """
 
         # Check that rebalance is in the tasks before polling for its completion
-        start = time.time()
-        found_rebalance = False
-        while not found_rebalance:
-
-            if time.time() - start > keywords.constants.CLIENT_REQUEST_TIMEOUT:
-                raise TimeoutError("Did not find rebalance task!")
-
-            tasks = self._get_tasks()
-            for task in tasks:
-                if task["type"] == "rebalance":
-                    log_info("Rebalance found in tasks!")
-                    found_rebalance = True
-
-            if not found_rebalance:
-                log_info("Did not find rebalance task. Retrying.")
-                time.sleep(1)
+        def rebalance_task_found():
+            if any(task["type"] == "rebalance" for task in self._get_tasks()):
+                log_info("Rebalance found in tasks!")
+                return True
+            log_info("Did not find rebalance task. Retrying.")
+            return False
 
-        start = time.time()
-        while True:
-
-            if time.time() - start > keywords.constants.REBALANCE_TIMEOUT_SECS:
-                raise Exception("wait_for_rebalance_complete: TIMEOUT")
-
-            tasks = self._get_tasks()
+        readiness.wait_until(rebalance_task_found, "rebalance task to appear",
+                             timeout=keywords.constants.CLIENT_REQUEST_TIMEOUT)
 
+        def rebalance_done():
             done_rebalacing = True
-            for task in tasks:
+            for task in self._get_tasks():
                 # loop through each task and see if any rebalance tasks are running
                 task_type = task["type"]
                 task_status = task["status"]
                 log_info("{} is {}".format(task_type, task_status))
                 if task_type == "rebalance" and task_status == "running":
                     done_rebalacing = False
+            return done_rebalacing
 
-            if done_rebalacing:
-                break
-
-            time.sleep(5)
+        readiness.wait_until(rebalance_done, "rebalance to complete", timeout=keywords.constants.REBALANCE_TIMEOUT_SECS)
 
     def add_node(self, server_to_add, services="kv"):
         """
@@ -642,12 +627,7 @@ class CouchbaseServer:
         #  3. Fails because node is in state where it can't be add in yet
         # To work around this:
         #  1. Retry / wait until add node POST command is successful
-        start = time.time()
-        while True:
-
-            if time.time() - start > keywords.constants.CLIENT_REQUEST_TIMEOUT:
-                raise Exception("wait_for_rebalance_complete: TIMEOUT")
-
+        def node_added():
             # Override session headers for this one off request
             resp = self._session.post(
                 "{}/controller/addNode".format(self.url),
@@ -657,13 +637,15 @@ class CouchbaseServer:
 
             log_r(resp)
 
-            # If status of the POST is not 200, retry the request after a second
+            # If status of the POST is not 200, retry the request
             if resp.status_code == 200:
                 log_info("{} added to cluster successfully".format(server_to_add.host))
-                break
-            else:
-                log_info("{}: {}: Could not add {} to cluster. Retrying ...".format(resp.status_code, resp.json(), server_to_add.host))
-                time.sleep(1)
+                return True
+            log_info("{}: {}: Could not add {} to cluster. Retrying ...".format(resp.status_code, resp.json(), server_to_add.host))
+            return False
+
+        readiness.wait_until(node_added, "{} to be added to cluster".format(server_to_add.host),
+                             timeout=keywords.constants.CLIENT_REQUEST_TIMEOUT)
 
     def rebalance_out(self, cluster_servers, server_to_remove):
         """
@@ -689,23 +671,17 @@ class CouchbaseServer:
         data = "{}&{}".format(ejected_node, known_nodes)
 
         log_info("Starting rebalance out: {} with nodes {}".format(server_to_remove.host, data))
+
         # Override session headers for this one off request
-        count = 0
-        max_retries = 5
-        while count < max_retries:
+        def send():
             log_info("trying to rebalance out....")
-            try:
-                resp = self._session.post(
-                    "{}/controller/rebalance".format(self.url),
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    data=data
-                )
-            except HTTPError:
-                log_info("Got http error while trying to rebalance out the server, so trying one more time")
-            if resp.status_code == 200:
-                break
-            count += 1
-            time.sleep(1)
+            return self._session.post(
+                "{}/controller/rebalance".format(self.url),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                data=data
+            )
+
+        resp = self._retry_request(send, "rebalance out of {} to start".format(server_to_remove.host))
         log_r(resp)
         resp.raise_for_status()
 
@@ -744,26 +720,17 @@ class CouchbaseServer:
         log_info("Known nodes: {}".format(data))
 
         # Override session headers for this one off request
-        count = 0
-        max_count = 5
-        while count < max_count:
-            try:
-                log_info("trying to rebalance in....")
-                resp = self._session.post(
-                    "{}/controller/rebalance".format(self.url),
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    data=data
-                )
-                log_r(resp)
-                resp.raise_for_status()
-                if resp.status_code == 200:
-                    break
-            except HTTPError as h:
-                log_info("HTTP ERROR:", str(h))
-            except ConnectionError as e:
-                log_info("connection ERROR:", str(e))
-            count += 1
-            time.sleep(1)
+        def send():
+            log_info("trying to rebalance in....")
+            resp = self._session.post(
+                "{}/controller/rebalance".format(self.url),
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                data=data
+            )
+            log_r(resp)
+            return resp
+
+        self._retry_request(send, "rebalance in of {} to start".format(server_to_add.host), retry_on=(ConnectionError,))
         self._wait_for_rebalance_complete()
         return True
 
@@ -775,21 +742,11 @@ class CouchbaseServer:
         log_info("Setting recover mode to 'delta' for server {}".format(server_to_recover.host))
         data = "otpNode=ns_1@{}&recoveryType=delta".format(server_to_recover.host)
         # Override session headers for this one off request
-        count = 0
-        max_retries = 10
-        while count < max_retries:
-            try:
-                resp = self._session.post(
-                    "{}/controller/setRecoveryType".format(self.url),
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    data=data
-                )
-            except HTTPError:
-                log_info("Got http error while trying to recover the server, so trying one more time")
-            if resp.status_code == 200:
-                break
-            count += 1
-            time.sleep(1)
+        resp = self._retry_request(lambda: self._session.post(
+            "{}/controller/setRecoveryType".format(self.url),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            data=data
+        ), "recovery type of {} to be set".format(server_to_recover.host))
         log_r(resp)
         resp.raise_for_status()
 
@@ -806,24 +763,23 @@ class CouchbaseServer:
     def _verify_stopped(self):
         """Polls until the server url is unreachable"""
 
-        start = time.time()
-        while True:
-            if time.time() - start > keywords.constants.CLIENT_REQUEST_TIMEOUT:
-                raise TimeoutError("Waiting for server to be unreachable but it never was!")
+        def unreachable():
             try:
                 resp = self._session.get("{}/pools".format(self.url))
                 log_r(resp)
                 resp.raise_for_status()
             except ConnectionError:
                 # This is expected and used to determine if a server node has gone offline
-                break
-
+                return True
             except HTTPError as e:
                 # 500 errors may happen as a result of the node going down
                 log_error(e)
-                continue
+            return False
 
-            time.sleep(1)
+        try:
+            readiness.wait_until(unreachable, "server to be unreachable", timeout=keywords.constants.CLIENT_REQUEST_TIMEOUT)
+        except TimeoutError:
+            raise TimeoutError("Waiting for server to be unreachable but it never was!")
 
     def stop(self):
         """Stops a running Couchbase Server via 'service couchbase-server stop'"""
@@ -867,17 +823,9 @@ class CouchbaseServer:
 
     def get_sdk_bucket(self, bucket_name):
         """ Gets an SDK bucket object """
-        if self.cbs_ssl:
-            connection_str = "couchbases://{}?ssl=no_verify".format(self.host)
-        else:
-            connection_str = "couchbase://{}".format(self.host)
-            timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=5),
-                                                    query_timeout=timedelta(seconds=10))
-            options = ClusterOptions(PasswordAuthenticator("Administrator", "password"),
-                                     timeout_options=timeout_options)
-            cluster = Cluster(connection_str, options)
-            cluster.bucket(bucket_name)
-        return cluster
+        connection_url = self._sdk_connection_url()
+        sdk_connections.get_bucket(connection_url, bucket_name)
+        return sdk_connections.get_cluster(connection_url)
 
     def get_package_name(self, version, build_number, cbs_platform="centos7", cbs_ce=False):
         """
@@ -1037,19 +985,8 @@ class CouchbaseServer:
 
     def get_bucket_connection(self, cbs_url, bucket_name, ssl_enabled, cluster):
         cbs_ip = host_for_url(cbs_url)
-        if ssl_enabled and cluster.ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify&ipv6=allow".format(cbs_ip)
-        elif ssl_enabled and not cluster.ipv6:
-            connection_url = "couchbases://{}?ssl=no_verify".format(cbs_ip)
-        elif not ssl_enabled and cluster.ipv6:
-            connection_url = "couchbase://{}?ipv6=allow".format(cbs_ip)
-        else:
-            connection_url = 'couchbase://{}/{}'.format(cbs_ip)
-        timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=30), query_timeout=timedelta(seconds=100))
-        options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
-        cluster = Cluster(connection_url, options)
-        sdk_client = cluster.bucket(bucket_name)
-        return sdk_client
+        connection_url = sdk_connections.connection_url(cbs_ip, tls=ssl_enabled, ipv6=cluster.ipv6)
+        return sdk_connections.get_bucket(connection_url, bucket_name)
 
     def create_scope(self, bucket, scope=None):
         """ Create scope on couchbase server"""
@@ -1135,16 +1072,5 @@ class CouchbaseServer:
 
 
 def get_sdk_client_with_bucket(ssl_enabled, cluster, cbs_ip, cbs_bucket):
-    if ssl_enabled and cluster.ipv6:
-        connection_url = "couchbases://{}?ssl=no_verify&ipv6=allow".format(cbs_ip)
-    elif ssl_enabled and not cluster.ipv6:
-        connection_url = "couchbases://{}?ssl=no_verify".format(cbs_ip)
-    elif not ssl_enabled and cluster.ipv6:
-        connection_url = "couchbase://{}?ipv6=allow".format(cbs_ip)
-    else:
-        connection_url = 'couchbase://{}'.format(cbs_ip)
-    timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=30), query_timeout=timedelta(seconds=100))
-    options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
-    cluster = Cluster(connection_url, options)
-    sdk_client = cluster.bucket(cbs_bucket)
-    return sdk_client
+    connection_url = sdk_connections.connection_url(cbs_ip, tls=ssl_enabled, ipv6=cluster.ipv6)
+    return sdk_connections.get_bucket(connection_url, cbs_bucket)
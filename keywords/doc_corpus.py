@@ -0,0 +1,179 @@
+""" Document corpora: sets of docs written once to disk and replayed identically by every loader.
+
+A corpus is an NDJSON data file (one JSON doc per line, with its id in '_id') split into blocks
+of 'block_size' docs, each block optionally zlib compressed, plus a '<path>.idx' JSON index of
+block offsets and doc ids. Replaying memory maps the data file, so docs are read (and blocks
+decompressed) only when they are used, and any doc can be looked up by id without reading the rest.
+
+The same corpus feeds each loader:
+    MobileRestClient.add_bulk_docs_in_batches(url, db, corpus.rest_docs())
+    sdk_loader.load_docs(collection, corpus.sdk_docs())
+    Database.save_bulk_docs(database, corpus.cbl_docs())
+"""
+
+import json
+import mmap
+import os
+import zlib
+
+from keywords.exceptions import DocumentError
+from keywords.utils import log_info
+from libraries.data import doc_generators
+
+CORPUS_VERSION = 1
+CORPUS_BLOCK_SIZE = 1000
+
+
+def _index_path(path):
+    return "{}.idx".format(path)
+
+
+def write_corpus(path, docs, block_size=CORPUS_BLOCK_SIZE, compress=True):
+    """ Writes 'docs', an iterable of doc bodies that each have an '_id' (ex. document.iter_docs() or captured docs),
+    to a corpus at 'path'. Docs are consumed lazily, one block at a time. Returns the number of docs written.
+    """
+
+    doc_ids = []
+    blocks = []
+    lines = []
+
+    with open(path, "wb") as f:
+
+        def write_block():
+            data = b"".join(lines)
+            if compress:
+                data = zlib.compress(data)
+            blocks.append([f.tell(), len(data)])
+            f.write(data)
+            del lines[:]
+
+        for doc in docs:
+            try:
+                doc_ids.append(doc["_id"])
+            except KeyError:
+                raise DocumentError("Corpus docs need an '_id': {}".format(doc))
+            lines.append(json.dumps(doc, separators=(",", ":")).encode() + b"\n")
+            if len(lines) == block_size:
+                write_block()
+
+        if lines:
+            write_block()
+
+    with open(_index_path(path), "w") as f:
+        json.dump({
+            "version": CORPUS_VERSION,
+            "compressed": compress,
+            "block_size": block_size,
+            "blocks": blocks,
+            "doc_ids": doc_ids
+        }, f)
+
+    log_info("Wrote corpus of {} docs to {} ({} bytes)".format(len(doc_ids), path, os.path.getsize(path)))
+    return len(doc_ids)
+
+
+def generate_corpus(path, template, number, seed, doc_id_prefix="doc", channels=None, block_size=CORPUS_BLOCK_SIZE, compress=True):
+    """ Writes 'number' docs of a doc_generators template (ex. 'simple_user'), generated from 'seed', to a corpus """
+
+    def docs():
+        for i, doc in enumerate(doc_generators.generate(template, number, seed=seed)):
+            doc["_id"] = "{}_{}".format(doc_id_prefix, i)
+            if channels is not None:
+                doc["channels"] = channels
+            yield doc
+
+    return write_corpus(path, docs(), block_size=block_size, compress=compress)
+
+
+class DocCorpus:
+    """ Read only, memory mapped view of a corpus written by write_corpus(). Use as a context manager or call close() """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(_index_path(path)) as f:
+                index = json.load(f)
+        except IOError:
+            raise DocumentError("No corpus index found for {}".format(path))
+
+        if index["version"] != CORPUS_VERSION:
+            raise DocumentError("Unsupported corpus version {} in {}".format(index["version"], path))
+
+        self._compressed = index["compressed"]
+        self._block_size = index["block_size"]
+        self._blocks = index["blocks"]
+        self._doc_ids = index["doc_ids"]
+        self._positions = None
+
+        self._file = open(path, "rb")
+        # mmap can not map an empty file
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._blocks else b""
+
+        # Most reads are sequential or clustered, so keep the last decompressed block
+        self._cached_block = (None, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def doc_ids(self):
+        return list(self._doc_ids)
+
+    def _block_lines(self, block_number):
+        cached_number, cached_lines = self._cached_block
+        if cached_number == block_number:
+            return cached_lines
+
+        offset, length = self._blocks[block_number]
+        data = self._data[offset:offset + length]
+        if self._compressed:
+            data = zlib.decompress(data)
+        lines = data.splitlines()
+        self._cached_block = (block_number, lines)
+        return lines
+
+    def get(self, doc_id):
+        """ Returns the body of 'doc_id', reading only the block that contains it """
+
+        if self._positions is None:
+            self._positions = {doc_id: position for position, doc_id in enumerate(self._doc_ids)}
+
+        try:
+            position = self._positions[doc_id]
+        except KeyError:
+            raise DocumentError("Doc {} is not in corpus {}".format(doc_id, self.path))
+
+        block_number, line_number = divmod(position, self._block_size)
+        return json.loads(self._block_lines(block_number)[line_number])
+
+    def __iter__(self):
+        """ Yields every doc body (with its '_id'), in the order they were written """
+
+        for block_number in range(len(self._blocks)):
+            for line in self._block_lines(block_number):
+                yield json.loads(line)
+
+    def rest_docs(self):
+        """ Yields doc bodies for Sync Gateway _bulk_docs, which take the id as '_id' """
+        return iter(self)
+
+    def sdk_docs(self):
+        """ Yields (doc_id, body) pairs for sdk_loader.load_docs """
+        for doc in self:
+            yield doc.pop("_id"), doc
+
+    def cbl_docs(self):
+        """ Yields doc bodies for CBL saveDocuments, which take the id as 'id' """
+        for doc in self:
+            doc["id"] = doc.pop("_id")
+            yield doc
@@ -1,3 +1,5 @@
+import itertools
+import json
 import logging
 import uuid
 import zlib
@@ -9,6 +11,8 @@ import keywords.exceptions
 
 
 NUM_VBUCKETS = 1024
+# Default number of docs per request when writing docs in bulk
+BULK_BATCH_SIZE = 1000
 
 
 def doc_1k():
@@ -49,13 +53,19 @@ def get_vbucket_number(key):
     """ Return the vbucket number for a given key.
         Taken from https://github.com/abhinavdangeti/cbTools/blob/f51f80b1eec5993a99fe49b45631e880b6835dc8/targetKeys.py#L6
     """
+    if not isinstance(key, bytes):
+        key = key.encode()
     return (((zlib.crc32(key)) >> 16) & 0x7fff) & (NUM_VBUCKETS - 1)
 
 
+def _verify_vbucket_number(vbucket_number):
+    if vbucket_number < 0 or vbucket_number > NUM_VBUCKETS - 1:
+        raise keywords.exceptions.DocumentError("'vbucket_number' must be between 0-{}".format(NUM_VBUCKETS - 1))
+
+
 def generate_doc_id_for_vbucket(vbucket_number):
     """ Returns a random doc id that will hash to a given vbucket. """
-    if vbucket_number < 0 or vbucket_number > 1023:
-        raise keywords.exceptions.DocumentError("'vbucket_number' must be between 0-1023")
+    _verify_vbucket_number(vbucket_number)
 
     # loop over random generated doc ids until the desired vbucket is returned
     while True:
@@ -65,14 +75,70 @@ def generate_doc_id_for_vbucket(vbucket_number):
             return doc_id
 
 
-def generate_doc_ids_for_vbucket(vbucket_number, number_doc_ids):
-    """ Returns a list of generated doc ids that will hash to a given vBucket number """
+def generate_doc_ids_for_vbucket(vbucket_number, number_doc_ids, prefix=None):
+    """ Returns a list of generated doc ids that will hash to a given vBucket number.
+    The ids are '<prefix>_<n>', with a random prefix if 'prefix' is None.
+    """
+
+    index = VBucketIndex(prefix=prefix)
+    return index.doc_ids_for_vbucket(vbucket_number, number_doc_ids)
+
+
+class VBucketIndex:
+    """ Maps vBuckets to doc ids of the form '<prefix>_<n>' that hash to them.
+
+    Candidate ids are hashed in order (n = 0, 1, 2, ...) and every candidate is filed under its vBucket,
+    so building the ids for one vBucket also builds them for all the others. The same prefix always
+    yields the same ids. The index can be saved to and loaded from a file to skip the hashing entirely.
+    """
+
+    # Number of candidate ids hashed between checks for enough ids
+    SCAN_CHUNK = NUM_VBUCKETS * 16
+
+    def __init__(self, prefix=None):
+        self.prefix = prefix if prefix is not None else str(uuid.uuid4())
+        self._scanned = 0
+        self._doc_ids = [[] for _ in range(NUM_VBUCKETS)]
+
+    def _scan(self, number):
+        crc32 = zlib.crc32
+        doc_ids = self._doc_ids
+        prefix = "{}_".format(self.prefix)
+        for n in range(self._scanned, self._scanned + number):
+            doc_id = prefix + str(n)
+            doc_ids[((crc32(doc_id.encode()) >> 16) & 0x7fff) & (NUM_VBUCKETS - 1)].append(doc_id)
+        self._scanned += number
+
+    def doc_ids_for_vbuckets(self, vbucket_numbers, number_doc_ids):
+        """ Returns {vbucket_number: ['number_doc_ids' doc ids that hash to it]} for each of 'vbucket_numbers' """
+
+        vbucket_numbers = list(vbucket_numbers)
+        for vbucket_number in vbucket_numbers:
+            _verify_vbucket_number(vbucket_number)
+
+        while any(len(self._doc_ids[vbucket_number]) < number_doc_ids for vbucket_number in vbucket_numbers):
+            self._scan(self.SCAN_CHUNK)
+
+        return {vbucket_number: self._doc_ids[vbucket_number][:number_doc_ids] for vbucket_number in vbucket_numbers}
+
+    def doc_ids_for_vbucket(self, vbucket_number, number_doc_ids):
+        """ Returns a list of 'number_doc_ids' doc ids that hash to 'vbucket_number' """
+
+        return self.doc_ids_for_vbuckets([vbucket_number], number_doc_ids)[vbucket_number]
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"prefix": self.prefix, "scanned": self._scanned, "doc_ids": self._doc_ids}, f)
 
-    doc_ids = []
-    for _ in range(number_doc_ids):
-        doc_ids.append(generate_doc_id_for_vbucket(vbucket_number))
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            saved = json.load(f)
 
-    return doc_ids
+        index = cls(prefix=saved["prefix"])
+        index._scanned = saved["scanned"]
+        index._doc_ids = saved["doc_ids"]
+        return index
 
 
 def update_prop_generator():
@@ -134,6 +200,20 @@ def create_docs(doc_id_prefix, number, content=None, attachments_generator=None,
         {'channels': [u'NBC', u'ABC'], '_id': 'exp_3_0', '_exp': 3},
         {'channels': [u'NBC', u'ABC'], '_id': 'exp_3_1', '_exp': 3}, ...
     ]
+    Use iter_docs() to avoid building the whole list for large numbers of docs.
+    """
+
+    return list(iter_docs(doc_id_prefix, number, content=content, attachments_generator=attachments_generator,
+                          expiry=expiry, channels=channels, prop_generator=prop_generator))
+
+
+def iter_docs(doc_id_prefix, number, content=None, attachments_generator=None, expiry=None, channels=None, prop_generator=None, cbl=False, start=0):
+    """
+    Lazily yields the document bodies that create_docs() returns, with ids '<doc_id_prefix>_<start>' onwards
+    (or uuids if 'doc_id_prefix' is None). Use 'cbl=True' for CBL documents, which are keyed by 'id'.
+
+    'content', 'channels' and 'expiry' are the same for every doc, so every doc shares them rather than
+    getting its own copy. Replace these values on a doc instead of modifying them in place.
     """
 
     if channels is None:
@@ -144,21 +224,49 @@ def create_docs(doc_id_prefix, number, content=None, attachments_generator=None,
     if attachments_generator is not None:
         types.verify_is_callable(attachments_generator)
 
-    docs = []
+    if prop_generator is not None:
+        types.verify_is_callable(prop_generator)
 
-    for i in range(number):
+    # Fields that are the same for every doc, in the order create_doc() adds them
+    shared_fields = {}
+    if expiry is not None:
+        shared_fields["_exp"] = expiry
+    if content is not None:
+        shared_fields["content"] = content
+    shared_fields["channels"] = channels
+
+    id_key = "id" if cbl else "_id"
+    logging.debug("Creating {} docs with prefix {}: {}".format(number, doc_id_prefix, shared_fields))
+
+    for i in range(start, start + number):
 
         if doc_id_prefix is None:
             doc_id = str(uuid.uuid4())
         else:
             doc_id = "{}_{}".format(doc_id_prefix, i)
 
+        doc = {id_key: doc_id}
+        doc.update(shared_fields)
+
         # Call attachment generator if it has been defined
-        attachments = None
         if attachments_generator is not None:
             attachments = attachments_generator()
+            types.verify_is_list(attachments)
+            if attachments:
+                doc["_attachments"] = {att.name: {"data": att.data} for att in attachments}
 
-        doc = create_doc(doc_id=doc_id, content=content, attachments=attachments, expiry=expiry, channels=channels, prop_generator=prop_generator)
-        docs.append(doc)
+        if prop_generator is not None:
+            doc.update(prop_generator())
 
-    return docs
+        yield doc
+
+
+def iter_doc_batches(docs, batch_size=BULK_BATCH_SIZE):
+    """ Groups an iterable of docs (ex. from iter_docs()) into lists of at most 'batch_size' docs, lazily """
+
+    docs = iter(docs)
+    while True:
+        batch = list(itertools.islice(docs, batch_size))
+        if not batch:
+            return
+        yield batch
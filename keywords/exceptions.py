@@ -72,3 +72,13 @@ class ConnectionError(Error):
 
 class ChunkedEncodingError(Error):
     pass
+
+
+class BulkProvisioningError(RestError):
+    def __init__(self, message, failed):
+        super(BulkProvisioningError, self).__init__(message)
+        self.failed = failed
+
+
+class ImportStallError(TimeoutError):
+    pass
@@ -0,0 +1,167 @@
+""" Tracks Sync Gateway shared bucket import progress from the import count.
+
+The count is read from the sgw_shared_bucket_import_import_count metric on Sync Gateway's
+metrics endpoint (:4986/_metrics) when it is reachable, which is much cheaper to serve than
+the full _expvar document, and from the import_count expvar otherwise.
+
+Polling is adaptive: it polls every PROGRESS_POLL_INTERVAL_SECS while the import makes progress,
+backs off while nothing changes and only polls sub-second once the import is about to finish,
+so the monitor adds little load to the import it is measuring. Progress is reported as docs/sec
+with an ETA, and a wait fails as soon as the import stops making progress instead
+of running out the clock.
+"""
+
+import time
+from urllib.parse import urlparse
+
+from requests.exceptions import RequestException
+
+from keywords import transport
+from keywords import types
+from keywords.exceptions import ImportStallError, TimeoutError
+from keywords.utils import log_debug
+from keywords.utils import log_info
+from libraries.testkit import settings
+from libraries.testkit.prometheus import parse_metrics
+
+IMPORT_COUNT_METRIC = "sgw_shared_bucket_import_import_count"
+MIN_POLL_INTERVAL_SECS = 0.05
+# Poll interval while the import is progressing and not about to finish
+PROGRESS_POLL_INTERVAL_SECS = 0.5
+MAX_POLL_INTERVAL_SECS = 1
+# Poll faster than PROGRESS_POLL_INTERVAL_SECS once the ETA is below this many progress intervals
+NEAR_DONE_INTERVALS = 3
+IMPORT_TIMEOUT_SECS = 600
+# Fail if none of the unfinished databases has imported anything for this long
+STALL_TIMEOUT_SECS = 30
+# Minimum number of seconds between progress log lines
+PROGRESS_INTERVAL_SECS = 5
+
+
+def import_counts(expvars, dbs):
+    """ Returns {db: import_count} for each db in 'dbs' from a Sync Gateway _expvar response """
+    per_db = expvars["syncgateway"]["per_db"]
+    return {db: per_db[db]["shared_bucket_import"]["import_count"] for db in dbs}
+
+
+def metrics_import_counts(samples, dbs):
+    """ Returns {db: import_count} for each db in 'dbs' from parsed _metrics samples.
+    Raises KeyError if the metric is missing for any of them.
+    """
+    counts = {sample.labels.get("database"): sample.value for sample in samples if sample.name == IMPORT_COUNT_METRIC}
+    return {db: int(counts[db]) for db in dbs}
+
+
+def metrics_url_for_admin_url(sg_admin_url):
+    """ Returns the _metrics url served next to the admin url 'sg_admin_url', or None if it is not on the admin port """
+
+    parsed = urlparse(sg_admin_url)
+    if parsed.port != 4985:
+        return None
+    return parsed._replace(netloc="{}:4986".format(parsed.netloc.rsplit(":", 1)[0]), path="/_metrics").geturl()
+
+
+class ImportMonitor:
+    """ Waits for docs written to the server to be imported by Sync Gateway on one or more databases.
+    Counts are relative to 'baseline' ({db: import_count}), which defaults to the counts when the monitor is created.
+
+    Counts are read from 'metrics_url' (by default the _metrics endpoint next to 'sg_admin_url') if it serves
+    the import count for every db, and from the _expvar endpoint otherwise.
+    """
+
+    def __init__(self, sg_client, sg_admin_url, dbs, auth=None, baseline=None, metrics_url=None):
+        types.verify_is_list(dbs)
+        self.sg_client = sg_client
+        self.sg_admin_url = sg_admin_url
+        self.dbs = dbs
+        self.auth = auth
+        self.metrics_url = metrics_url if metrics_url is not None else metrics_url_for_admin_url(sg_admin_url)
+        if self.metrics_url is not None and not self._metrics_available():
+            self.metrics_url = None
+        self.baseline = baseline if baseline is not None else self._read_counts()
+
+    def _read_metrics_counts(self):
+        resp = transport.get(self.metrics_url, auth=self.auth, verify=False, timeout=settings.HTTP_REQ_TIMEOUT)
+        resp.raise_for_status()
+        return metrics_import_counts(parse_metrics(resp.text), self.dbs)
+
+    def _metrics_available(self):
+        try:
+            self._read_metrics_counts()
+        except (RequestException, ValueError, KeyError) as e:
+            log_info("Import count not available from {} ({}), reading it from _expvar".format(self.metrics_url, e))
+            return False
+        return True
+
+    def _read_counts(self):
+        if self.metrics_url is not None:
+            return self._read_metrics_counts()
+        expvars = self.sg_client.get_expvars(self.sg_admin_url, auth=self.auth)
+        return import_counts(expvars, self.dbs)
+
+    def wait(self, expected_docs, timeout=IMPORT_TIMEOUT_SECS, stall_timeout=STALL_TIMEOUT_SECS):
+        """ Blocks until each db has imported 'expected_docs' (a number for every db, or {db: number}).
+        Returns {db: {"imported", "secs", "docs_per_sec"}}.
+        Raises ImportStallError if no progress is made for 'stall_timeout' seconds and
+        TimeoutError if the import is not complete after 'timeout' seconds.
+        """
+
+        if isinstance(expected_docs, dict):
+            expected = expected_docs
+        else:
+            expected = {db: expected_docs for db in self.dbs}
+
+        start = time.time()
+        last_progress = start
+        last_logged = start
+        interval = MIN_POLL_INTERVAL_SECS
+        previous = None
+
+        while True:
+            counts = self._read_counts()
+            now = time.time()
+            elapsed = now - start
+
+            imported = {db: counts[db] - self.baseline[db] for db in expected}
+            remaining = {db: expected[db] - imported[db] for db in expected if imported[db] < expected[db]}
+            if not remaining:
+                break
+
+            rate = sum(imported.values()) / elapsed if elapsed > 0 else 0.0
+            eta = sum(remaining.values()) / rate if rate > 0 else None
+
+            if previous is None or any(imported[db] > previous[db] for db in remaining):
+                last_progress = now
+                # Only poll faster than the progress interval when the import is about to finish
+                if eta is not None and eta < NEAR_DONE_INTERVALS * PROGRESS_POLL_INTERVAL_SECS:
+                    interval = max(MIN_POLL_INTERVAL_SECS, eta / 2)
+                else:
+                    interval = PROGRESS_POLL_INTERVAL_SECS
+            else:
+                interval = min(interval * 2, MAX_POLL_INTERVAL_SECS)
+            previous = imported
+
+            log_debug("Imported: {}, remaining: {}".format(imported, remaining))
+            if now - last_logged >= PROGRESS_INTERVAL_SECS:
+                log_info("Imported {} docs ({:.0f} docs/s), remaining: {}, ETA: {}".format(
+                    sum(imported.values()), rate, remaining, "{:.1f}s".format(eta) if eta is not None else "unknown"
+                ))
+                last_logged = now
+
+            if now - last_progress >= stall_timeout:
+                raise ImportStallError("Import stalled for {}s. Imported: {}, remaining: {}".format(stall_timeout, imported, remaining))
+            if elapsed >= timeout:
+                raise TimeoutError("Import not complete after {}s. Imported: {}, remaining: {}".format(timeout, imported, remaining))
+
+            time.sleep(interval)
+
+        report = {
+            db: {
+                "imported": imported[db],
+                "secs": elapsed,
+                "docs_per_sec": imported[db] / elapsed if elapsed > 0 else 0.0
+            }
+            for db in expected
+        }
+        log_info("Import complete: {}".format(report))
+        return report
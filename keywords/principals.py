@@ -0,0 +1,116 @@
+import json
+import time
+
+import concurrent.futures
+
+from requests.exceptions import ConnectionError, Timeout
+
+from keywords.constants import CLIENT_REQUEST_TIMEOUT
+from keywords.exceptions import BulkProvisioningError
+from keywords.utils import log_debug
+from keywords.utils import log_error
+from libraries.testkit import settings
+
+PRINCIPAL_PATHS = {
+    "user": "_user",
+    "role": "_role"
+}
+
+
+def user_body(name, password, channels=None, roles=None):
+    """ Returns the Admin REST API body for a sync_gateway user """
+    return {
+        "name": name,
+        "password": password,
+        "admin_channels": channels if channels is not None else [],
+        "admin_roles": roles if roles is not None else []
+    }
+
+
+def role_body(name, channels=None):
+    """ Returns the Admin REST API body for a sync_gateway role """
+    return {
+        "name": name,
+        "admin_channels": channels if channels is not None else []
+    }
+
+
+def _put_principal(session, endpoint, principal, auth, max_retries):
+    """ PUT a single principal, retrying connection errors and retryable status codes with exponential backoff.
+    PUT /{db}/_user/{name} is idempotent so retrying a request that actually succeeded is safe.
+    """
+
+    data = json.dumps(principal)
+    for attempt in range(max_retries + 1):
+        backoff = settings.BACKOFF_FACTOR * (2 ** attempt)
+        try:
+            resp = session.put(endpoint, data=data, auth=auth, timeout=CLIENT_REQUEST_TIMEOUT)
+        except (ConnectionError, Timeout) as e:
+            if attempt == max_retries:
+                raise
+            log_debug("PUT {} failed: {}, retrying in {}s".format(endpoint, e, backoff))
+            time.sleep(backoff)
+            continue
+
+        if resp.status_code in settings.ERROR_CODE_LIST and attempt < max_retries:
+            log_debug("PUT {} returned {}, retrying in {}s".format(endpoint, resp.status_code, backoff))
+            time.sleep(backoff)
+            continue
+
+        resp.raise_for_status()
+        return principal
+
+
+def put_principals(session, url, db, principal_type, principals, auth=None,
+                   max_in_flight=settings.MAX_REQUEST_WORKERS, max_retries=settings.MAX_HTTP_RETRIES):
+    """ Pipelines PUT /{db}/_user/{name} or PUT /{db}/_role/{name} over a shared keep-alive 'session'.
+
+    'principals' can be any iterable (ex. a generator) of Admin REST API bodies (see user_body / role_body).
+    It is consumed lazily and at most 'max_in_flight' requests are outstanding, so memory stays proportional
+    to what is in flight rather than the total number of principals.
+
+    Yields each principal body as soon as it has been created (not in input order).
+    Principals that still fail after 'max_retries' do not stop the others. Once the input is exhausted,
+    a BulkProvisioningError is raised with the failed bodies in 'failed' so the call can be resumed with
+    only those.
+    """
+
+    if principal_type not in PRINCIPAL_PATHS:
+        raise ValueError("'principal_type' must be one of {}".format(list(PRINCIPAL_PATHS.keys())))
+
+    if max_in_flight < 1:
+        raise ValueError("'max_in_flight' must be at least 1")
+
+    path = PRINCIPAL_PATHS[principal_type]
+    principals = iter(principals)
+    failed = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        in_flight = {}
+
+        def fill():
+            for principal in principals:
+                endpoint = "{}/{}/{}/{}".format(url, db, path, principal["name"])
+                future = executor.submit(_put_principal, session, endpoint, principal, auth, max_retries)
+                in_flight[future] = principal
+                if len(in_flight) >= max_in_flight:
+                    break
+
+        fill()
+        while in_flight:
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                principal = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    log_error("Failed to create {} {}: {}".format(principal_type, principal["name"], e))
+                    failed.append(principal)
+            fill()
+
+    if failed:
+        raise BulkProvisioningError(
+            "Failed to create {} {}(s): {}".format(len(failed), principal_type, [principal["name"] for principal in failed[:10]]),
+            failed
+        )
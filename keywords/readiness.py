@@ -0,0 +1,89 @@
+import random
+import threading
+import time
+
+from keywords.exceptions import TimeoutError
+from keywords.utils import log_debug
+from keywords.utils import log_info
+from keywords.utils import log_warn
+
+# First poll interval, doubled after each unsuccessful poll up to MAX_DELAY
+INITIAL_DELAY = 0.05
+MAX_DELAY = 5
+# Each interval is randomized by +/- JITTER to avoid many waiters polling in lock step
+JITTER = 0.2
+
+_metrics_lock = threading.Lock()
+_wait_metrics = {}
+
+
+def wait_until(check, description, timeout, initial_delay=INITIAL_DELAY, max_delay=MAX_DELAY,
+               retry_on=(), raise_on_timeout=True):
+    """ Polls 'check' with exponential backoff and jitter until it returns a truthy value, which is returned.
+
+    'timeout' is the overall deadline in seconds. Exceptions in 'retry_on' raised by 'check' are treated
+    as not ready yet. When the deadline is hit a TimeoutError is raised, or if 'raise_on_timeout' is False,
+    a warning is logged and the last result of 'check' is returned.
+
+    How long each wait took is logged and recorded under 'description' (see get_wait_metrics).
+    """
+
+    start = time.time()
+    deadline = start + timeout
+    delay = initial_delay
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            result = check()
+        except retry_on as e:
+            log_debug("Waiting for {}: {}".format(description, e))
+            result = None
+
+        if result:
+            _record_wait(description, time.time() - start, attempts, timed_out=False)
+            return result
+
+        now = time.time()
+        if now >= deadline:
+            elapsed = now - start
+            _record_wait(description, elapsed, attempts, timed_out=True)
+            message = "Timed out after {:.2f}s ({} polls) waiting for {}".format(elapsed, attempts, description)
+            if raise_on_timeout:
+                raise TimeoutError(message)
+            log_warn(message)
+            return result
+
+        sleep_time = min(delay, max_delay) * random.uniform(1 - JITTER, 1 + JITTER)
+        time.sleep(min(sleep_time, deadline - now))
+        delay *= 2
+
+
+def _record_wait(description, elapsed, attempts, timed_out):
+    log_info("Waited {:.3f}s ({} polls) for {}".format(elapsed, attempts, description))
+    with _metrics_lock:
+        metric = _wait_metrics.setdefault(description, {
+            "count": 0,
+            "timeouts": 0,
+            "polls": 0,
+            "total_secs": 0.0,
+            "max_secs": 0.0
+        })
+        metric["count"] += 1
+        metric["polls"] += attempts
+        metric["total_secs"] += elapsed
+        metric["max_secs"] = max(metric["max_secs"], elapsed)
+        if timed_out:
+            metric["timeouts"] += 1
+
+
+def get_wait_metrics():
+    """ Returns description -> {count, timeouts, polls, total_secs, max_secs} for every wait so far """
+    with _metrics_lock:
+        return {description: dict(metric) for description, metric in _wait_metrics.items()}
+
+
+def reset_wait_metrics():
+    with _metrics_lock:
+        _wait_metrics.clear()
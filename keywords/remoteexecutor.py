@@ -1,3 +1,10 @@
+import atexit
+import collections
+import os
+import threading
+
+import concurrent.futures
+
 import paramiko
 import ansible.constants
 
@@ -5,13 +12,67 @@ from keywords.exceptions import RemoteCommandError
 from keywords.utils import log_info
 from keywords.constants import REMOTE_EXECUTOR_TIMEOUT
 
+# Number of output lines kept in memory per stream when running on many hosts
+TAIL_LINES = 200
+SSH_KEEPALIVE_SECS = 30
+
+# One SSH connection per (host, username, password). Each command runs on its own channel
+# over the shared transport, so commands to the same host can run concurrently.
+_connections = {}
+_connections_lock = threading.Lock()
+_connect_locks = collections.defaultdict(threading.Lock)
+
+
+def _get_connection(host, username, password):
+    key = (host, username, password)
+    with _connections_lock:
+        connect_lock = _connect_locks[key]
+
+    with connect_lock:
+        client = _connections.get(key)
+        if client is not None:
+            transport = client.get_transport()
+            if transport is not None and transport.is_active():
+                return client
+            client.close()
+
+        log_info("Connecting to {}".format(host))
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(host, username=username, password=password, banner_timeout=REMOTE_EXECUTOR_TIMEOUT)
+        client.get_transport().set_keepalive(SSH_KEEPALIVE_SECS)
+        _connections[key] = client
+        return client
+
+
+def close_connections():
+    """ Closes all pooled SSH connections """
+
+    with _connections_lock:
+        connections = list(_connections.items())
+        _connections.clear()
+
+    for (host, _, _), client in connections:
+        log_info("Closing connection to {}".format(host))
+        client.close()
+
+
+atexit.register(close_connections)
+
+
+def stream_output(stdio_file_stream, output_file=None, max_lines=None):
+    """ Streams a command's output to the console, or to 'output_file' if given.
+    Returns the lines, or only the last 'max_lines' lines if set.
+    """
 
-def stream_output(stdio_file_stream):
-    lines = []
+    lines = collections.deque(maxlen=max_lines)
     for line in stdio_file_stream:
-        print(line)
+        if output_file is not None:
+            output_file.write(line if line.endswith("\n") else line + "\n")
+        else:
+            print(line)
         lines.append(line)
-    return lines
+    return list(lines)
 
 
 class RemoteExecutor:
@@ -23,66 +84,117 @@ class RemoteExecutor:
     """
 
     def __init__(self, host, sg_platform="centos", username=None, password=None):
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        self.client = client
         self.host = host
         self.sg_platform = sg_platform
         if "[" in self.host:
             self.host = self.host.replace("[", "")
             self.host = self.host.replace("]", "")
         self.username = ansible.constants.DEFAULT_REMOTE_USER
+        self.password = None
         if username is not None:
             self.username = username
             self.password = password
 
-    def execute(self, command):
+    @property
+    def client(self):
+        """ The pooled SSH connection to this host """
+
+        # Only windows, c- and macos hosts log in with a password
+        password = None
+        if self.sg_platform == "windows" or self.sg_platform.startswith("c-") or "macos" in self.sg_platform:
+            password = self.password
+        return _get_connection(self.host, self.username, password)
+
+    def execute(self, command, output_file=None, max_lines=None):
         """Executes a shell command on a remote host.
-        It will stream the stdout and stderr and return an error code
+        It will stream the stdout and stderr and return an error code.
+        If 'output_file' is given, output is appended to that file instead of the console.
+        If 'max_lines' is given, only the last 'max_lines' lines of each stream are returned.
         """
 
-        log_info("Connecting to {}".format(self.host))
         log_info("Running '{}' on host {}".format(command, self.host))
         if self.sg_platform == "windows":
-            self.client.connect(self.host, username=self.username, password=self.password, banner_timeout=REMOTE_EXECUTOR_TIMEOUT)
             command = "cmd /c " + command
             stdin, stdout, stderr = self.client.exec_command(command, timeout=60)
         elif self.sg_platform.startswith("c-"):
-            self.client.connect(self.host, username=self.username, password=self.password,
-                                banner_timeout=REMOTE_EXECUTOR_TIMEOUT)
             stdin, stdout, stderr = self.client.exec_command(command, timeout=60)
         else:
-            if "macos" in self.sg_platform:
-                self.client.connect(self.host, username=self.username, password=self.password, banner_timeout=REMOTE_EXECUTOR_TIMEOUT)
-            else:
-                self.client.connect(self.host, username=self.username, banner_timeout=REMOTE_EXECUTOR_TIMEOUT)
             # get_pty=True is required for sudo commands
             stdin, stdout, stderr = self.client.exec_command(command, get_pty=True)
 
         # We should not be sending / recieving data on the stdin channel so close it
         stdin.close()
 
-        # Stream output to console, and capture all of the output.
-        # TODO: this is not memory efficient and if there is a ton of output, this will blow up
-        stdout_p = stream_output(stdout)
-        stderr_p = stream_output(stderr)
+        if output_file is not None:
+            with open(output_file, "a") as f:
+                stdout_p = stream_output(stdout, f, max_lines)
+                stderr_p = stream_output(stderr, f, max_lines)
+        else:
+            stdout_p = stream_output(stdout, max_lines=max_lines)
+            stderr_p = stream_output(stderr, max_lines=max_lines)
 
         # this will block until the command has completed and will return the error code from
         # the command. If the command does not return an exit status, then -1 is returned
         status = stdout.channel.recv_exit_status()
 
-        log_info("Closing connection to {}".format(self.host))
-        self.client.close()
-
         return status, stdout_p, stderr_p
 
-    def must_execute(self, command):
+    def must_execute(self, command, output_file=None, max_lines=None):
         """This wraps self.execute(command) and throws
         an exception if the status returned is non-zero
         """
 
-        status, stdout_p, stderr_p = self.execute(command)
+        status, stdout_p, stderr_p = self.execute(command, output_file=output_file, max_lines=max_lines)
         if status != 0:
             log_info("{}: {}".format(stdout_p, stderr_p))
             raise RemoteCommandError("command: {} failed on host: {}".format(command, self.host))
         return stdout_p, stderr_p
+
+
+def execute_on_hosts(hosts, command, log_dir, sg_platform="centos", username=None, password=None,
+                     max_lines=TAIL_LINES, max_workers=None):
+    """ Runs 'command' on all 'hosts' concurrently. Each host's output is streamed to
+    '<log_dir>/<host>.log' and only the last 'max_lines' lines are kept in memory.
+
+    Returns {host: (status, stdout_tail, stderr_tail)}. If the command could not be run on a host
+    (ex. the ssh connection failed), that host's result is the exception instead, so one bad host
+    does not hide the results of the others.
+    """
+
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir)
+
+    def run(host):
+        executor = RemoteExecutor(host, sg_platform, username, password)
+        output_file = os.path.join(log_dir, "{}.log".format(executor.host))
+        return executor.execute(command, output_file=output_file, max_lines=max_lines)
+
+    max_workers = max_workers or len(hosts) or 1
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {host: executor.submit(run, host) for host in hosts}
+        for host, future in futures.items():
+            try:
+                results[host] = future.result()
+            except Exception as e:
+                log_info("{}: could not run command: {}".format(host, e))
+                results[host] = e
+    return results
+
+
+def must_execute_on_hosts(hosts, command, log_dir, **kwargs):
+    """ execute_on_hosts that raises a RemoteCommandError naming every host the command failed (or could not run) on """
+
+    results = execute_on_hosts(hosts, command, log_dir, **kwargs)
+    failed = []
+    for host, result in results.items():
+        if isinstance(result, Exception):
+            failed.append("{} ({})".format(host, result))
+            continue
+        status, stdout_p, stderr_p = result
+        if status != 0:
+            log_info("{}: {}: {}".format(host, stdout_p, stderr_p))
+            failed.append(host)
+    if failed:
+        raise RemoteCommandError("command: {} failed on hosts: {} (see {})".format(command, failed, log_dir))
+    return results
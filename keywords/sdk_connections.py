@@ -0,0 +1,147 @@
+""" Process wide registry of Couchbase SDK connections.
+
+Bootstrapping a Cluster takes seconds, so keywords and tests share one Cluster per
+connection string (host, TLS and IPv6 settings) and one Bucket object per bucket on it.
+Connections are created lazily, pinged before reuse when they have been idle for a while,
+and closed at the end of the test session (or when a server's buckets are deleted).
+"""
+
+import atexit
+import threading
+import time
+from datetime import timedelta
+
+from couchbase.cluster import PasswordAuthenticator, ClusterTimeoutOptions, ClusterOptions, Cluster
+from couchbase.diagnostics import PingState
+from couchbase.exceptions import CouchbaseException
+
+from keywords.utils import log_info, log_debug
+
+KV_TIMEOUT_SECS = 30
+QUERY_TIMEOUT_SECS = 600
+# A cached connection is pinged before being handed out if it has not been checked for this long
+HEALTH_CHECK_INTERVAL_SECS = 30
+
+
+class _Connection:
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.buckets = {}
+        self.last_checked = time.time()
+
+
+# Guards _connections and _url_locks
+_lock = threading.Lock()
+_connections = {}
+# One lock per connection string, held while connecting to it
+_url_locks = {}
+
+
+def connection_url(host, tls=False, ipv6=False):
+    """ Returns the SDK connection string for a Couchbase Server host """
+
+    params = []
+    if tls:
+        params.append("ssl=no_verify")
+    if ipv6:
+        params.append("ipv6=allow")
+
+    url = "{}://{}".format("couchbases" if tls else "couchbase", host)
+    if params:
+        url = "{}?{}".format(url, "&".join(params))
+    return url
+
+
+def _host_for_connection_url(url):
+    return url.split("://", 1)[-1].split("?", 1)[0].split("/", 1)[0]
+
+
+def _is_healthy(connection):
+    if time.time() - connection.last_checked < HEALTH_CHECK_INTERVAL_SECS:
+        return True
+
+    try:
+        ping_result = connection.cluster.ping()
+    except CouchbaseException as e:
+        log_info("SDK connection failed health check: {}".format(e))
+        return False
+
+    for reports in ping_result.endpoints.values():
+        if any(report.state == PingState.OK for report in reports):
+            connection.last_checked = time.time()
+            return True
+
+    log_info("SDK connection failed health check: no endpoints reachable")
+    return False
+
+
+def _close_connection(url, connection):
+    log_debug("Closing SDK connection to {}".format(url))
+    # 4.x clusters have close(), the 3.x SDK only has disconnect()
+    try:
+        close_cluster = getattr(connection.cluster, "close", None) or connection.cluster.disconnect
+        close_cluster()
+    except (AttributeError, CouchbaseException) as e:
+        log_info("Error closing SDK connection to {}: {}".format(url, e))
+
+
+def _url_lock(url):
+    with _lock:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+def _get_connection(url):
+    # Pings and bootstraps can block for the whole timeout against a dead node, so they only
+    # hold the lock of their own url. The global lock only guards the registry.
+    with _url_lock(url):
+        with _lock:
+            connection = _connections.get(url)
+
+        if connection is not None and not _is_healthy(connection):
+            with _lock:
+                if _connections.get(url) is connection:
+                    del _connections[url]
+            _close_connection(url, connection)
+            connection = None
+
+        if connection is None:
+            log_info("Bootstrapping SDK connection to {}".format(url))
+            timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=KV_TIMEOUT_SECS),
+                                                    query_timeout=timedelta(seconds=QUERY_TIMEOUT_SECS))
+            options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
+            connection = _Connection(Cluster(url, options))
+            with _lock:
+                _connections[url] = connection
+
+        return connection
+
+
+def get_cluster(url):
+    """ Returns the shared Cluster for the connection string 'url' """
+    return _get_connection(url).cluster
+
+
+def get_bucket(url, bucket_name):
+    """ Returns the shared Bucket 'bucket_name' on the connection string 'url' """
+
+    connection = _get_connection(url)
+    with _url_lock(url):
+        bucket = connection.buckets.get(bucket_name)
+        if bucket is None:
+            bucket = connection.cluster.bucket(bucket_name)
+            connection.buckets[bucket_name] = bucket
+        return bucket
+
+
+def close(host=None):
+    """ Close the shared connections to 'host', or every connection if 'host' is None """
+
+    with _lock:
+        urls = [url for url in _connections if host is None or _host_for_connection_url(url) == host]
+        connections = [(url, _connections.pop(url)) for url in urls]
+
+    for url, connection in connections:
+        _close_connection(url, connection)
+
+
+atexit.register(close)
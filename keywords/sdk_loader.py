@@ -0,0 +1,212 @@
+""" High throughput loading of docs into a Couchbase Server bucket over the SDK.
+
+Docs are streamed from any iterable of (doc_id, body) pairs (see generate_docs and
+docs_from_file) and written with batched upsert_multi calls. A bounded number of batches
+are in flight at once, and the load can be paced to a target ops/sec so it can be used
+to create a known, repeatable import load for Sync Gateway.
+"""
+
+import json
+import time
+
+import concurrent.futures
+
+from couchbase.exceptions import CouchbaseException
+import couchbase.subdocument as SD
+
+from keywords import types
+from keywords.exceptions import CBServerError
+from keywords.utils import log_info
+from libraries.testkit import settings
+
+LOAD_BATCH_SIZE = 500
+# Minimum number of seconds between progress log lines
+PROGRESS_INTERVAL_SECS = 5
+
+
+def generate_docs(doc_id_prefix, number, channels=None, prop_generator=None):
+    """ Yields 'number' (doc_id, body) pairs with ids '<doc_id_prefix>_<i>'.
+    'prop_generator' can be a callable that returns extra properties for each body.
+    """
+
+    if channels is None:
+        channels = []
+    types.verify_is_list(channels)
+
+    for i in range(number):
+        body = {"channels": channels}
+        if prop_generator is not None:
+            body.update(prop_generator())
+        yield "{}_{}".format(doc_id_prefix, i), body
+
+
+def docs_from_file(path):
+    """ Yields (doc_id, body) pairs from a file with one JSON doc per line.
+    The id is taken from the '_id' property, which is not stored in the body.
+    """
+
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            body = json.loads(line)
+            yield body.pop("_id"), body
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _failed_ids(result_or_exception):
+    """ Returns the ids of the keys that failed in an upsert_multi result, or the exception it raised.
+
+    The 4.x SDK returns the failures in 'exceptions'. The 3.x result only has 'all_ok', and the
+    CouchbaseException raised on a failure has a result per key with 'success' set in 'all_results'.
+    """
+
+    exceptions = getattr(result_or_exception, "exceptions", None)
+    if isinstance(exceptions, dict):
+        return list(exceptions.keys())
+
+    if getattr(result_or_exception, "all_ok", False):
+        return []
+
+    all_results = getattr(result_or_exception, "all_results", None)
+    if all_results is None:
+        # A 3.x MultiMutationResult is itself a dict of per key results
+        all_results = result_or_exception if isinstance(result_or_exception, dict) else {}
+    return [doc_id for doc_id, result in all_results.items()
+            if isinstance(result, Exception) or not getattr(result, "success", True)]
+
+
+def _write_batch(collection, batch, xattr_key, xattr_generator):
+    """ Upserts a batch and returns (latency_secs, failed_doc_ids) """
+
+    start = time.time()
+    try:
+        failed = _failed_ids(collection.upsert_multi(batch))
+    except CouchbaseException as e:
+        # The 3.x SDK raises on any failed key, with every key's result in 'all_results'
+        if getattr(e, "all_results", None) is None:
+            raise
+        failed = _failed_ids(e)
+
+    if xattr_key is not None:
+        failed_ids = set(failed)
+        for doc_id in batch:
+            if doc_id in failed_ids:
+                continue
+            try:
+                collection.mutate_in(doc_id, [SD.upsert(xattr_key, xattr_generator(doc_id), xattr=True, create_parents=True)])
+            except CouchbaseException:
+                failed.append(doc_id)
+
+    return time.time() - start, failed
+
+
+def load_docs(collection, docs, batch_size=LOAD_BATCH_SIZE, max_in_flight=settings.MAX_REQUEST_WORKERS,
+              target_ops_per_sec=None, xattr_key=None, xattr_generator=None):
+    """ Upserts 'docs', an iterable of (doc_id, body) pairs that is consumed lazily, into 'collection'.
+
+    At most 'max_in_flight' batches of 'batch_size' docs are outstanding. If 'target_ops_per_sec' is set,
+    batches are paced so that docs are written at no more than that rate. If 'xattr_key' is set, the value
+    returned by 'xattr_generator(doc_id)' is also written to that xattr on each doc.
+
+    Returns a report with the docs written, achieved docs/sec and batch latency percentiles (ms).
+    Failed docs raise a CBServerError after the whole load has been attempted.
+    """
+
+    if batch_size < 1 or max_in_flight < 1:
+        raise ValueError("'batch_size' and 'max_in_flight' must be at least 1")
+    if xattr_key is not None:
+        types.verify_is_callable(xattr_generator)
+
+    docs = iter(docs)
+    latencies = []
+    failed = []
+    num_submitted = 0
+    num_completed = 0
+    start = time.time()
+    last_logged = start
+
+    def next_batch():
+        batch = {}
+        for doc_id, body in docs:
+            batch[doc_id] = body
+            if len(batch) == batch_size:
+                break
+        return batch
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        in_flight = {}
+        exhausted = False
+
+        def fill():
+            nonlocal num_submitted, exhausted
+            while not exhausted and len(in_flight) < max_in_flight:
+                if target_ops_per_sec:
+                    # Wait until the docs already submitted are within the target rate
+                    delay = start + num_submitted / float(target_ops_per_sec) - time.time()
+                    if delay > 0:
+                        if in_flight:
+                            # Collect completed batches instead of sleeping
+                            return
+                        time.sleep(delay)
+                batch = next_batch()
+                if not batch:
+                    exhausted = True
+                    return
+                in_flight[executor.submit(_write_batch, collection, batch, xattr_key, xattr_generator)] = batch
+                num_submitted += len(batch)
+
+        fill()
+        while in_flight:
+            timeout = None
+            if target_ops_per_sec and not exhausted and len(in_flight) < max_in_flight:
+                # Wake up when the next batch is due, otherwise only a completed batch can free a slot
+                delay = start + num_submitted / float(target_ops_per_sec) - time.time()
+                if delay > 0:
+                    timeout = delay
+            done, _ = concurrent.futures.wait(in_flight, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                num_completed += len(batch)
+                try:
+                    latency, batch_failed = future.result()
+                    latencies.append(latency)
+                    failed.extend(batch_failed)
+                except CouchbaseException as e:
+                    log_info("Failed to load batch of {} docs: {}".format(len(batch), e))
+                    failed.extend(batch.keys())
+
+            now = time.time()
+            if now - last_logged >= PROGRESS_INTERVAL_SECS:
+                log_info("Loaded {} docs ({:.0f} docs/s)".format(num_completed - len(failed), num_completed / (now - start)))
+                last_logged = now
+            fill()
+
+    elapsed = time.time() - start
+    latencies.sort()
+    report = {
+        "docs": num_completed - len(failed),
+        "failed": len(failed),
+        "secs": elapsed,
+        "docs_per_sec": num_completed / elapsed if elapsed > 0 else 0.0,
+        "batch_latency_ms": {
+            "p50": _percentile(latencies, 50) * 1000,
+            "p95": _percentile(latencies, 95) * 1000,
+            "p99": _percentile(latencies, 99) * 1000,
+            "max": _percentile(latencies, 100) * 1000
+        }
+    }
+    log_info("Load report: {}".format(report))
+
+    if failed:
+        raise CBServerError("Failed to load {} docs: {}".format(len(failed), failed[:10]))
+
+    return report
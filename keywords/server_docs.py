@@ -0,0 +1,175 @@
+""" Prefix scans and batched deletes of Couchbase Server docs over the SDK.
+
+Doc ids are found with a KV range scan when the server (7.6+) and SDK (4.x) support it.
+Otherwise the prefix is pushed to the query service as an id range, so only the matching
+part of the primary index is read instead of the whole bucket.
+"""
+
+import time
+
+import concurrent.futures
+
+from couchbase.cluster import QueryIndexManager, QueryOptions
+from couchbase.exceptions import CouchbaseException, DocumentNotFoundException
+
+from keywords.exceptions import CBServerError
+from keywords.utils import log_info
+from libraries.testkit import settings
+
+DELETE_BATCH_SIZE = 1000
+# Minimum number of seconds between progress log lines
+PROGRESS_INTERVAL_SECS = 5
+
+
+def _prefix_upper_bound(prefix):
+    """ Returns the smallest string greater than every string starting with 'prefix' """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _query_doc_ids(cluster, bucket_name, prefix):
+    index_manager = QueryIndexManager(cluster)
+    index_manager.create_primary_index(bucket_name, ignore_exists=True)
+
+    if not prefix:
+        return cluster.query("SELECT RAW meta().id FROM `{}`".format(bucket_name))
+
+    statement = "SELECT RAW meta().id FROM `{}` WHERE meta().id >= $start AND meta().id < $end".format(bucket_name)
+    options = QueryOptions(named_parameters={"start": prefix, "end": _prefix_upper_bound(prefix)})
+    return cluster.query(statement, options)
+
+
+def _range_scan(collection, prefix):
+    # KV range scans are only in the 4.x SDK
+    from couchbase.kv_range_scan import PrefixScan
+    from couchbase.options import ScanOptions
+    return iter(collection.scan(PrefixScan(prefix), ScanOptions(ids_only=True)))
+
+
+def scan_doc_ids(cluster, collection, bucket_name, prefix):
+    """ Yields the ids of the docs in 'collection' (the default collection of 'bucket_name')
+    that start with 'prefix'
+    """
+
+    try:
+        rows = _range_scan(collection, prefix)
+        # Unsupported servers fail on the first result
+        first_row = next(rows, None)
+    except (ImportError, CouchbaseException) as e:
+        log_info("KV range scan not available ({}), scanning '{}' with the query service".format(e, prefix))
+        for doc_id in _query_doc_ids(cluster, bucket_name, prefix):
+            if doc_id.startswith(prefix):
+                yield doc_id
+        return
+
+    if first_row is not None:
+        yield first_row.id
+    for row in rows:
+        yield row.id
+
+
+def _batches(doc_ids, batch_size):
+    batch = []
+    for doc_id in doc_ids:
+        batch.append(doc_id)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _multi_errors(result_or_exception):
+    """ Returns {doc_id: error} for the keys that failed in a multi op.
+
+    The 4.x SDK returns the failures in 'exceptions'. The 3.x SDK raises a CouchbaseException on
+    any failure, and its 'all_results' holds a result for every key with 'success' set to False
+    (or the exception itself) for the failed ones.
+    """
+
+    exceptions = getattr(result_or_exception, "exceptions", None)
+    if isinstance(exceptions, dict):
+        return dict(exceptions)
+
+    all_results = getattr(result_or_exception, "all_results", None)
+    if all_results is None:
+        return {}
+    return {doc_id: result for doc_id, result in all_results.items()
+            if isinstance(result, Exception) or not getattr(result, "success", True)}
+
+
+def _remove_batch(collection, batch):
+    """ Removes a batch of docs and returns the ids that failed with anything but 'not found' """
+
+    try:
+        errors = _multi_errors(collection.remove_multi(batch))
+    except CouchbaseException as e:
+        if getattr(e, "all_results", None) is None:
+            raise
+        errors = _multi_errors(e)
+
+    failed = []
+    for doc_id, error in errors.items():
+        if isinstance(error, DocumentNotFoundException):
+            continue
+        # 3.x per key results do not carry the exception type, so retry the key on its own
+        # to tell a doc that is already gone from a real failure
+        try:
+            collection.remove(doc_id)
+        except DocumentNotFoundException:
+            continue
+        except CouchbaseException as e:
+            log_info("Failed to delete {}: {}".format(doc_id, e))
+            failed.append(doc_id)
+    return failed
+
+
+def delete_docs(collection, doc_ids, batch_size=DELETE_BATCH_SIZE, max_in_flight=settings.MAX_REQUEST_WORKERS):
+    """ Removes 'doc_ids' (any iterable, consumed lazily) from 'collection' in concurrent batches of
+    'batch_size', with at most 'max_in_flight' batches outstanding. Progress is logged as it goes.
+
+    Returns the number of ids processed. Docs that were already gone are not an error, any other
+    failure raises a CBServerError after all batches have been tried.
+    """
+
+    if batch_size < 1 or max_in_flight < 1:
+        raise ValueError("'batch_size' and 'max_in_flight' must be at least 1")
+
+    batches = _batches(doc_ids, batch_size)
+    failed = []
+    num_processed = 0
+    start = time.time()
+    last_logged = start
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+
+        in_flight = {}
+
+        def fill():
+            for batch in batches:
+                in_flight[executor.submit(_remove_batch, collection, batch)] = batch
+                if len(in_flight) >= max_in_flight:
+                    break
+
+        fill()
+        while in_flight:
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                num_processed += len(batch)
+                try:
+                    failed.extend(future.result())
+                except CouchbaseException as e:
+                    log_info("Failed to delete batch of {} docs: {}".format(len(batch), e))
+                    failed.extend(batch)
+
+            now = time.time()
+            if now - last_logged >= PROGRESS_INTERVAL_SECS:
+                log_info("Deleted {} docs ({:.0f} docs/s)".format(num_processed - len(failed), num_processed / (now - start)))
+                last_logged = now
+            fill()
+
+    log_info("Deleted {} docs in {:.2f}s".format(num_processed - len(failed), time.time() - start))
+    if failed:
+        raise CBServerError("Failed to delete {} docs: {}".format(len(failed), failed[:10]))
+
+    return num_processed
@@ -0,0 +1,157 @@
+""" Shared, pooled HTTP transport for every REST client in the testkit.
+
+All sessions created with new_session(), and the module level get / post / put / delete
+helpers, share one set of per host connection pools. Connections (and the TLS sessions on
+them) are kept alive and reused across clients instead of every client paying its own TCP
+and TLS handshakes.
+
+Long lived requests, ex. longpoll and continuous changes feeds, hold a connection for as long as
+they wait. Sessions created with new_session(feed=True) use separate, larger pools, so hundreds of
+waiting feeds neither crowd out the regular pools nor churn through them.
+
+Pool sizes default to the settings in libraries/testkit/settings.py and can be changed with
+configure(), ex. when a test raises the number of request workers.
+"""
+
+import threading
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+
+from libraries.testkit import settings
+
+_lock = threading.Lock()
+# Adapter for regular requests and adapter for changes feeds, created lazily
+_adapters = {}
+_default_session = None
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """ HTTPAdapter whose pools outlive any single Session.
+
+    Session.close() closes every mounted adapter, which would drop the pooled connections
+    of every other client. Pools are only released by transport.close().
+    """
+
+    def close(self):
+        pass
+
+    def close_pools(self):
+        super(SharedHTTPAdapter, self).close()
+
+
+def _get_adapter(feed=False):
+    with _lock:
+        adapter = _adapters.get(feed)
+        if adapter is None:
+            adapter = SharedHTTPAdapter(
+                pool_connections=settings.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=settings.HTTP_FEED_POOL_MAXSIZE if feed else settings.HTTP_POOL_MAXSIZE,
+                pool_block=False
+            )
+            _adapters[feed] = adapter
+        return adapter
+
+
+def _close_adapters():
+    with _lock:
+        adapters = list(_adapters.values())
+        _adapters.clear()
+
+    for adapter in adapters:
+        adapter.close_pools()
+    _remount_all()
+
+
+def configure(pool_connections=None, pool_maxsize=None, feed_pool_maxsize=None):
+    """ Resize the shared pools. 'pool_connections' is the number of hosts to keep pools for,
+    'pool_maxsize' the number of keep-alive connections per host and 'feed_pool_maxsize' the same
+    for changes feeds. Existing pools are closed and sessions created before and after the call
+    pick up the new adapters.
+    """
+
+    if pool_connections is not None:
+        settings.HTTP_POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        settings.HTTP_POOL_MAXSIZE = pool_maxsize
+    if feed_pool_maxsize is not None:
+        settings.HTTP_FEED_POOL_MAXSIZE = feed_pool_maxsize
+
+    _close_adapters()
+
+
+# Sessions are tracked weakly, with whether they are for feeds, so they can be re-pointed
+# at new adapters after configure() / close()
+_sessions = weakref.WeakKeyDictionary()
+
+
+def _mount(session, feed):
+    adapter = _get_adapter(feed)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def _remount_all():
+    with _lock:
+        sessions = list(_sessions.items())
+    for session, feed in sessions:
+        _mount(session, feed)
+
+
+def new_session(headers=None, auth=None, verify=True, feed=False):
+    """ Returns a requests Session backed by the shared pools, or by the changes feed pools if 'feed' is True.
+    Headers, auth and cookies stay private to the returned session.
+    """
+
+    session = Session()
+    _mount(session, feed)
+
+    if headers is not None:
+        session.headers.update(headers)
+    if auth is not None:
+        session.auth = auth
+    session.verify = verify
+
+    with _lock:
+        _sessions[session] = feed
+    return session
+
+
+def _get_default_session():
+    """ Session used by the module level helpers. Like requests.get / requests.post it does
+    not carry cookies from one call to the next.
+    """
+
+    global _default_session
+    if _default_session is None:
+        session = new_session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        _default_session = session
+    return _default_session
+
+
+def request(method, url, **kwargs):
+    return _get_default_session().request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def close():
+    """ Close all pooled connections, ex. at the end of a test session """
+    _close_adapters()
@@ -3,6 +3,18 @@ import string
 import random
 import uuid
 import datetime
+import json
+
+import numpy
+
+LETTERS = numpy.frombuffer(string.ascii_letters.encode(), dtype=numpy.uint8)
+MAX_LONG = 9999999
+FLOAT_RANGE = (-100000000000000.0, 100000000000000.0)
+# Strings at least this long are drawn with numpy rather than one character at a time
+LARGE_STRING_LENGTH = 1024
+
+# Number of documents whose random values are drawn together by generate()
+DEFAULT_BATCH_SIZE = 1000
 
 
 def random_bool():
@@ -10,7 +22,7 @@ def random_bool():
 
 
 def random_long():
-    return int(random.choice(list(range(0, 10000000))))
+    return random.randint(0, MAX_LONG)
 
 
 def random_int():
@@ -19,11 +31,17 @@ def random_int():
 
 def random_float():
     # Arbirary range, maybe we could have something better?
-    return random.uniform(-100000000000000.0, 100000000000000.0)
+    return random.uniform(*FLOAT_RANGE)
 
 
 def random_string(length):
-    return "".join(random.choice(string.ascii_letters) for _ in range(length))
+    if length < LARGE_STRING_LENGTH:
+        return "".join(random.choices(string.ascii_letters, k=length))
+    return _random_letters(numpy.random.default_rng(random.getrandbits(64)), length)
+
+
+def _random_letters(rng, length):
+    return LETTERS[rng.integers(0, len(LETTERS), size=length)].tobytes().decode()
 
 
 def doc_size_byBytes(size):
@@ -33,30 +51,172 @@ def doc_size_byBytes(size):
     return data
 
 
+class _RandomValues(object):
+    """ Draws each value of a document template from the 'random' module, one at a time """
+
+    def bool(self):
+        return random_bool()
+
+    def long(self):
+        return random_long()
+
+    def int(self):
+        return random_int()
+
+    def float(self):
+        return random_float()
+
+    def string(self, length):
+        return random_string(length)
+
+    def uuid(self):
+        return str(uuid.uuid4())
+
+    def now(self):
+        return str(datetime.datetime.now())
+
+
+_random_values = _RandomValues()
+
+
+class _CountingValues(_RandomValues):
+    """ Records how many values of each kind a template draws, so a batch can draw them all at once """
+
+    def __init__(self):
+        self.counts = {"bool": 0, "long": 0, "int": 0, "float": 0, "chars": 0, "uuid": 0}
+
+    def bool(self):
+        self.counts["bool"] += 1
+        return False
+
+    def long(self):
+        self.counts["long"] += 1
+        return 0
+
+    def int(self):
+        self.counts["int"] += 1
+        return 0
+
+    def float(self):
+        self.counts["float"] += 1
+        return 0.0
+
+    def string(self, length):
+        self.counts["chars"] += length
+        return ""
+
+    def uuid(self):
+        self.counts["uuid"] += 1
+        return ""
+
+
+class _BatchValues(object):
+    """ Hands out one document's share of the values drawn for a batch, in template order """
+
+    def __init__(self, bools, longs, ints, floats, chars, uuids, now):
+        self._bools = iter(bools)
+        self._longs = iter(longs)
+        self._ints = iter(ints)
+        self._floats = iter(floats)
+        self._uuids = iter(uuids)
+        self._chars = chars
+        self._offset = 0
+        self._now = now
+
+    def bool(self):
+        return next(self._bools)
+
+    def long(self):
+        return next(self._longs)
+
+    def int(self):
+        return next(self._ints)
+
+    def float(self):
+        return next(self._floats)
+
+    def string(self, length):
+        value = self._chars[self._offset:self._offset + length]
+        self._offset += length
+        return value
+
+    def uuid(self):
+        return next(self._uuids)
+
+    def now(self):
+        return self._now
+
+
+def _value_streams(seed):
+    """ One random stream per kind of value. Drawing each kind from its own stream means a document's values
+    only depend on the seed and the document's position, not on how many documents are generated
+    """
+
+    kinds = ["bool", "long", "int", "float", "chars", "uuid"]
+    seeds = numpy.random.SeedSequence(seed).spawn(len(kinds))
+    return {kind: numpy.random.default_rng(kind_seed) for kind, kind_seed in zip(kinds, seeds)}
+
+
+def _draw_batch(streams, counts, number):
+    """ Draws the values for 'number' documents with one vectorized call per kind of value.
+    Returns a _BatchValues for each document.
+    """
+
+    def per_doc(values, kind):
+        return values.reshape(number, counts[kind]).tolist()
+
+    bools = per_doc(streams["bool"].integers(0, 2, size=number * counts["bool"]).astype(bool), "bool")
+    longs = per_doc(streams["long"].integers(0, MAX_LONG, size=number * counts["long"], endpoint=True), "long")
+    ints = per_doc(streams["int"].integers(0, sys.maxsize, size=number * counts["int"], dtype=numpy.int64, endpoint=True), "int")
+    floats = per_doc(streams["float"].uniform(*FLOAT_RANGE, size=number * counts["float"]), "float")
+
+    chars_per_doc = counts["chars"]
+    chars = _random_letters(streams["chars"], number * chars_per_doc)
+
+    uuids_per_doc = counts["uuid"]
+    uuid_bytes = streams["uuid"].bytes(16 * number * uuids_per_doc)
+    uuids = [str(uuid.UUID(bytes=uuid_bytes[i:i + 16], version=4)) for i in range(0, len(uuid_bytes), 16)]
+
+    now = str(datetime.datetime.now())
+    return [
+        _BatchValues(
+            bools[i], longs[i], ints[i], floats[i],
+            chars[i * chars_per_doc:(i + 1) * chars_per_doc],
+            uuids[i * uuids_per_doc:(i + 1) * uuids_per_doc],
+            now
+        )
+        for i in range(number)
+    ]
+
+
 def simple():
+    return _simple(_random_values)
+
+
+def _simple(values):
     data = {
-        "date_time_added": str(datetime.datetime.now()),
+        "date_time_added": values.now(),
         "updates": 0,
         "location": "california",
         "dict": {
-            "name": random_string(10),
+            "name": values.string(10),
         },
         "list": [
-            random_int(),
-            random_int()
+            values.int(),
+            values.int()
         ],
         "list_of_dicts": [
             {
-                "friend_one": random_string(10)
+                "friend_one": values.string(10)
             },
             {
-                "friend_two": random_string(10)
+                "friend_two": values.string(10)
             }
         ],
         "dict_with_list": {
             "list": [
-                random_bool(),
-                random_bool()
+                values.bool(),
+                values.bool()
             ]
         }
     }
@@ -64,44 +224,48 @@ def simple():
 
 
 def simple_user():
+    return _simple_user(_random_values)
+
+
+def _simple_user(values):
     data = {
         "updates": 0,
         "index": 0,
-        "date_time_added": str(datetime.datetime.now()),
-        "guid": str(uuid.uuid4()),
+        "date_time_added": values.now(),
+        "guid": values.uuid(),
         "isActive": True,
         "balance": "$3,175.30",
-        "picture": random_string(10),
-        "age": random_int(),
-        "eyeColor": random_string(10),
+        "picture": values.string(10),
+        "age": values.int(),
+        "eyeColor": values.string(10),
         "name": {
-            "first": random_string(10),
-            "last": random_string(10)
+            "first": values.string(10),
+            "last": values.string(10)
         },
-        "company": random_string(10),
-        "email": random_string(20),
-        "phone": random_string(10),
-        "address": random_string(30),
-        "about": random_string(50),
-        "registered": random_string(20),
-        "latitude": random_float(),
-        "longitude": random_float(),
+        "company": values.string(10),
+        "email": values.string(20),
+        "phone": values.string(10),
+        "address": values.string(30),
+        "about": values.string(50),
+        "registered": values.string(20),
+        "latitude": values.float(),
+        "longitude": values.float(),
         "tags": [
-            random_string(10),
-            random_string(10),
-            random_string(10)
+            values.string(10),
+            values.string(10),
+            values.string(10)
         ],
         "range": [
-            random_int(),
+            values.int(),
         ],
         "friends": [
             {
-                "id": random_int(),
-                "name": random_string(10)
+                "id": values.int(),
+                "name": values.string(10)
             },
             {
-                "id": random_int(),
-                "name": random_string(10)
+                "id": values.int(),
+                "name": values.string(10)
             }
         ]
     }
@@ -547,6 +711,10 @@ def four_k(channels=[]):
 
 
 def complex_doc():
+    return _complex_doc(_random_values)
+
+
+def _complex_doc(values):
     return {
         "code": "CM/AUV/01/1700229",
         "controller": "",
@@ -561,18 +729,18 @@ def complex_doc():
         "purchasedetails": [
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "7ee2c016-6c2d-4ec8-8504-18e3b991a65e"
                 },
                 "item": {
                     "barcodediscount": "1083685",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083685"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145453"
                         }
                     ],
@@ -582,7 +750,7 @@ def complex_doc():
                     "information": None,
                     "key": "ea1c8797-c78a-4c1e-8694-51835446e773",
                     "mainbarcode": "2800000145453",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX MANNEQUIN OR",
                     "namenl": "JUWELENHOUDER GOUDEN MANNEQUIN",
                     "origin": "Server",
@@ -605,7 +773,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -614,21 +782,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -637,7 +805,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -645,7 +813,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -657,9 +825,9 @@ def complex_doc():
                         {
                             "itemid": "ea1c8797-c78a-4c1e-8694-51835446e773",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45453",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -678,7 +846,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -689,39 +857,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "d673c8e8-b0be-48d8-8ae4-985ff9af72af",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "3aa617a8-79b1-485e-a0e7-0a89eb3a25fe"
                 },
                 "item": {
                     "barcodediscount": "1083676",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083676"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145361"
                         }
                     ],
@@ -731,7 +899,7 @@ def complex_doc():
                     "information": None,
                     "key": "255ce416-b64e-441a-b495-e93d3212739f",
                     "mainbarcode": "2800000145361",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX PLASTRON ROSE",
                     "namenl": "JUWELENHOUDER ROZE BORSTSTUK",
                     "origin": "Server",
@@ -754,7 +922,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -763,21 +931,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -786,7 +954,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -794,7 +962,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -806,9 +974,9 @@ def complex_doc():
                         {
                             "itemid": "255ce416-b64e-441a-b495-e93d3212739f",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45361",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -827,7 +995,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -838,39 +1006,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "2876f416-e76f-4c21-ae3e-78d78887171b",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "af59f667-acd2-4d23-bd2c-575dca415b70"
                 },
                 "item": {
                     "barcodediscount": "1083675",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083675"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145354"
                         }
                     ],
@@ -880,7 +1048,7 @@ def complex_doc():
                     "information": None,
                     "key": "547de31c-cdc9-4471-8685-500579c4ca09",
                     "mainbarcode": "2800000145354",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX CHAUSSURE ROSE",
                     "namenl": "JUWELENHOUDER ROZE SCHOEN",
                     "origin": "Server",
@@ -903,7 +1071,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -912,21 +1080,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -935,7 +1103,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -943,7 +1111,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -955,9 +1123,9 @@ def complex_doc():
                         {
                             "itemid": "547de31c-cdc9-4471-8685-500579c4ca09",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45354",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -976,7 +1144,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -987,39 +1155,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "e6ca0875-a230-4ebc-a8c4-fe5f4f77f03b",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "e466d193-01dc-4e55-9db1-4dc3b700beb9"
                 },
                 "item": {
                     "barcodediscount": "1083686",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083686"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145460"
                         }
                     ],
@@ -1029,7 +1197,7 @@ def complex_doc():
                     "information": None,
                     "key": "9d2a87a9-290f-43fd-b22d-7f304f5cff37",
                     "mainbarcode": "2800000145460",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX CHAUSSURE BLEU",
                     "namenl": "JUWELENHOUDER VORM BLAUWE SCHOEN",
                     "origin": "Server",
@@ -1052,7 +1220,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1061,21 +1229,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1084,7 +1252,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1092,7 +1260,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1104,9 +1272,9 @@ def complex_doc():
                         {
                             "itemid": "9d2a87a9-290f-43fd-b22d-7f304f5cff37",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45360",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1125,7 +1293,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1136,39 +1304,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "2b943b61-1528-4237-a2a4-76620774038b",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "9e21cc37-286b-40ce-88eb-4bf78b94d7d4"
                 },
                 "item": {
                     "barcodediscount": "1083682",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083682"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145422"
                         }
                     ],
@@ -1178,7 +1346,7 @@ def complex_doc():
                     "information": None,
                     "key": "67a71f6c-5374-41bb-af3d-807ef50f059f",
                     "mainbarcode": "2800000145422",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX CHAT/RENNE OR 2ASS",
                     "namenl": "JUWELENHOUDER MET GOUDEN KAT/RENDIER 2ASS",
                     "origin": "Server",
@@ -1201,7 +1369,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1210,21 +1378,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1233,7 +1401,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1241,7 +1409,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1253,9 +1421,9 @@ def complex_doc():
                         {
                             "itemid": "67a71f6c-5374-41bb-af3d-807ef50f059f",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45422",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1274,7 +1442,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1285,39 +1453,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "dc8a3a23-1e9c-4c73-be73-ef69d952f596",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "5332d845-c98e-4967-a3bb-26394c612f10"
                 },
                 "item": {
                     "barcodediscount": "1083677",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083677"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145378"
                         }
                     ],
@@ -1327,7 +1495,7 @@ def complex_doc():
                     "information": None,
                     "key": "c5f86443-adf9-4137-a643-5286bb101145",
                     "mainbarcode": "2800000145378",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE MANTEAU FLEUR OR",
                     "namenl": "KLEDINGHAAK BLOEM GOUD",
                     "origin": "Server",
@@ -1350,7 +1518,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1359,21 +1527,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1382,7 +1550,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1390,7 +1558,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1402,9 +1570,9 @@ def complex_doc():
                         {
                             "itemid": "c5f86443-adf9-4137-a643-5286bb101145",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45378",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1423,7 +1591,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1434,39 +1602,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "19858a6d-82fd-4317-871a-4e057ba6a5a7",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "9fd3c5fb-6fc3-47d2-958f-e863574c10bd"
                 },
                 "item": {
                     "barcodediscount": "1083697",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083697"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145514"
                         }
                     ],
@@ -1476,7 +1644,7 @@ def complex_doc():
                     "information": None,
                     "key": "1e617741-fe8c-4322-9d2a-0d2046a70954",
                     "mainbarcode": "2800000145514",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "BUSTE GRANDE SUR PIED 37X23X160CM ECRU IMPR",
                     "namenl": "PASPOP GROOT OP VOETSTUK 37X23X160CM ECRU BEDRUKT",
                     "origin": "Server",
@@ -1499,7 +1667,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1508,21 +1676,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1531,7 +1699,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1539,7 +1707,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1551,9 +1719,9 @@ def complex_doc():
                         {
                             "itemid": "1e617741-fe8c-4322-9d2a-0d2046a70954",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45514",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1572,7 +1740,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1583,39 +1751,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "38b117f0-8504-4f21-8ba7-e12cac656d79",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "490397e4-221f-4ddc-80ed-cfc4faaddb03"
                 },
                 "item": {
                     "barcodediscount": "1083684",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083684"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145446"
                         }
                     ],
@@ -1625,7 +1793,7 @@ def complex_doc():
                     "information": None,
                     "key": "2743e4a8-04e6-4972-99e4-0772a5b9bca9",
                     "mainbarcode": "2800000145446",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX BARRE OR",
                     "namenl": "JUWELENHOUDER GOUDEN STAAF",
                     "origin": "Server",
@@ -1648,7 +1816,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1657,21 +1825,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1680,7 +1848,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1688,7 +1856,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1700,9 +1868,9 @@ def complex_doc():
                         {
                             "itemid": "2743e4a8-04e6-4972-99e4-0772a5b9bca9",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45446",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1721,7 +1889,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1732,39 +1900,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "988c8eda-a5cd-4001-bd30-a3ee784a0f09",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "dfdd4c72-dedc-496a-ade4-289608a232a2"
                 },
                 "item": {
                     "barcodediscount": "1083683",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083683"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145439"
                         }
                     ],
@@ -1774,7 +1942,7 @@ def complex_doc():
                     "information": None,
                     "key": "d0a304d8-bd7c-477a-ac13-6568bf055d93",
                     "mainbarcode": "2800000145439",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX TRANSPARENT ACRYLIC OR",
                     "namenl": "JUWELENHOUDER TRANSPARANT ACRYL GOUD",
                     "origin": "Server",
@@ -1797,7 +1965,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1806,21 +1974,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1829,7 +1997,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1837,7 +2005,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1849,9 +2017,9 @@ def complex_doc():
                         {
                             "itemid": "d0a304d8-bd7c-477a-ac13-6568bf055d93",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45439",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -1870,7 +2038,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -1881,39 +2049,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "8f13cd51-7af9-4115-b9f1-8983e6f36b1d",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "1c6a379c-ae07-4377-904d-48d25e55eb0a"
                 },
                 "item": {
                     "barcodediscount": "1083690",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083690"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145484"
                         }
                     ],
@@ -1923,7 +2091,7 @@ def complex_doc():
                     "information": None,
                     "key": "8fd70f28-d80f-4a28-90c9-c18087fc0d9d",
                     "mainbarcode": "2800000145484",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "BOITE A BIJOUX BLEU",
                     "namenl": "JUWELENDOOS BLAUW",
                     "origin": "Server",
@@ -1946,7 +2114,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -1955,21 +2123,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -1978,7 +2146,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -1986,7 +2154,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -1998,9 +2166,9 @@ def complex_doc():
                         {
                             "itemid": "8fd70f28-d80f-4a28-90c9-c18087fc0d9d",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45484",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2019,7 +2187,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2030,39 +2198,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "cc582b44-87a5-4da9-9cfd-239c77aec7bf",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "d76f09f0-35a8-45bf-9241-96bba09dbc7a"
                 },
                 "item": {
                     "barcodediscount": "1083668",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083668"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145309"
                         }
                     ],
@@ -2072,7 +2240,7 @@ def complex_doc():
                     "information": None,
                     "key": "cb6d6145-ecd5-48d0-b357-7384d020e395",
                     "mainbarcode": "2800000145309",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE MANTEAU LETTRE ROSE",
                     "namenl": "KLEDINGHAAK LETTER ROZE",
                     "origin": "Server",
@@ -2095,7 +2263,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2104,21 +2272,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2127,7 +2295,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2135,7 +2303,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2147,9 +2315,9 @@ def complex_doc():
                         {
                             "itemid": "cb6d6145-ecd5-48d0-b357-7384d020e395",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45309",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2168,7 +2336,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2179,39 +2347,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "0a631d08-fc32-4f57-8954-787966353699",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "97953945-70cc-4e75-b963-1de8e4282e80"
                 },
                 "item": {
                     "barcodediscount": "1083692",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083692"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145507"
                         }
                     ],
@@ -2221,7 +2389,7 @@ def complex_doc():
                     "information": None,
                     "key": "3d2d44fd-142b-4a1d-b582-19b4363a3f9b",
                     "mainbarcode": "2800000145507",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX BOITE BLEU+BARRE*2",
                     "namenl": "JUWELENHOUDER BLAUWE DOOS+STAAF*2",
                     "origin": "Server",
@@ -2244,7 +2412,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2253,21 +2421,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2276,7 +2444,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2284,7 +2452,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2296,9 +2464,9 @@ def complex_doc():
                         {
                             "itemid": "3d2d44fd-142b-4a1d-b582-19b4363a3f9b",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45507",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2317,7 +2485,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2328,39 +2496,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "98d0939d-bd2a-4797-8404-f83bed06b617",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "bdc8ea2d-2ea8-4d24-8ac7-312683cf49fd"
                 },
                 "item": {
                     "barcodediscount": "1083691",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083691"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145491"
                         }
                     ],
@@ -2370,7 +2538,7 @@ def complex_doc():
                     "information": None,
                     "key": "2d4c1131-dc45-4d90-a7d5-de5a7190ea37",
                     "mainbarcode": "2800000145491",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX PLASTRON BLEU",
                     "namenl": "JUWELENHOUDER BLAUW BORSTSTUK",
                     "origin": "Server",
@@ -2393,7 +2561,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2402,21 +2570,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2425,7 +2593,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2433,7 +2601,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2445,9 +2613,9 @@ def complex_doc():
                         {
                             "itemid": "2d4c1131-dc45-4d90-a7d5-de5a7190ea37",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45391",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2466,7 +2634,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2477,39 +2645,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "23488603-a4eb-4466-a292-914f4ae06d69",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "0e98cc03-48ce-45c5-96ce-6aa79a6d9225"
                 },
                 "item": {
                     "barcodediscount": "1083679",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083679"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145392"
                         }
                     ],
@@ -2519,7 +2687,7 @@ def complex_doc():
                     "information": None,
                     "key": "76b564ea-a032-4a80-979d-79d2e8410a92",
                     "mainbarcode": "2800000145392",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX BOITE+COMP ROSE",
                     "namenl": "JUWELENHOUDER DOOS+COMP ROZE",
                     "origin": "Server",
@@ -2542,7 +2710,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2551,21 +2719,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2574,7 +2742,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2582,7 +2750,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2594,9 +2762,9 @@ def complex_doc():
                         {
                             "itemid": "76b564ea-a032-4a80-979d-79d2e8410a92",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45392",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2615,7 +2783,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2626,39 +2794,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "fc5ed130-51ac-4cbf-9331-c4744aac5f78",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "f1fcfe07-865b-4366-b70b-6553e82aaacc"
                 },
                 "item": {
                     "barcodediscount": "1083678",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083678"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145385"
                         }
                     ],
@@ -2668,7 +2836,7 @@ def complex_doc():
                     "information": None,
                     "key": "945d4eee-4d66-49f8-902e-dafa0c429d27",
                     "mainbarcode": "2800000145385",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE MANTEAU CROCHET*2 ROSE&GRIS",
                     "namenl": "KLEDINGHAAK HAAKJE*2 ROZE&GRIJS",
                     "origin": "Server",
@@ -2691,7 +2859,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2700,21 +2868,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2723,7 +2891,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2731,7 +2899,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2743,9 +2911,9 @@ def complex_doc():
                         {
                             "itemid": "945d4eee-4d66-49f8-902e-dafa0c429d27",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45385",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2764,7 +2932,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2775,39 +2943,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "1ab76c31-1065-4c9d-89e1-e464762cbfd9",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "b847072d-0f89-43da-b401-852ff4596dc3"
                 },
                 "item": {
                     "barcodediscount": "1083674",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083674"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145347"
                         }
                     ],
@@ -2817,7 +2985,7 @@ def complex_doc():
                     "information": None,
                     "key": "ae0a38d9-c47d-44c0-acd3-a9c1dc808f5d",
                     "mainbarcode": "2800000145347",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE MANTEAU FLEUR ROSE&GRIS",
                     "namenl": "KLEDINGHAAK BLOEM ROZE&GRIJS",
                     "origin": "Server",
@@ -2840,7 +3008,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2849,21 +3017,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -2872,7 +3040,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -2880,7 +3048,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -2892,9 +3060,9 @@ def complex_doc():
                         {
                             "itemid": "ae0a38d9-c47d-44c0-acd3-a9c1dc808f5d",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45347",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -2913,7 +3081,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -2924,39 +3092,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "020ac6cd-c661-42ed-9bff-53e45e380852",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "5934141c-c71f-4e8c-be99-f210901f4244"
                 },
                 "item": {
                     "barcodediscount": "1083688",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083688"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145477"
                         }
                     ],
@@ -2966,7 +3134,7 @@ def complex_doc():
                     "information": None,
                     "key": "5c06f304-4b08-492e-86d1-dbba280776f5",
                     "mainbarcode": "2800000145477",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX MANNEQUIN BLEU",
                     "namenl": "JUWELENHOUDER BLAUWE MANNEQUIN",
                     "origin": "Server",
@@ -2989,7 +3157,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -2998,21 +3166,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3021,7 +3189,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3029,7 +3197,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3041,9 +3209,9 @@ def complex_doc():
                         {
                             "itemid": "5c06f304-4b08-492e-86d1-dbba280776f5",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45477",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3062,7 +3230,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3073,39 +3241,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "6dfd4d6e-f2e7-4648-a30d-02c5d275cce4",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "85c25937-1c26-42a7-9760-74e53943e530"
                 },
                 "item": {
                     "barcodediscount": "1083680",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083680"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145408"
                         }
                     ],
@@ -3115,7 +3283,7 @@ def complex_doc():
                     "information": None,
                     "key": "254b2453-3915-4cd7-93bd-aa5215e69e39",
                     "mainbarcode": "2800000145408",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX LAPIN*2 OR",
                     "namenl": "JUWELENHOUDER MET GOUDEN HAAS*2",
                     "origin": "Server",
@@ -3138,7 +3306,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -3147,21 +3315,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3170,7 +3338,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3178,7 +3346,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3190,9 +3358,9 @@ def complex_doc():
                         {
                             "itemid": "254b2453-3915-4cd7-93bd-aa5215e69e39",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45408",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3211,7 +3379,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3222,39 +3390,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "8cb24b6f-ca79-4075-85a3-3c246799cb56",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "cb0beaef-1cfa-4005-8d33-2fe677c155d4"
                 },
                 "item": {
                     "barcodediscount": "1083670",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083670"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145323"
                         }
                     ],
@@ -3264,7 +3432,7 @@ def complex_doc():
                     "information": None,
                     "key": "9eb24402-a4c5-4b42-b6ff-2a86bd63a463",
                     "mainbarcode": "2800000145323",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX COEUR ROSE",
                     "namenl": "JUWELENHOUDER ROZE HART",
                     "origin": "Server",
@@ -3287,7 +3455,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -3296,21 +3464,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3319,7 +3487,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3327,7 +3495,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3339,9 +3507,9 @@ def complex_doc():
                         {
                             "itemid": "9eb24402-a4c5-4b42-b6ff-2a86bd63a463",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45323",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3360,7 +3528,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3371,39 +3539,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "f34042cb-bcec-42dd-8657-2d99a5c6723e",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "b2e2141e-3dff-4add-a492-d5b747d01727"
                 },
                 "item": {
                     "barcodediscount": "1083698",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083698"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145521"
                         }
                     ],
@@ -3413,7 +3581,7 @@ def complex_doc():
                     "information": None,
                     "key": "61051d8a-c58b-4645-a0af-abdc76880c40",
                     "mainbarcode": "2800000145521",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "BUSTE GRANDE SUR PIED 37X23X160CM GRIS IMPR",
                     "namenl": "PASPOP GROOT OP VOETSTUK 37X23X160CM GRIJS BEDRUKT",
                     "origin": "Server",
@@ -3436,7 +3604,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -3445,21 +3613,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3468,7 +3636,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3476,7 +3644,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3488,9 +3656,9 @@ def complex_doc():
                         {
                             "itemid": "61051d8a-c58b-4645-a0af-abdc76880c40",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45514",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3509,7 +3677,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3520,39 +3688,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "65e2c6aa-f710-4559-9496-d756207b4a90",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "22375b64-9c1c-4140-bec7-2f71345c330c"
                 },
                 "item": {
                     "barcodediscount": "1083681",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083681"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145415"
                         }
                     ],
@@ -3562,7 +3730,7 @@ def complex_doc():
                     "information": None,
                     "key": "58bb8f94-ba0f-4d80-ba60-f83d8d3899fa",
                     "mainbarcode": "2800000145415",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX CHIEN OR",
                     "namenl": "JUWELENHOUDER MET GOUDEN HOND",
                     "origin": "Server",
@@ -3585,7 +3753,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -3594,21 +3762,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3617,7 +3785,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3625,7 +3793,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3637,9 +3805,9 @@ def complex_doc():
                         {
                             "itemid": "58bb8f94-ba0f-4d80-ba60-f83d8d3899fa",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45415",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3658,7 +3826,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3669,39 +3837,39 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "f66785a7-dca9-46ae-921b-9df08c28bbbc",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             },
             {
                 "barcode": {
-                    "barcode": str(random_long()),
+                    "barcode": str(values.long()),
                     "key": "343d6b7e-687a-4ce6-9160-e46e47fe1084"
                 },
                 "item": {
                     "barcodediscount": "1083673",
                     "barcodes": [
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "1083673"
                         },
                         {
-                            "barcode": str(random_long()),
+                            "barcode": str(values.long()),
                             "key": "2800000145330"
                         }
                     ],
@@ -3711,7 +3879,7 @@ def complex_doc():
                     "information": None,
                     "key": "7fc5e747-a878-4077-8f2f-c8b0a819ec19",
                     "mainbarcode": "2800000145330",
-                    "minimumsellingqty": random_int(),
+                    "minimumsellingqty": values.int(),
                     "namefr": "PORTE BIJOUX MANNEQUIN",
                     "namenl": "JUWELENHOUDER VORM MANNEQUIN",
                     "origin": "Server",
@@ -3734,7 +3902,7 @@ def complex_doc():
                         "name": "DISTRILOGISTIQUE",
                         "origin": "Server",
                         "representatives": None,
-                        "supbackorder": bool(random.getrandbits(1)),
+                        "supbackorder": values.bool(),
                         "tel": None,
                         "town": None,
                         "vat": None,
@@ -3743,21 +3911,21 @@ def complex_doc():
                     },
                     "prices": [
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Selling"
                         },
                         {
-                            "amount": random_float(),
+                            "amount": values.float(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
                             "type": "Promotional"
                         },
                         {
-                            "amount": random_int(),
+                            "amount": values.int(),
                             "enddate": "0001-01-01T00: 00: 00",
                             "key": None,
                             "startdate": "0001-01-01T00: 00: 00",
@@ -3766,7 +3934,7 @@ def complex_doc():
                     ],
                     "sellingunit": "ST",
                     "statistics": None,
-                    "status": bool(random.getrandbits(1)),
+                    "status": values.bool(),
                     "stock": [
                         {
                             "artId": None,
@@ -3774,7 +3942,7 @@ def complex_doc():
                             "db": "stock",
                             "key": None,
                             "location": "",
-                            "quantity": random_int(),
+                            "quantity": values.int(),
                             "stockcreatedby": None,
                             "stockdatum": "0001-01-01T00: 00: 00",
                             "store": "AUV",
@@ -3786,9 +3954,9 @@ def complex_doc():
                         {
                             "itemid": "7fc5e747-a878-4077-8f2f-c8b0a819ec19",
                             "key": None,
-                            "minbuyingqty": random_int(),
-                            "purchasebrutvalue": random_float(),
-                            "purchasenetvalue": random_float(),
+                            "minbuyingqty": values.int(),
+                            "purchasebrutvalue": values.float(),
+                            "purchasenetvalue": values.float(),
                             "supitemref": "874/22/45330",
                             "supplierid": "d8ef8025-e1fe-4f2c-8a35-315783a7b5ec"
                         }
@@ -3807,7 +3975,7 @@ def complex_doc():
                             "name": "DISTRILOGISTIQUE",
                             "origin": "Server",
                             "representatives": None,
-                            "supbackorder": bool(random.getrandbits(1)),
+                            "supbackorder": values.bool(),
                             "tel": None,
                             "town": None,
                             "vat": None,
@@ -3818,23 +3986,23 @@ def complex_doc():
                     "vat": 21
                 },
                 "key": "e5161ffc-79c1-4504-b0cc-644999595930",
-                "minquantitycolli": random_int(),
+                "minquantitycolli": values.int(),
                 "purchasedbrutvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
                 "purchasednetvalue": {
-                    "amount": random_float(),
+                    "amount": values.float(),
                     "enddate": "0001-01-01T00: 00: 00",
                     "key": None,
                     "startdate": "0001-01-01T00: 00: 00",
                     "type": "Purchase"
                 },
-                "quantityordered": random_int(),
-                "quantityreceived": random_int(),
+                "quantityordered": values.int(),
+                "quantityreceived": values.int(),
                 "source": "CM"
             }
         ],
@@ -3872,7 +4040,7 @@ def complex_doc():
                     "tel": None
                 }
             ],
-            "supbackorder": bool(random.getrandbits(1)),
+            "supbackorder": values.bool(),
             "tel": "056/31 39 55",
             "town": "ZWEVEGEM",
             "vat": None,
@@ -3882,3 +4050,44 @@ def complex_doc():
         "trackingnumber": None,
         "type": "CentralDepot"
     }
+
+
+TEMPLATES = {
+    "simple": _simple,
+    "simple_user": _simple_user,
+    "complex_doc": _complex_doc,
+    "four_k": lambda values: four_k()
+}
+
+
+def generate(template, number, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+    """ Yields 'number' documents of 'template' (one of TEMPLATES).
+    Random values are drawn 'batch_size' documents at a time with vectorized numpy calls, so generating
+    many documents is much faster than calling the template function once per document.
+    The same 'seed' yields the same documents, apart from 'date_time_added'.
+    """
+
+    try:
+        fill = TEMPLATES[template]
+    except KeyError:
+        raise ValueError("Unknown doc template: {}. Expected one of {}".format(template, sorted(TEMPLATES)))
+
+    counter = _CountingValues()
+    fill(counter)
+
+    streams = _value_streams(seed)
+    for start in range(0, number, batch_size):
+        for values in _draw_batch(streams, counter.counts, min(batch_size, number - start)):
+            yield fill(values)
+
+
+def generate_sized(number, size, seed=None):
+    """ Yields 'number' documents that are exactly 'size' bytes when serialized with json.dumps """
+
+    overhead = len(json.dumps({"name": ""}))
+    if size < overhead:
+        raise ValueError("Docs can not be smaller than {} bytes".format(overhead))
+
+    rng = numpy.random.default_rng(seed)
+    for _ in range(number):
+        yield {"name": _random_letters(rng, size - overhead)}
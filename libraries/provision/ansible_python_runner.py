@@ -67,13 +67,20 @@ class Options(object):
 
 class Runner(object):
 
-    def __init__(self, inventory_filename, playbook, extra_vars, verbosity=0, subset=constants.DEFAULT_SUBSET):
+    def __init__(self, inventory_filename, playbook, extra_vars, verbosity=0, subset=constants.DEFAULT_SUBSET, callbacks=None):
+        """ 'playbook' can be a single playbook or a list of playbooks to run, in order, in one session.
+        'callbacks' are extra callback plugin instances (ex. TaskTimer) to receive the playbook events.
+        """
 
         if not os.path.exists(inventory_filename):
             raise Exception("Cannot find inventory_filename: {}.  Current dir: {}".format(inventory_filename, os.getcwd()))
 
-        if not os.path.exists(playbook):
-            raise Exception("Cannot find playbook: {}.  Current dir: {}".format(playbook, os.getcwd()))
+        playbooks = playbook if isinstance(playbook, list) else [playbook]
+        for playbook_filename in playbooks:
+            if not os.path.exists(playbook_filename):
+                raise Exception("Cannot find playbook: {}.  Current dir: {}".format(playbook_filename, os.getcwd()))
+
+        self.callbacks = callbacks if callbacks is not None else []
 
         self.options = Options()
         self.options.verbosity = verbosity
@@ -128,9 +135,9 @@ class Runner(object):
         self.variable_manager.extra_vars = extra_vars
 
         # Setup playbook executor, but don't run until run() called
-        log_info("Running playbook: {}".format(playbook))
+        log_info("Running playbook(s): {}".format(playbooks))
         self.pbex = playbook_executor.PlaybookExecutor(
-            playbooks=[playbook],
+            playbooks=playbooks,
             inventory=self.inventory,
             variable_manager=self.variable_manager,
             loader=self.loader,
@@ -138,6 +145,9 @@ class Runner(object):
             passwords=passwords)
 
     def run(self):
+        # Extra callbacks are added alongside the ones loaded from the ansible config
+        self.pbex._tqm._callback_plugins.extend(self.callbacks)
+
         # Results of PlaybookExecutor
         self.pbex.run()
         stats = self.pbex._tqm._stats
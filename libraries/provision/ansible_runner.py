@@ -1,29 +1,173 @@
+import atexit
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 from libraries.provision.ansible_python_runner import Runner
 from ansible import constants
+from ansible.plugins.callback import CallbackBase
 import logging
 
 PLAYBOOKS_HOME = "libraries/provision/ansible/playbooks"
 
+# Facts are cached on disk between playbook runs and only re-gathered when missing or older than this.
+# Each run and cluster config gets its own cache: CI reprovisions the same hosts with different images
+# between jobs, and facts like ansible_distribution must not leak from one job into the next.
+FACT_CACHE_ROOT = os.path.join(tempfile.gettempdir(), "mobile_testkit_ansible_facts")
+FACT_CACHE_TIMEOUT_SECS = 3600
+_RUN_ID = "{}-{}".format(os.getpid(), int(time.time()))
+_fact_cache_cleanup_registered = False
+_owns_fact_cache = False
+
+# Keep ssh master connections alive between playbook runs so each run does not reconnect
+SSH_ARGS = "-C -o ControlMaster=auto -o ControlPersist=600s"
+
+
+def fact_cache_dir(config):
+    """ Fact cache of the cluster config 'config' for this run """
+    config_key = hashlib.sha1(os.path.abspath(config).encode()).hexdigest()[:12]
+    return os.path.join(FACT_CACHE_ROOT, _RUN_ID, config_key)
+
+
+def clear_fact_cache(config):
+    """ Forget the facts gathered for 'config', ex. before its hosts are reprovisioned """
+    shutil.rmtree(fact_cache_dir(config), ignore_errors=True)
+
+
+def _remove_run_fact_caches():
+    shutil.rmtree(os.path.join(FACT_CACHE_ROOT, _RUN_ID), ignore_errors=True)
+
+
+def _configure_ansible(cache_dir):
+    """ Enable fact caching in 'cache_dir' and persistent ssh connections unless they have been configured already """
+
+    global _owns_fact_cache
+    if constants.CACHE_PLUGIN == "memory":
+        constants.CACHE_PLUGIN = "jsonfile"
+        constants.CACHE_PLUGIN_TIMEOUT = FACT_CACHE_TIMEOUT_SECS
+        _owns_fact_cache = True
+    if _owns_fact_cache:
+        constants.CACHE_PLUGIN_CONNECTION = cache_dir
+    if constants.DEFAULT_GATHERING == "implicit":
+        constants.DEFAULT_GATHERING = "smart"
+    os.environ.setdefault("ANSIBLE_SSH_ARGS", SSH_ARGS)
+
+
+class TaskTimer(CallbackBase):
+    """ Callback that records how long each task took, keyed by '<play>: <task>' """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "task_timer"
+
+    def __init__(self):
+        super(TaskTimer, self).__init__()
+        self.timings = OrderedDict()
+        self._play = None
+        self._task = None
+        self._start = None
+
+    def _finish_task(self):
+        if self._task is not None:
+            self.timings[self._task] = self.timings.get(self._task, 0) + time.time() - self._start
+            self._task = None
+
+    def v2_playbook_on_play_start(self, play):
+        self._finish_task()
+        self._play = play.get_name()
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._finish_task()
+        self._task = "{}: {}".format(self._play, task.get_name())
+        self._start = time.time()
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self.v2_playbook_on_task_start(task, False)
+
+    def v2_playbook_on_stats(self, stats):
+        self._finish_task()
+
+
+def _run_playbooks(inventory_filename, script_names, extra_vars, subset, cache_dir):
+    """ Runs the playbooks in one session and returns (number of failed and unreachable hosts, task timings) """
+
+    # Also needed in the worker processes of run_ansible_playbooks_parallel, which start from a fresh interpreter
+    _configure_ansible(cache_dir)
+
+    timer = TaskTimer()
+    runner = Runner(
+        inventory_filename=inventory_filename,
+        playbook=["{}/{}".format(PLAYBOOKS_HOME, script_name) for script_name in script_names],
+        extra_vars=extra_vars,
+        verbosity=0,  # change this to a higher number for -vvv debugging (try 10),
+        subset=subset,
+        callbacks=[timer]
+    )
+
+    stats = runner.run()
+    logging.info(stats)
+    return len(stats.failures) + len(stats.dark), timer.timings
+
 
 class AnsibleRunner:
 
     def __init__(self, config):
+        global _fact_cache_cleanup_registered
         self.provisiong_config = config
+        self.fact_cache_dir = fact_cache_dir(config)
+        # '<play>: <task>' -> total seconds, across every playbook run by this runner
+        self.task_timings = OrderedDict()
+
+        if not _fact_cache_cleanup_registered:
+            atexit.register(_remove_run_fact_caches)
+            _fact_cache_cleanup_registered = True
 
     def run_ansible_playbook(self, script_name, extra_vars={}, subset=constants.DEFAULT_SUBSET):
+        return self.run_ansible_playbooks([script_name], extra_vars=extra_vars, subset=subset)
+
+    def run_ansible_playbooks(self, script_names, extra_vars={}, subset=constants.DEFAULT_SUBSET):
+        """ Runs 'script_names' in order in one ansible session, so facts are gathered once and
+        connections are shared. Returns the number of failed and unreachable hosts (0 on success).
+        """
+
+        status, timings = _run_playbooks(self.provisiong_config, script_names, extra_vars, subset, self.fact_cache_dir)
+        self._record_timings(timings)
+        return status
+
+    def run_ansible_playbooks_parallel(self, runs, subset=constants.DEFAULT_SUBSET):
+        """ Runs playbooks that do not depend on each other (ex. they target different hosts) concurrently.
+        'runs' is a list of (script_names, extra_vars), each run in its own session and process.
+        Returns the status of each run, in order.
+
+        Workers are spawned rather than forked: by now the test process has SDK, thread pool and
+        ssh threads whose locks a forked child could inherit mid use.
+        """
+
+        if len(runs) == 1:
+            script_names, extra_vars = runs[0]
+            return [self.run_ansible_playbooks(script_names, extra_vars=extra_vars, subset=subset)]
 
-        inventory_filename = self.provisiong_config
+        with ProcessPoolExecutor(max_workers=len(runs), mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(_run_playbooks, self.provisiong_config, script_names, extra_vars, subset, self.fact_cache_dir)
+                for script_names, extra_vars in runs
+            ]
+            results = [future.result() for future in futures]
 
-        playbook_filename = "{}/{}".format(PLAYBOOKS_HOME, script_name)
+        statuses = []
+        for status, timings in results:
+            self._record_timings(timings)
+            statuses.append(status)
+        return statuses
 
-        runner = Runner(
-            inventory_filename=inventory_filename,
-            playbook=playbook_filename,
-            extra_vars=extra_vars,
-            verbosity=0,  # change this to a higher number for -vvv debugging (try 10),
-            subset=subset
-        )
+    def _record_timings(self, timings):
+        for task, secs in timings.items():
+            self.task_timings[task] = self.task_timings.get(task, 0) + secs
 
-        stats = runner.run()
-        logging.info(stats)
-        return len(stats.failures) + len(stats.dark)
+        slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+        logging.info("Slowest tasks: {}".format(", ".join("{} ({:.1f}s)".format(task, secs) for task, secs in slowest)))
@@ -1,6 +1,4 @@
-import requests
 import json
-import concurrent.futures
 import os
 import time
 
@@ -9,6 +7,9 @@ from libraries.testkit import settings
 from libraries.testkit.debug import log_request
 from libraries.testkit.debug import log_response
 from keywords import cbgtconfig
+from keywords import principals
+from keywords import transport
+from keywords.exceptions import BulkProvisioningError
 from utilities.cluster_config_utils import sg_ssl_enabled
 from keywords.utils import log_info
 
@@ -30,11 +31,14 @@ class Admin:
         self._headers = {"Content-Type": "application/json"}
         self.auth = None
 
+        # Keep-alive pool used for user / role provisioning
+        self._session = transport.new_session(headers=self._headers, verify=False)
+
     def create_db(self, name):
         if self.auth:
-            r = requests.put("{}/{}".format(self.admin_url, name), verify=False, auth=self.auth)
+            r = transport.put("{}/{}".format(self.admin_url, name), verify=False, auth=self.auth)
         else:
-            r = requests.put("{}/{}".format(self.admin_url, name), verify=False)
+            r = transport.put("{}/{}".format(self.admin_url, name), verify=False)
         log_request(r)
         log_response(r)
         r.raise_for_status()
@@ -42,9 +46,9 @@ class Admin:
 
     def delete_db(self, name):
         if self.auth:
-            r = requests.delete("{}/{}".format(self.admin_url, name), verify=False, auth=self.auth)
+            r = transport.delete("{}/{}".format(self.admin_url, name), verify=False, auth=self.auth)
         else:
-            r = requests.delete("{}/{}".format(self.admin_url, name), verify=False)
+            r = transport.delete("{}/{}".format(self.admin_url, name), verify=False)
         log_request(r)
         log_response(r)
         r.raise_for_status()
@@ -52,9 +56,9 @@ class Admin:
 
     def get_dbs(self):
         if self.auth:
-            r = requests.get("{}/_all_dbs".format(self.admin_url), verify=False, auth=self.auth)
+            r = transport.get("{}/_all_dbs".format(self.admin_url), verify=False, auth=self.auth)
         else:
-            r = requests.get("{}/_all_dbs".format(self.admin_url), verify=False)
+            r = transport.get("{}/_all_dbs".format(self.admin_url), verify=False)
         log.info("GET {}".format(r.url))
         r.raise_for_status()
         return r.json()
@@ -62,9 +66,9 @@ class Admin:
     # GET /{db}/
     def get_db_info(self, db):
         if self.auth:
-            resp = requests.get("{0}/{1}/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -73,18 +77,18 @@ class Admin:
     def create_role(self, db, name, channels):
         data = {"name": name, "admin_channels": channels}
         if self.auth:
-            resp = requests.put("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False, auth=self.auth)
+            resp = transport.put("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False, auth=self.auth)
         else:
-            resp = requests.put("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False)
+            resp = transport.put("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False)
         log.info("PUT {}".format(resp.url))
         resp.raise_for_status()
 
     # GET /{db}/_role
     def get_roles(self, db):
         if self.auth:
-            resp = requests.get("{0}/{1}/_role/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_role/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_role/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_role/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -92,9 +96,9 @@ class Admin:
     # GET /{db}/_role/{name}
     def get_role(self, db, name):
         if self.auth:
-            resp = requests.get("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_role/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -104,10 +108,7 @@ class Admin:
 
         data = {"name": name, "password": password, "admin_channels": channels, "admin_roles": roles}
 
-        if self.auth:
-            resp = requests.put("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False, auth=self.auth)
-        else:
-            resp = requests.put("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False)
+        resp = self._session.put("{0}/{1}/_user/{2}".format(self.admin_url, db, name), timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), auth=self.auth)
         log.info("PUT {}".format(resp.url))
         resp.raise_for_status()
 
@@ -118,27 +119,74 @@ class Admin:
         if type(channels) is not list:
             raise ValueError("Channels needs to be a list")
 
-        users = []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=num_of_workers) as executor:
-            futures = [executor.submit(self.register_user, target=target, db=db, name="{}_{}".format(name_prefix, i), password=password, channels=channels, roles=roles) for i in range(number)]
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    user = future.result()
-                    users.append(user)
-                except Exception as e:
-                    raise ValueError("register_bulk_users failed: {}".format(e))
+        users_to_create = (
+            {"name": "{}_{}".format(name_prefix, i), "password": password, "channels": channels, "roles": roles}
+            for i in range(number)
+        )
+
+        try:
+            users = list(self.provision_users(target, db, users_to_create, num_of_workers=num_of_workers))
+        except BulkProvisioningError as e:
+            raise ValueError("register_bulk_users failed: {}".format(e))
 
         if len(users) != number:
             raise ValueError("Not all users added during register_bulk users")
 
         return users
 
+    # PUT /{db}/_user/{name} pipelined
+    def provision_users(self, target, db, users, num_of_workers=settings.MAX_REQUEST_WORKERS, max_retries=settings.MAX_HTTP_RETRIES):
+        """ Lazily creates users with their channel / role grants over the pooled admin session.
+
+        'users' is an iterable of dictionaries with 'name', 'password' and optional 'channels' and 'roles'.
+        Yields a User for each user as it is created, with at most 'num_of_workers' PUTs in flight.
+        Raises BulkProvisioningError after the input is exhausted if any user failed. Its 'failed'
+        property holds the Admin REST API bodies of those users which can be passed back in to resume.
+        """
+
+        def bodies():
+            for user in users:
+                if "admin_channels" in user:
+                    # Already a REST API body, ex. from BulkProvisioningError.failed
+                    yield user
+                else:
+                    yield principals.user_body(user["name"], user["password"], user.get("channels"), user.get("roles"))
+
+        created = principals.put_principals(
+            self._session, self.admin_url, db, "user", bodies(),
+            auth=self.auth, max_in_flight=num_of_workers, max_retries=max_retries
+        )
+        for body in created:
+            yield User(target, db, body["name"], body["password"], body["admin_channels"])
+
+    # PUT /{db}/_role/{name} pipelined
+    def provision_roles(self, db, roles, num_of_workers=settings.MAX_REQUEST_WORKERS, max_retries=settings.MAX_HTTP_RETRIES):
+        """ Lazily creates roles over the pooled admin session.
+
+        'roles' is an iterable of dictionaries with 'name' and optional 'channels'.
+        Yields each role name as it is created. Failures are reported the same way as provision_users.
+        """
+
+        def bodies():
+            for role in roles:
+                if "admin_channels" in role:
+                    yield role
+                else:
+                    yield principals.role_body(role["name"], role.get("channels"))
+
+        created = principals.put_principals(
+            self._session, self.admin_url, db, "role", bodies(),
+            auth=self.auth, max_in_flight=num_of_workers, max_retries=max_retries
+        )
+        for body in created:
+            yield body["name"]
+
     # GET /{db}/_user/
     def get_users_info(self, db):
         if self.auth:
-            resp = requests.get("{0}/{1}/_user/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_user/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_user/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_user/".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -146,9 +194,9 @@ class Admin:
     # GET /{db}/_user/{name}
     def get_user_info(self, db, name):
         if self.auth:
-            resp = requests.get("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_user/{2}".format(self.admin_url, db, name), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -157,9 +205,9 @@ class Admin:
     def db_resync(self, db):
         result = dict()
         if self.auth:
-            resp = requests.post("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.post("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.post("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.post("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("POST {}".format(resp.url))
         resp.raise_for_status()
         result['status_code'] = resp.status_code
@@ -170,9 +218,9 @@ class Admin:
     def db_get_resync_status(self, db):
         result = dict()
         if self.auth:
-            resp = requests.get("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_resync".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         result['status_code'] = resp.status_code
@@ -186,9 +234,9 @@ class Admin:
             data = {"delay": delay}
 
         if self.auth:
-            resp = requests.post("{0}/{1}/_online".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False, auth=self.auth)
+            resp = transport.post("{0}/{1}/_online".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False, auth=self.auth)
         else:
-            resp = requests.post("{0}/{1}/_online".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False)
+            resp = transport.post("{0}/{1}/_online".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(data), verify=False)
         log.info("POST {}".format(resp.url))
         resp.raise_for_status()
         return resp.status_code
@@ -196,9 +244,9 @@ class Admin:
     # POST /{db}/_offline
     def take_db_offline(self, db):
         if self.auth:
-            resp = requests.post("{0}/{1}/_offline".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.post("{0}/{1}/_offline".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.post("{0}/{1}/_offline".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.post("{0}/{1}/_offline".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("POST {}".format(resp.url))
         resp.raise_for_status()
         return resp.status_code
@@ -206,9 +254,9 @@ class Admin:
     # GET /{db}/_config
     def get_db_config(self, db):
         if self.auth:
-            resp = requests.get("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -216,9 +264,9 @@ class Admin:
     # PUT /{db}/_config
     def put_db_config(self, db, config):
         if self.auth:
-            resp = requests.put("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(config), verify=False, auth=self.auth)
+            resp = transport.put("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(config), verify=False, auth=self.auth)
         else:
-            resp = requests.put("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(config), verify=False)
+            resp = transport.put("{0}/{1}/_config".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, data=json.dumps(config), verify=False)
         log.info("PUT {}".format(resp.url))
         resp.raise_for_status()
         return resp.status_code
@@ -229,9 +277,9 @@ class Admin:
         Return an CbgtConfig object that exposes common methods useful in validation"""
 
         if self.auth:
-            resp = requests.get("{0}/_cbgt/api/cfg".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/_cbgt/api/cfg".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/_cbgt/api/cfg".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/_cbgt/api/cfg".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return cbgtconfig.CbgtConfig(resp.json())
@@ -239,9 +287,9 @@ class Admin:
     # GET /_cbgt/api/diag
     def get_cbgt_diagnostics(self):
         if self.auth:
-            resp = requests.get("{0}/_cbgt/api/diag".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/_cbgt/api/diag".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/_cbgt/api/diag".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/_cbgt/api/diag".format(self.admin_url), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -249,9 +297,9 @@ class Admin:
     # GET /{db}/_changes
     def get_global_changes(self, db):
         if self.auth:
-            r = requests.get("{}/{}/_changes".format(self.admin_url, db), verify=False, auth=self.auth)
+            r = transport.get("{}/{}/_changes".format(self.admin_url, db), verify=False, auth=self.auth)
         else:
-            r = requests.get("{}/{}/_changes".format(self.admin_url, db), verify=False)
+            r = transport.get("{}/{}/_changes".format(self.admin_url, db), verify=False)
         log_request(r)
         log_response(r)
         r.raise_for_status()
@@ -261,9 +309,9 @@ class Admin:
     # GET /_active_tasks
     def get_active_tasks(self):
         if self.auth:
-            r = requests.get("{}/_active_tasks".format(self.admin_url), verify=False, auth=self.auth)
+            r = transport.get("{}/_active_tasks".format(self.admin_url), verify=False, auth=self.auth)
         else:
-            r = requests.get("{}/_active_tasks".format(self.admin_url), verify=False)
+            r = transport.get("{}/_active_tasks".format(self.admin_url), verify=False)
         log_request(r)
         log_response(r)
         r.raise_for_status()
@@ -272,9 +320,9 @@ class Admin:
 
     def get_all_docs(self, db):
         if self.auth:
-            resp = requests.get("{0}/{1}/_all_docs".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
+            resp = transport.get("{0}/{1}/_all_docs".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False, auth=self.auth)
         else:
-            resp = requests.get("{0}/{1}/_all_docs".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
+            resp = transport.get("{0}/{1}/_all_docs".format(self.admin_url, db), headers=self._headers, timeout=settings.HTTP_REQ_TIMEOUT, verify=False)
         log.info("GET {}".format(resp.url))
         resp.raise_for_status()
         return resp.json()
@@ -285,9 +333,9 @@ class Admin:
         max_count = 5
         while True:
             if self.auth:
-                r = requests.get("{}/{}/_replicationStatus".format(self.admin_url, db), verify=False, auth=self.auth)
+                r = transport.get("{}/{}/_replicationStatus".format(self.admin_url, db), verify=False, auth=self.auth)
             else:
-                r = requests.get("{}/{}/_replicationStatus".format(self.admin_url, db), verify=False)
+                r = transport.get("{}/{}/_replicationStatus".format(self.admin_url, db), verify=False)
             log_request(r)
             log_response(r)
             r.raise_for_status()
@@ -320,9 +368,9 @@ class Admin:
         write_retry_count = 0
         while count < max_times:
             if self.auth:
-                r = requests.get("{}/{}/_replicationStatus/{}".format(self.admin_url, db, repl_id), verify=False, auth=self.auth)
+                r = transport.get("{}/{}/_replicationStatus/{}".format(self.admin_url, db, repl_id), verify=False, auth=self.auth)
             else:
-                r = requests.get("{}/{}/_replicationStatus/{}".format(self.admin_url, db, repl_id), verify=False)
+                r = transport.get("{}/{}/_replicationStatus/{}".format(self.admin_url, db, repl_id), verify=False)
             r.raise_for_status()
             resp_obj = r.json()
             status = resp_obj["status"]
@@ -372,9 +420,9 @@ class Admin:
         max_count = 15
         while True:
             if self.auth:
-                r = requests.get("{}/{}/_replication".format(self.admin_url, db), verify=False, auth=self.auth)
+                r = transport.get("{}/{}/_replication".format(self.admin_url, db), verify=False, auth=self.auth)
             else:
-                r = requests.get("{}/{}/_replication".format(self.admin_url, db), verify=False)
+                r = transport.get("{}/{}/_replication".format(self.admin_url, db), verify=False)
             log_request(r)
             log_response(r)
             r.raise_for_status()
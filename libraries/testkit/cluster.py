@@ -1,6 +1,9 @@
+import hashlib
 import json
 import os
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from requests.exceptions import ConnectionError
 
@@ -8,7 +11,7 @@ import keywords.exceptions
 from keywords.couchbaseserver import CouchbaseServer
 from keywords.exceptions import ProvisioningError
 from keywords.utils import log_info, add_cbs_to_sg_config_server_field
-from libraries.provision.ansible_runner import AnsibleRunner
+from libraries.provision.ansible_runner import AnsibleRunner, clear_fact_cache
 from libraries.testkit.admin import Admin
 from libraries.testkit.config import Config
 from libraries.testkit.sgaccel import SgAccel
@@ -20,6 +23,10 @@ from utilities.cluster_config_utils import generate_x509_certs, is_x509_auth, ge
 from keywords.constants import SYNC_GATEWAY_CERT
 from utilities.cluster_config_utils import get_sg_replicas, get_sg_use_views, get_sg_version
 from utilities.cluster_config_utils import is_centralized_persistent_config_disabled, is_server_tls_skip_verify_enabled, is_admin_auth_disabled, is_tls_server_disabled
+from utilities.cluster_config_utils import is_fast_reset_enabled
+
+# cluster config -> fingerprint and start playbook vars of the last successful reset in this process
+_previous_resets = {}
 
 
 class Cluster:
@@ -112,48 +119,127 @@ class Cluster:
         self.sg_accels = [SgAccel(cluster_config=self._cluster_config, target=ac) for ac in acs]
         self.servers = [CouchbaseServer(url=cb_url) for cb_url in cbs_urls]
         self.sync_gateway_config = None  # will be set to Config object when reset() called
+        self.reset_timings = OrderedDict()  # phase -> seconds of the last reset() call
+
+    def reset(self, sg_config_path, fast=None):
+        """ Reset the cluster to a clean state and start sync_gateway (and sg_accel in di mode) with 'sg_config_path'.
+
+        If 'fast' is True (defaults to the 'fast_reset' cluster config environment property) and the bucket set,
+        sync_gateway config and cluster config are unchanged since the last reset of this cluster config in
+        this process, the buckets are flushed instead of deleted and recreated and playbooks whose inputs have
+        not changed are skipped. Otherwise a full reset is done.
 
-    def reset(self, sg_config_path):
+        The time taken by each phase is stored in 'self.reset_timings'
+        """
 
         ansible_runner = AnsibleRunner(self._cluster_config)
+        self.reset_timings = OrderedDict()
+
+        if fast is None:
+            fast = is_fast_reset_enabled(self._cluster_config)
 
         log_info(">>> Reseting cluster ...")
         log_info(">>> CBS SSL enabled: {}".format(self.cbs_ssl))
         log_info(">>> Using xattrs: {}".format(self.xattrs))
 
-        # Stop sync_gateways
-        log_info(">>> Stopping sync_gateway")
-        status = ansible_runner.run_ansible_playbook("stop-sync-gateway.yml")
-        assert status == 0, "Failed to stop sync gateway"
-
-        # Stop sync_gateway accels
-        log_info(">>> Stopping sg_accel")
-        status = ansible_runner.run_ansible_playbook("stop-sg-accel.yml")
-        assert status == 0, "Failed to stop sg_accel"
-
-        # Deleting sync_gateway artifacts
-        log_info(">>> Deleting sync_gateway artifacts")
-        status = ansible_runner.run_ansible_playbook("delete-sync-gateway-artifacts.yml")
-        assert status == 0, "Failed to delete sync_gateway artifacts"
-
-        # Deleting sg_accel artifacts
-        log_info(">>> Deleting sg_accel artifacts")
-        status = ansible_runner.run_ansible_playbook("delete-sg-accel-artifacts.yml")
-        assert status == 0, "Failed to delete sg_accel artifacts"
-
-        # Delete buckets
-        log_info(">>> Deleting buckets on: {}".format(self.servers[0].url))
-        self.servers[0].delete_buckets()
-
         # Parse config and grab bucket names
         config_path_full = os.path.abspath(sg_config_path)
         config = Config(config_path_full)
         mode = config.get_mode()
         bucket_name_set = config.get_bucket_name_set()
-        sg_cert_path = os.path.abspath(SYNC_GATEWAY_CERT)
-        cbs_cert_path = os.path.join(os.getcwd(), "certs")
         bucket_names = get_buckets_from_sync_gateway_config(sg_config_path)
 
+        fingerprint = self._reset_fingerprint(config_path_full, bucket_name_set, mode)
+
+        # Forget the previous reset until this one succeeds
+        previous_reset = _previous_resets.pop(self._cluster_config, None)
+
+        if fast and previous_reset is not None and previous_reset["fingerprint"] == fingerprint:
+            with self._timed_phase("check_buckets"):
+                existing_buckets = set(self.servers[0].get_bucket_names())
+            if existing_buckets == set(bucket_name_set):
+                playbook_vars = self._fast_reset(ansible_runner, config, bucket_name_set, previous_reset["playbook_vars"])
+            else:
+                log_info(">>> Buckets changed since last reset ({} != {}), doing full reset".format(existing_buckets, bucket_name_set))
+                playbook_vars = self._full_reset(ansible_runner, config, config_path_full, bucket_name_set, bucket_names)
+        else:
+            playbook_vars = self._full_reset(ansible_runner, config, config_path_full, bucket_name_set, bucket_names)
+
+        _previous_resets[self._cluster_config] = {
+            "fingerprint": fingerprint,
+            "playbook_vars": playbook_vars
+        }
+
+        # Validate CBGT
+        if mode == "di":
+            with self._timed_phase("validate_cbgt"):
+                if not self.validate_cbgt_pindex_distribution_retry(len(self.sg_accels)):
+                    self.save_cbgt_diagnostics()
+                    raise Exception("Failed to validate CBGT Pindex distribution")
+            log_info(">>> Detected valid CBGT Pindex distribution")
+        else:
+            log_info(">>> Running in channel cache")
+
+        log_info(">>> Reset timings (s): {}".format(", ".join("{}: {:.2f}".format(phase, secs) for phase, secs in self.reset_timings.items())))
+
+        return mode
+
+    @contextmanager
+    def _timed_phase(self, phase):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.reset_timings[phase] = time.time() - start
+
+    def _reset_fingerprint(self, config_path_full, bucket_name_set, mode):
+        """ Hash of everything the sync_gateway playbook vars and bucket set are derived from """
+
+        fingerprint = hashlib.sha256()
+        for path in [config_path_full, "{}.json".format(self._cluster_config)]:
+            with open(path, "rb") as f:
+                fingerprint.update(f.read())
+        fingerprint.update(json.dumps(sorted(bucket_name_set)).encode())
+        fingerprint.update(mode.encode())
+        return fingerprint.hexdigest()
+
+    def _stop_sync_gateways(self, ansible_runner, include_accels=True):
+        # Stop sync_gateways and delete their artifacts. sg_accels are on other hosts so they are handled in parallel
+        log_info(">>> Stopping sync_gateway and deleting sync_gateway artifacts")
+        runs = [(["stop-sync-gateway.yml", "delete-sync-gateway-artifacts.yml"], {})]
+        if include_accels:
+            log_info(">>> Stopping sg_accel and deleting sg_accel artifacts")
+            runs.append((["stop-sg-accel.yml", "delete-sg-accel-artifacts.yml"], {}))
+
+        with self._timed_phase("stop_sync_gateways"):
+            statuses = ansible_runner.run_ansible_playbooks_parallel(runs)
+        assert statuses[0] == 0, "Failed to stop sync gateway or delete sync_gateway artifacts"
+        if include_accels:
+            assert statuses[1] == 0, "Failed to stop sg_accel or delete sg_accel artifacts"
+
+    def _start_sync_gateways(self, ansible_runner, mode, playbook_vars):
+        # HACK - only enable sg_accel for distributed index tests
+        # revise this with https://github.com/couchbaselabs/sync-gateway-testcluster/issues/222
+        playbooks = ["start-sync-gateway.yml"]
+        if mode == "di":
+            playbooks.append("start-sg-accel.yml")
+
+        with self._timed_phase("start_sync_gateways"):
+            status = ansible_runner.run_ansible_playbooks(playbooks, extra_vars=playbook_vars)
+        assert status == 0, "Failed to start Sync Gateway"
+
+    def _full_reset(self, ansible_runner, config, config_path_full, bucket_name_set, bucket_names):
+        """ Stop everything, delete and recreate the buckets and start sync_gateway. Returns the start playbook vars """
+
+        # Hosts may have been reprovisioned since facts were cached
+        clear_fact_cache(self._cluster_config)
+        self._stop_sync_gateways(ansible_runner)
+
+        # Delete buckets
+        log_info(">>> Deleting buckets on: {}".format(self.servers[0].url))
+        with self._timed_phase("delete_buckets"):
+            self.servers[0].delete_buckets()
+
         self.sync_gateway_config = config
 
         is_valid, reason = validate_cluster(self.sync_gateways, self.sg_accels, config)
@@ -162,16 +248,73 @@ class Cluster:
 
         log_info(">>> Creating buckets on: {}".format(self.servers[0].url))
         log_info(">>> Creating buckets {}".format(bucket_name_set))
-        self.servers[0].create_buckets(bucket_names=bucket_name_set,
-                                       cluster_config=self._cluster_config,
-                                       ipv6=self.ipv6)
+        with self._timed_phase("create_buckets"):
+            self.servers[0].create_buckets(bucket_names=bucket_name_set,
+                                           cluster_config=self._cluster_config,
+                                           ipv6=self.ipv6)
 
         # Wait for server to be in a warmup state to work around
         # https://github.com/couchbase/sync_gateway/issues/1745
         log_info(">>> Waiting for Server: {} to be in a healthy state".format(self.servers[0].url))
-        self.servers[0].wait_for_ready_state()
+        with self._timed_phase("wait_for_ready_state"):
+            self.servers[0].wait_for_ready_state()
 
         log_info(">>> Starting sync_gateway with configuration: {}".format(config_path_full))
+        with self._timed_phase("build_playbook_vars"):
+            playbook_vars = self._build_sync_gateway_playbook_vars(config_path_full, bucket_names)
+
+        if self.cbs_ssl and get_sg_version(self._cluster_config) >= "1.5.0":
+            with self._timed_phase("block_http_ports"):
+                self._block_http_ports(ansible_runner)
+
+        # Sleep for a few seconds for the indexes to teardown
+        with self._timed_phase("index_teardown_sleep"):
+            time.sleep(5)
+
+        self._start_sync_gateways(ansible_runner, config.get_mode(), playbook_vars)
+        return playbook_vars
+
+    def _fast_reset(self, ansible_runner, config, bucket_name_set, playbook_vars):
+        """ Reset for when the buckets, sync_gateway config and cluster config are the same as the previous reset.
+
+        Only sync_gateway state is cleared: sync_gateway (and sg_accel in di mode) is stopped, its artifacts are
+        deleted and the existing buckets (created with flushEnabled) are flushed. Bucket creation, x509 cert
+        generation, http port blocking and the index teardown sleep are skipped since their inputs are unchanged.
+        """
+
+        log_info(">>> Fast reset: bucket set and configs unchanged since last reset")
+        mode = config.get_mode()
+        self._stop_sync_gateways(ansible_runner, include_accels=(mode == "di"))
+
+        self.sync_gateway_config = config
+
+        log_info(">>> Flushing buckets {} on: {}".format(bucket_name_set, self.servers[0].url))
+        with self._timed_phase("flush_buckets"):
+            self.servers[0].flush_buckets(list(bucket_name_set))
+
+        with self._timed_phase("wait_for_ready_state"):
+            self.servers[0].wait_for_ready_state()
+
+        self._start_sync_gateways(ansible_runner, mode, playbook_vars)
+        return playbook_vars
+
+    def _block_http_ports(self, ansible_runner):
+        block_http_vars = {}
+        port_list = [8091, 8092, 8093, 8094, 8095, 8096, 11210, 11211]
+        for port in port_list:
+            block_http_vars["port"] = port
+            status = ansible_runner.run_ansible_playbook(
+                "block-http-ports.yml",
+                extra_vars=block_http_vars
+            )
+            if status != 0:
+                raise ProvisioningError("Failed to block port on SGW")
+
+    def _build_sync_gateway_playbook_vars(self, config_path_full, bucket_names):
+        """ Build the extra vars for start-sync-gateway.yml / start-sg-accel.yml """
+
+        sg_cert_path = os.path.abspath(SYNC_GATEWAY_CERT)
+        cbs_cert_path = os.path.join(os.getcwd(), "certs")
 
         server_port = ""
         server_scheme = "couchbase"
@@ -263,16 +406,6 @@ class Cluster:
         if self.cbs_ssl and get_sg_version(self._cluster_config) >= "1.5.0":
             playbook_vars["server_scheme"] = "couchbases"
             playbook_vars["server_port"] = 11207
-            block_http_vars = {}
-            port_list = [8091, 8092, 8093, 8094, 8095, 8096, 11210, 11211]
-            for port in port_list:
-                block_http_vars["port"] = port
-                status = ansible_runner.run_ansible_playbook(
-                    "block-http-ports.yml",
-                    extra_vars=block_http_vars
-                )
-                if status != 0:
-                    raise ProvisioningError("Failed to block port on SGW")
         # Add configuration to run with xattrs
         if self.xattrs:
             if get_sg_version(self._cluster_config) >= "2.1.0":
@@ -315,35 +448,7 @@ class Cluster:
         if is_admin_auth_disabled(self._cluster_config) and get_sg_version(self._cluster_config) >= "3.0.0":
             playbook_vars["disable_admin_auth"] = '"admin_interface_authentication": false,    \n"metrics_interface_authentication": false,'
 
-        # Sleep for a few seconds for the indexes to teardown
-        time.sleep(5)
-
-        status = ansible_runner.run_ansible_playbook(
-            "start-sync-gateway.yml",
-            extra_vars=playbook_vars
-        )
-        assert status == 0, "Failed to start to Sync Gateway"
-
-        # HACK - only enable sg_accel for distributed index tests
-        # revise this with https://github.com/couchbaselabs/sync-gateway-testcluster/issues/222
-        if mode == "di":
-            # Start sg-accel
-            status = ansible_runner.run_ansible_playbook(
-                "start-sg-accel.yml",
-                extra_vars=playbook_vars
-            )
-            assert status == 0, "Failed to start sg_accel"
-
-        # Validate CBGT
-        if mode == "di":
-            if not self.validate_cbgt_pindex_distribution_retry(len(self.sg_accels)):
-                self.save_cbgt_diagnostics()
-                raise Exception("Failed to validate CBGT Pindex distribution")
-            log_info(">>> Detected valid CBGT Pindex distribution")
-        else:
-            log_info(">>> Running in channel cache")
-
-        return mode
+        return playbook_vars
 
     def restart_services(self):
         ansible_runner = AnsibleRunner(self._cluster_config)
@@ -1,97 +1,223 @@
-import requests
-from requests import HTTPError
-from libraries.testkit.debug import log_request, log_response
-import subprocess
-from subprocess import PIPE
-from sys import platform
-import os
-import signal
-
-
-def kill_prometheus_process():
-    command = ['pgrep', 'prometheus']
-    result = subprocess.run(command, stdout=PIPE, stderr=PIPE, universal_newlines=True)
-    pids = result.stdout
-    if pids:
-        # Lazy fix for if there are multiple pids
-        pids = pids.split("\n")
-        for pid in pids:
-            if pid is not '':
-                os.kill(int(pid), signal.SIGKILL)
-
-
-def start_prometheus(sg_ip, ssl=False, need_auth=False):
-    # Interrupted executions might leave the stale processes
-    kill_prometheus_process()
-    if need_auth:
-        prometheus_file = os.getcwd() + "/libraries/provision/ansible/playbooks/prometheus_with_auth.yml"
-    else:
-        prometheus_file = os.getcwd() + "/libraries/provision/ansible/playbooks/prometheus.yml"
-    commd = "sed -i -e 's/promotheus_sg_ip/" + sg_ip + "/g' " + prometheus_file
-    subprocess.run([commd], shell=True)
-    if ssl:
-        commd = "sed -i -e 's/http/https/g' " + prometheus_file
-        subprocess.run([commd], shell=True)
-    config_param = "--config.file=" + prometheus_file
-    subprocess.Popen(["prometheus", config_param])
-
-
-def stop_prometheus(sg_ip, ssl=False, need_auth=False):
-    if need_auth:
-        prometheus_file = os.getcwd() + "/libraries/provision/ansible/playbooks/prometheus_with_auth.yml"
-    else:
-        prometheus_file = os.getcwd() + "/libraries/provision/ansible/playbooks/prometheus.yml"
-    commd = "sed -i -e 's/" + sg_ip + "/promotheus_sg_ip/g' " + prometheus_file
-    subprocess.run([commd], shell=True)
-    if ssl:
-        commd = "sed -i -e 's/https/http/g' " + prometheus_file
-        subprocess.run([commd], shell=True)
-    kill_prometheus_process()
-
-
-def is_prometheus_installed():
-    try:
-        subprocess.run(['prometheus --version'], check=True, shell=True)
-    except:
-        return False
-    return True
-
-
-def get_platform():
-    return platform
+from keywords import transport
+from keywords.constants import RBAC_FULL_ADMIN
+from keywords.utils import log_info
+from libraries.utilities.metric_store import MetricWriter
+from requests.exceptions import RequestException
+import math
+import re
+import threading
+import time
+from collections import deque, namedtuple
+
+SCRAPE_INTERVAL = 5
+# Snapshots kept in memory, ex. the last hour at the default interval
+MAX_SNAPSHOTS = 720
+
+# One sample of the Prometheus text exposition format, ex. sgw_database_num_doc_writes{database="db"} 12
+Sample = namedtuple("Sample", ["name", "labels", "value"])
+
+_SAMPLE_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)(?:\s+-?\d+)?$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"')
+_LABEL_ESCAPE = re.compile(r"\\(.)")
+_SPECIAL_VALUES = {"NaN": math.nan, "+Inf": math.inf, "-Inf": -math.inf}
+
+
+def _unescape_label(value):
+    return _LABEL_ESCAPE.sub(lambda match: "\n" if match.group(1) == "n" else match.group(1), value)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def parse_metrics(text):
+    """ Parses the Prometheus text format served by Sync Gateway's _metrics endpoint into a list of Samples.
+    Comment lines (# HELP, # TYPE) are skipped and labels are returned as a dict.
+    """
+
+    samples = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        match = _SAMPLE_LINE.match(line)
+        if match is None:
+            raise ValueError("Invalid Prometheus sample: {}".format(line))
+
+        name, labels, value = match.groups()
+        labels = {key: _unescape_label(label) for key, label in _LABEL.findall(labels or "")}
+        value = _SPECIAL_VALUES[value] if value in _SPECIAL_VALUES else float(value)
+        samples.append(Sample(name, labels, value))
+    return samples
+
+
+def series_key(name, labels):
+    """ Returns the Prometheus style key for a series, ex. 'sgw_database_num_doc_writes{database="db"}' """
+
+    if not labels:
+        return name
+    return "{}{{{}}}".format(name, ",".join('{}="{}"'.format(key, _escape_label(labels[key])) for key in sorted(labels)))
+
+
+def metrics_snapshot(samples):
+    """ Flattens samples into {series key: value}. Each metric name also maps to the sum over all of its series,
+    so a metric can be followed without knowing its label values (ex. the database names) up front.
+    """
+
+    snapshot = {}
+    for sample in samples:
+        snapshot[series_key(sample.name, sample.labels)] = sample.value
+        if sample.labels:
+            snapshot[sample.name] = snapshot.get(sample.name, 0) + sample.value
+    return snapshot
+
+
+class PrometheusScraper:
+    """ Scrapes a Sync Gateway _metrics endpoint from the test process every 'interval' seconds and keeps the
+    latest 'max_snapshots' snapshots in memory. If 'capture_path' is given, 'capture_metrics' from each snapshot
+    are also appended to a metric_store capture there.
+
+    Test phases are recorded with mark(), and delta() / rate() compare a metric between two marks, ex.
+        scraper.mark("before_push")
+        ... push docs ...
+        scraper.delta("sgw_database_num_doc_writes", "before_push")
+    """
+
+    def __init__(self, url, auth=None, verify=False, interval=SCRAPE_INTERVAL, max_snapshots=MAX_SNAPSHOTS,
+                 capture_path=None, capture_metrics=None):
+        self.url = url
+        self.auth = auth
+        self.verify = verify
+        self.interval = interval
+        self.snapshots = deque(maxlen=max_snapshots)
+        self.marks = {}
+        self.last_error = None
+
+        self._writer = MetricWriter(capture_path, capture_metrics) if capture_path is not None else None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def scrape(self):
+        """ Scrapes the endpoint now. Returns (timestamp, snapshot) and keeps the snapshot """
+
+        timestamp = time.time()
+        resp = transport.get(self.url, auth=self.auth, verify=self.verify, timeout=max(self.interval, 1))
+        resp.raise_for_status()
+        snapshot = metrics_snapshot(parse_metrics(resp.text))
+
+        with self._lock:
+            self.snapshots.append((timestamp, snapshot))
+            if self._writer is not None:
+                self._writer.append(self.url, snapshot, timestamp=timestamp)
+        return timestamp, snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.scrape()
+            except (RequestException, ValueError) as e:
+                # ValueError is an exposition line parse_metrics does not understand, keep polling regardless
+                self.last_error = e
+                log_info("Failed to scrape {}: {}".format(self.url, e))
+            self._stop.wait(self.interval)
+
+    def start(self):
+        log_info("Scraping {} every {}s".format(self.url, self.interval))
+        self._thread = threading.Thread(target=self._run, name="prometheus-scraper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._writer is not None:
+            self._writer.close()
+
+    def history(self, stat_name):
+        """ Returns [(timestamp, value)] for 'stat_name' from the snapshots in memory """
+
+        with self._lock:
+            return [(timestamp, snapshot[stat_name]) for timestamp, snapshot in self.snapshots if stat_name in snapshot]
+
+    def mark(self, phase):
+        """ Scrapes now and records the snapshot as the boundary of test phase 'phase' """
+
+        self.marks[phase] = self.scrape()
+        return self.marks[phase][1]
+
+    def _mark(self, phase):
+        if phase is None:
+            return self.scrape()
+        try:
+            return self.marks[phase]
+        except KeyError:
+            raise ValueError("Phase '{}' was not marked. Marked phases: {}".format(phase, list(self.marks)))
+
+    def delta(self, stat_name, start_phase, end_phase=None):
+        """ Returns how much 'stat_name' (a metric name or series key) changed from 'start_phase' to 'end_phase',
+        or to now if 'end_phase' is None. A metric not served yet at 'start_phase' counts as 0.
+        """
+
+        _, start = self._mark(start_phase)
+        _, end = self._mark(end_phase)
+        if stat_name not in end:
+            raise ValueError("{} is not served by {}".format(stat_name, self.url))
+        return end[stat_name] - start.get(stat_name, 0)
+
+    def rate(self, stat_name, start_phase, end_phase=None):
+        """ Returns the per second rate of change of 'stat_name' between two phases (see delta()) """
+
+        start_time, start = self._mark(start_phase)
+        end_time, end = self._mark(end_phase)
+        if stat_name not in end:
+            raise ValueError("{} is not served by {}".format(stat_name, self.url))
+        if end_time <= start_time:
+            raise ValueError("Phase '{}' does not end after '{}' starts".format(end_phase, start_phase))
+        return (end[stat_name] - start.get(stat_name, 0)) / (end_time - start_time)
+
+
+# Scraper of the suite's Sync Gateway, managed by start_prometheus() / stop_prometheus()
+_scraper = None
+
+
+def metrics_url(sg_ip, ssl=False):
+    return "{}://{}:4986/_metrics".format("https" if ssl else "http", sg_ip)
+
+
+def start_prometheus(sg_ip, ssl=False, need_auth=False, interval=SCRAPE_INTERVAL):
+    """ Starts scraping the metrics of the Sync Gateway at 'sg_ip' in the background """
+
+    global _scraper
+    if _scraper is not None:
+        _scraper.stop()
+
+    auth = need_auth and (RBAC_FULL_ADMIN['user'], RBAC_FULL_ADMIN['pwd']) or None
+    _scraper = PrometheusScraper(metrics_url(sg_ip, ssl), auth=auth, interval=interval)
+    _scraper.start()
+    return _scraper
+
+
+def stop_prometheus(sg_ip=None, ssl=False, need_auth=False):
+    global _scraper
+    if _scraper is not None:
+        _scraper.stop()
+        _scraper = None
+
+
+def get_scraper():
+    if _scraper is None:
+        raise RuntimeError("Prometheus metrics are not being scraped. Run with --prometheus-enable")
+    return _scraper
 
 
 def verify_stat_on_prometheus(stat_name):
-    stats_data = query_prometheus(stat_name)
-    print(stats_data)
-    return stats_data["data"]["result"][0]["value"][0]
-
-
-def query_prometheus(stat_name, host_name="localhost"):
-    partial_url = "http://localhost:9090/api/v1/query?query="
-    try:
-        r = requests.get("{}{}".format(partial_url, stat_name))
-        log_request(r)
-        log_response(r)
-        r.raise_for_status()
-        resp_data = r.json()
-        return resp_data
-    except HTTPError:
-        raise HTTPError
-
-
-def install_prometheus():
-    if platform == "darwin":
-        subprocess.run("brew install prometheus", shell=True, check=True)
-        return is_prometheus_installed()
-    else:
-        url = "https://github.com/prometheus/prometheus/releases/download/v2.3.2/prometheus-2.3.2.linux-amd64.tar.gz"
-        cmd = 'wget %s' % url
-        subprocess.run(cmd, shell=True)
-        cmd4 = "tar -xvzf prometheus-2.3.2.linux-amd64.tar.gz"
-        subprocess.run(cmd4, shell=True)
-        cmd2 = 'cp prometheus-2.3.2.linux-amd64/prometheus /usr/local/bin/'
-        subprocess.run(cmd2, shell=True)
-        cmd3 = 'cp prometheus-2.3.2.linux-amd64/promtool /usr/local/bin/'
-        subprocess.run(cmd3, shell=True)
-        return is_prometheus_installed()
+    """ Scrapes Sync Gateway now and returns the scrape's timestamp if 'stat_name' is served, otherwise None """
+
+    timestamp, snapshot = get_scraper().scrape()
+    if stat_name not in snapshot:
+        log_info("{} is not served by {}".format(stat_name, get_scraper().url))
+        return None
+    log_info("{}: {}".format(stat_name, snapshot[stat_name]))
+    return timestamp
@@ -0,0 +1,96 @@
+import re
+import sys
+import threading
+from array import array
+from collections.abc import MutableMapping
+
+# Sync Gateway revs are '<generation>-<32 hex char md5 digest>'
+COMPACT_REV_PATTERN = re.compile(r"^(\d+)-([0-9a-f]{32})$")
+DIGEST_SIZE = 16
+
+
+class RevCache(MutableMapping):
+    """ Compact doc_id -> rev mapping used as the User doc cache.
+
+    Doc ids are interned so the same id string is shared by reference between
+    every user cache (and any dict merged from them). Revs that look like
+    Sync Gateway revs are stored as a generation in an array column plus a
+    16 byte digest in a bytearray column instead of a python string per rev.
+    Anything else (ex. a rev with a non hex digest) is kept as a plain string.
+
+    Behaves like a dict so existing verifiers keep working unchanged.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._generations = array("L")
+        self._digests = bytearray()
+        self._uncompacted = {}
+        self._free_rows = []
+        self.update(*args, **kwargs)
+
+    def _new_row(self):
+        if self._free_rows:
+            return self._free_rows.pop()
+        self._generations.append(0)
+        self._digests.extend(bytes(DIGEST_SIZE))
+        return len(self._generations) - 1
+
+    def __setitem__(self, doc_id, rev):
+        match = COMPACT_REV_PATTERN.match(rev) if isinstance(rev, str) else None
+        with self._lock:
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = self._new_row()
+                self._rows[sys.intern(doc_id)] = row
+
+            if match is not None and int(match.group(1)) <= 0xFFFFFFFF:
+                self._uncompacted.pop(row, None)
+                self._generations[row] = int(match.group(1))
+                offset = row * DIGEST_SIZE
+                self._digests[offset:offset + DIGEST_SIZE] = bytes.fromhex(match.group(2))
+            else:
+                self._uncompacted[row] = rev
+
+    def __getitem__(self, doc_id):
+        row = self._rows[doc_id]
+        if row in self._uncompacted:
+            return self._uncompacted[row]
+        offset = row * DIGEST_SIZE
+        return "{}-{}".format(self._generations[row], self._digests[offset:offset + DIGEST_SIZE].hex())
+
+    def __delitem__(self, doc_id):
+        with self._lock:
+            row = self._rows.pop(doc_id)
+            self._uncompacted.pop(row, None)
+            self._free_rows.append(row)
+
+    def __iter__(self):
+        return iter(list(self._rows))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    def __repr__(self):
+        return "RevCache({})".format(dict(self.items()))
+
+    def generation(self, doc_id):
+        """ Returns the generation of the rev stored for 'doc_id' without building the rev string """
+        row = self._rows[doc_id]
+        if row in self._uncompacted:
+            return int(self._uncompacted[row].split("-")[0])
+        return self._generations[row]
+
+    @classmethod
+    def merge(cls, caches):
+        """ Combine a list of caches into a single RevCache.
+        Later caches win on duplicate doc ids, the same as a dict comprehension over the caches.
+        """
+        merged = cls()
+        for cache in caches:
+            merged.update(cache)
+        return merged
@@ -7,6 +7,14 @@ HTTP_REQ_TIMEOUT = 120
 # Number of thread workers for requests
 MAX_REQUEST_WORKERS = 50
 
+# Shared HTTP transport (keywords/transport.py)
+# Number of hosts to keep connection pools for
+HTTP_POOL_CONNECTIONS = 100
+# Keep-alive connections per host, matched to the number of request workers
+HTTP_POOL_MAXSIZE = MAX_REQUEST_WORKERS
+# Keep-alive connections per host for changes feeds, one per waiting longpoll / continuous feed
+HTTP_FEED_POOL_MAXSIZE = 1000
+
 # Backoff factor, double for each retry. in seconds
 BACKOFF_FACTOR = 0.2
 
@@ -1,4 +1,4 @@
-import requests
+import contextlib
 import concurrent.futures
 import json
 import base64
@@ -8,9 +8,12 @@ import time
 
 from requests.exceptions import HTTPError
 
+from keywords import transport
+from keywords.exceptions import ChangesError
 from libraries.testkit.debug import log_request
 from libraries.testkit.debug import log_response
 from libraries.testkit import settings
+from libraries.testkit.rev_cache import RevCache
 import logging
 log = logging.getLogger(settings.LOGGER)
 
@@ -21,20 +24,20 @@ class User:
         self.name = name
         self.password = password
         self.db = db
-        self.cache = {}
+        self.cache = RevCache()
         self.changes_data = None
         self.channels = list(channels)
         self.target = target
 
-        self._session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100)
-        self._session.mount('http://', adapter)
-        self._session.headers["Content-Type"] = "application/json"
+        self._session = transport.new_session(headers={"Content-Type": "application/json"})
+        # Longpoll and continuous feeds wait on their connection, so they get the feed pools
+        self._feed_session = transport.new_session(headers={"Content-Type": "application/json"}, feed=True)
 
         if self.name is not None:
             auth = base64.b64encode("{0}:{1}".format(self.name, self.password).encode())
             self._auth = auth.decode("UTF-8")
             self._session.headers["Authorization"] = "Basic {}".format(self._auth)
+            self._feed_session.headers["Authorization"] = "Basic {}".format(self._auth)
 
     def __str__(self):
         return "USER: name={0} password={1} db={2} channels={3} cache={4}".format(self.name, self.password, self.db, self.channels, len(self.cache))
@@ -417,102 +420,158 @@ class User:
         log.debug("{0}:{1}".format(self.name, len(obj["results"])))
         return obj
 
+    # POST /{db}/_changes, yielding one result at a time
+    def iter_changes(self, include_docs=True):
+        """ Stream a normal _changes feed one result at a time instead of loading it with r.json().
+
+        Sync Gateway writes each changes entry on its own line, so entries are parsed as they arrive.
+        If the body is not laid out that way the whole response is parsed at the end instead.
+        """
+
+        data = json.dumps({"include_docs": include_docs})
+        r = self._session.post("{}/{}/_changes".format(self.target.url, self.db), data=data, stream=True, timeout=settings.HTTP_REQ_TIMEOUT)
+        log.debug("%s POST %s", self.name, r.url)
+        r.raise_for_status()
+
+        num_results = 0
+        unparsed_lines = []
+        # Entry lines that did not parse on their own
+        bad_entries = []
+        with contextlib.closing(r):
+            for line in r.iter_lines():
+                entry = line.strip().strip(b",")
+                if entry.startswith(b'{"seq"'):
+                    try:
+                        result = json.loads(entry)
+                    except ValueError:
+                        bad_entries.append(line)
+                        unparsed_lines.append(line)
+                        continue
+                    num_results += 1
+                    yield result
+                else:
+                    unparsed_lines.append(line)
+
+        if num_results > 0 and bad_entries:
+            # The body is laid out one entry per line, so these entries would otherwise be lost
+            raise ChangesError("{} unparsable _changes entries for {}, ex. {}".format(len(bad_entries), self.name, bad_entries[0]))
+
+        if num_results == 0 and unparsed_lines:
+            for result in json.loads(b"\n".join(unparsed_lines))["results"]:
+                yield result
+
     # POST /{db}/_changes?feed=longpoll
-    def start_longpoll_changes_tracking(self, termination_doc_id=None, timeout=10000, loop=True, loop_timeout=600):
+    def start_longpoll_changes_tracking(self, termination_doc_id=None, timeout=10000, loop=True, loop_timeout=600,
+                                        style="all_docs", check_rev_history=False):
+        """ Track the _changes feed with back to back longpoll requests.
+
+        Sync Gateway holds each request open for up to 'timeout' ms, so requests are reissued
+        as soon as the previous one returns. Returns a dictionary of doc id -> rev of all
+        docs seen and the last sequence number.
+
+        If 'check_rev_history' is True (requires style=all_docs), each change is checked for
+        its doc rev being one of the leaf revs listed in 'changes' and for its generation never
+        going backwards for a doc already seen. Violations raise a ChangesError once polling stops.
+        """
+
+        if check_rev_history and style != "all_docs":
+            raise ValueError("'check_rev_history' requires style='all_docs'")
 
-        previous_seq_num = "-1"
         current_seq_num = "0"
         start = time.time()
-        request_timed_out = True
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
 
         docs = dict()
-        continue_polling = True
-
-        while continue_polling:
-            if time.time() - start < loop_timeout:
-                # if the longpoll request times out or there have been changes, issue a new long poll request
-                if request_timed_out or current_seq_num != previous_seq_num:
-
-                    previous_seq_num = current_seq_num
-
-                    # Android client POST data
-                    # {"limit":50,"feed":"longpoll","since":15,"style":"all_docs","heartbeat":300000}
-                    # Make sure to use similar parameters in POST
-                    params = {
-                        "feed": "longpoll",
-                        "include_docs": True,
-                        "style": "all_docs",
-                        "heartbeat": 300000,
-                        "timeout": timeout,
-                        "since": current_seq_num
-                    }
-
-                    data = json.dumps(params)
-
-                    r = self._session.post("{}/{}/_changes".format(self.target.url, self.db), data=data)
-                    log.debug("{0} {1} {2}\n{3}\n{4}".format(
-                        self.name,
-                        r.request.method,
-                        r.request.url,
-                        r.request.headers,
-                        r.request.body))
-
-                    # If call is unsuccessful (ex. db goes offline), return docs
-                    if r.status_code != 200:
-                        # HACK: return last sequence number and docs to allow closed connections
-                        raise HTTPError({"docs": docs, "last_seq_num": current_seq_num})
-
-                    obj = r.json()
-
-                    new_docs = obj["results"]
-                    log.debug("CHANGES RESULT: {}".format(obj))
-
-                    # Check for duplicates in response doc_ids
-                    doc_ids = [doc["doc"]["_id"] for doc in new_docs if not doc["id"].startswith("_user/")]
-                    if len(doc_ids) != len(set(doc_ids)):
-                        for item in set(doc_ids):
-                            if doc_ids.count(item) > 1:
-                                log.error("DUPLICATE!!!: {}".format(item))
-
-                    # HACK - need to figure out a better way to check this
-                    if len(new_docs) == 0:
-                        request_timed_out = True
-                    else:
-                        for doc in new_docs:
-
-                            # We are not interested in _user/ docs
-                            if doc["id"].startswith("_user/"):
-                                continue
-
-                            log.debug("{} DOC FROM LONGPOLL _changes: {}: {}".format(self.name, doc["doc"]["_id"], doc["doc"]["_rev"]))
-
-                            # Stop polling if termination doc is recieved in _changes
-                            if termination_doc_id is not None and doc["id"] == termination_doc_id:
-                                log.debug("Termination doc found")
-                                continue_polling = False
-                                break
-
-                            # Store doc
-                            docs[doc["doc"]["_id"]] = doc["doc"]["_rev"]
-
-                    # Get latest sequence from changes request
-                    current_seq_num = obj["last_seq"]
-
-                    log.debug("SEQ_NUM {}".format(current_seq_num))
-
-                    if loop is False:
-                        if len(new_docs) == 1:
-                            # Hack around the fact that the first call to
-                            # _changes may return an _user docs which will not be stored
-                            continue
-
-                        # Exit after one longpoll request that returns docs
-                        break
-
-                time.sleep(0.1)
-            else:
+        generations = dict()
+        rev_history_errors = []
+        changes_url = "{}/{}/_changes".format(self.target.url, self.db)
+
+        while time.time() - start < loop_timeout:
+
+            # Android client POST data
+            # {"limit":50,"feed":"longpoll","since":15,"style":"all_docs","heartbeat":300000}
+            # Make sure to use similar parameters in POST
+            params = {
+                "feed": "longpoll",
+                "include_docs": True,
+                "heartbeat": 300000,
+                "timeout": timeout,
+                "since": current_seq_num
+            }
+            if style is not None:
+                params["style"] = style
+
+            r = self._feed_session.post(changes_url, data=json.dumps(params))
+            if debug_enabled:
+                log.debug("%s %s %s\n%s\n%s", self.name, r.request.method, r.request.url, r.request.headers, r.request.body)
+
+            # If call is unsuccessful (ex. db goes offline), return docs
+            if r.status_code != 200:
+                # HACK: return last sequence number and docs to allow closed connections
+                raise HTTPError({"docs": docs, "last_seq_num": current_seq_num})
+
+            obj = r.json()
+            new_docs = obj["results"]
+            if debug_enabled:
+                log.debug("CHANGES RESULT: %s", obj)
+
+            # Check for duplicate doc ids within this response as the entries are processed
+            seen_doc_ids = set()
+            terminate = False
+            for doc in new_docs:
+
+                # We are not interested in _user/ docs
+                if doc["id"].startswith("_user/"):
+                    continue
+
+                doc_id = doc["doc"]["_id"]
+                rev = doc["doc"]["_rev"]
+
+                if doc_id in seen_doc_ids:
+                    log.error("DUPLICATE!!!: %s", doc_id)
+                seen_doc_ids.add(doc_id)
+
+                log.debug("%s DOC FROM LONGPOLL _changes: %s: %s", self.name, doc_id, rev)
+
+                # Stop polling if termination doc is recieved in _changes
+                if termination_doc_id is not None and doc["id"] == termination_doc_id:
+                    log.debug("Termination doc found")
+                    terminate = True
+                    break
+
+                if check_rev_history:
+                    leaf_revs = [change["rev"] for change in doc["changes"]]
+                    if rev not in leaf_revs:
+                        rev_history_errors.append("{}: rev {} not in changes {}".format(doc_id, rev, leaf_revs))
+                    generation = int(rev.split("-")[0])
+                    if generation < generations.get(doc_id, 0):
+                        rev_history_errors.append("{}: generation went from {} to {}".format(doc_id, generations[doc_id], generation))
+                    generations[doc_id] = generation
+
+                # Store doc
+                docs[doc_id] = rev
+
+            # Get latest sequence from changes request
+            current_seq_num = obj["last_seq"]
+            log.debug("SEQ_NUM %s", current_seq_num)
+
+            if terminate:
                 break
 
+            if loop is False:
+                if len(new_docs) == 1:
+                    # Hack around the fact that the first call to
+                    # _changes may return an _user docs which will not be stored
+                    continue
+
+                # Exit after one longpoll request that returns docs
+                break
+
+        if rev_history_errors:
+            for error in rev_history_errors[:10]:
+                log.error("REV HISTORY ERROR: %s", error)
+            raise ChangesError("{} rev history errors in longpoll _changes for {}".format(len(rev_history_errors), self.name))
+
         return docs, current_seq_num
 
     # POST /{db}/_changes?feed=continuous
@@ -527,7 +586,7 @@ class User:
 
         data = json.dumps(params)
 
-        r = self._session.post(url="{0}/{1}/_changes".format(self.target.url, self.db), data=data, stream=True)
+        r = self._feed_session.post(url="{0}/{1}/_changes".format(self.target.url, self.db), data=data, stream=True)
         log.debug("{0} POST {1}".format(self.name, r.url))
 
         # Wait for continuous changes
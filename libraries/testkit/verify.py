@@ -1,6 +1,13 @@
+import concurrent.futures
+from collections.abc import Mapping
+
 from keywords.utils import log_info
 from keywords.utils import log_error
 from keywords.utils import log_warn
+from libraries.testkit import settings
+
+# Number of offending doc ids to keep per error type
+NUM_ERROR_SAMPLES = 10
 
 
 def verify_same_docs(expected_num_docs, doc_dict_one, doc_dict_two):
@@ -23,103 +30,163 @@ def verify_same_docs(expected_num_docs, doc_dict_one, doc_dict_two):
     log_info(" -> doc_dict_one == doc_dict_two expected (num_docs: {})".format(expected_num_docs))
 
 
-def verify_docs_removed(users, expected_num_docs, expected_docs):
+def _as_user_list(users):
+    if type(users) is list:
+        return users
+    # Allow a single user to be passed
+    return [users]
 
-    # Verifies that the expected_docs have all been flagged with _removed = true
-    # Also verifies no duplication of changes results and set equality of the expected doc_ids
-    # and the ids returned from the _changes feed
 
-    errors = {
-        "unexpected_changes_length": 0,
-        "invalid_expected_docs_length": 0,
-        "duplicate_expected_ids": 0,
-        "duplicate_changes_doc_ids": 0,
-        "expected_doc_ids_differ_from_changes_doc_ids": 0,
-        "doc_not_removed": 0,
-        "invalid_rev_id": 0
-    }
+def _record_error(errors, key, doc_id=None):
+    errors[key] += 1
+    if doc_id is not None and len(errors["samples"][key]) < NUM_ERROR_SAMPLES:
+        errors["samples"][key].append(doc_id)
 
-    if type(users) is list:
-        user_list = users
-    else:
-        # Allow a single user to be passed
-        user_list = list()
-        user_list.append(users)
-
-    if type(expected_docs) is not dict:
-        raise Exception("Make sure 'expected_docs' is a dictionary")
-
-    for user in user_list:
-
-        # get changes feed
-        changes = user.get_changes(include_docs=True)
-        results = changes["results"]
-
-        changes_results = list()
-        for result in results:
-            changes_result = dict()
-            if not result["id"].startswith("_user"):
-                changes_result["id"] = result["doc"]["_id"]
-                changes_result["rev"] = result["doc"]["_rev"]
-                changes_result["removed"] = result["doc"]["_removed"]
-                changes_results.append(changes_result)
 
-        # Check expected_num_docs matches number of changes results
-        if expected_num_docs != len(changes_results):
-            errors["unexpected_changes_length"] += 1
+def _new_errors(error_keys):
+    errors = {key: 0 for key in error_keys}
+    errors["samples"] = {key: [] for key in error_keys}
+    return errors
+
+
+def _merge_errors(errors, user_errors):
+    for key, val in list(user_errors.items()):
+        if key == "samples":
+            continue
+        errors[key] += val
+        samples = errors["samples"][key]
+        samples.extend(user_errors["samples"][key][:NUM_ERROR_SAMPLES - len(samples)])
+
+
+def _scan_changes(user, expected_docs, errors, check_result):
+    """ Single pass over a user's _changes feed.
+
+    Tracks duplicates and doc ids missing from / unexpected in the feed while calling
+    'check_result(doc, expected_rev)' once per changes result for the per doc checks.
+    Returns the number of (non _user) results seen.
+    """
+
+    seen_doc_ids = set()
+    num_results = 0
+    num_expected_found = 0
+
+    for result in user.iter_changes(include_docs=True):
+        if result["id"].startswith("_user"):
+            continue
+
+        doc = result["doc"]
+        doc_id = doc["_id"]
+        num_results += 1
+
+        if doc_id in seen_doc_ids:
+            _record_error(errors, "duplicate_changes_doc_ids", doc_id)
+            continue
+        seen_doc_ids.add(doc_id)
+
+        expected_rev = expected_docs.get(doc_id)
+        if expected_rev is None:
+            _record_error(errors, "expected_doc_ids_differ_from_changes_doc_ids", doc_id)
+        else:
+            num_expected_found += 1
+
+        check_result(doc, expected_rev)
+
+    # Only walk the expected docs again if something is missing to collect samples
+    if num_expected_found != len(expected_docs):
+        missing = [doc_id for doc_id in expected_docs if doc_id not in seen_doc_ids]
+        for doc_id in missing:
+            _record_error(errors, "expected_doc_ids_differ_from_changes_doc_ids", doc_id)
+
+    return num_results
+
 
-        # Check number of expected num docs matched number of expected doc ids
-        if expected_num_docs != len(expected_docs):
-            errors["invalid_expected_docs_length"] += 1
+def _verify_in_parallel(user_list, verify_user, error_keys):
+    errors = _new_errors(error_keys)
+    num_workers = max(1, min(len(user_list), settings.MAX_REQUEST_WORKERS))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(verify_user, user) for user in user_list]
+        for future in concurrent.futures.as_completed(futures):
+            _merge_errors(errors, future.result())
 
-        # Get ids from expected docs
-        expected_doc_ids = list(expected_docs.keys())
+    # Print any error that may have occured
+    error_count = 0
+    for key, val in list(errors.items()):
+        if key != "samples" and val != 0:
+            log_error("<!> VERIFY ERROR - name: {}: occurences: {} sample doc ids: {}".format(key, val, errors["samples"][key]))
+            error_count += 1
 
-        # Assert there are no duplicates in expected doc ids
-        if len(expected_doc_ids) != len(set(expected_doc_ids)):
-            errors["duplicate_expected_ids"] += 1
+    assert error_count == 0, "Verification failed: {}".format(errors)
+    return errors
 
-        # Get ids from all changes results
-        changes_doc_ids = [result["id"] for result in changes_results]
 
-        # Assert there are no duplicates in changes doc ids
-        if len(changes_doc_ids) != len(set(changes_doc_ids)):
-            errors["duplicate_changes_doc_ids"] += 1
+def _check_expected_docs(user_name, expected_num_docs, expected_docs, errors):
+    # Check number of expected num docs matched number of expected doc ids
+    if expected_num_docs != len(expected_docs):
+        log_error("{0} -> {1} expected_num_docs != {2} len(expected_docs)".format(user_name, expected_num_docs, len(expected_docs)))
+        _record_error(errors, "invalid_expected_docs_length")
 
-        # Assert the expected doc ids and changes doc ids are the same
-        if set(expected_doc_ids) != set(changes_doc_ids):
-            errors["expected_doc_ids_differ_from_changes_doc_ids"] += 1
+    # Keys of a mapping are unique so 'duplicate_expected_ids' can never be hit. It is kept so the
+    # errors structure stays the same for callers
 
-        num_doc_removed = 0
-        for result in changes_results:
 
+def verify_docs_removed(users, expected_num_docs, expected_docs):
+
+    # Verifies that the expected_docs have all been flagged with _removed = true
+    # Also verifies no duplication of changes results and set equality of the expected doc_ids
+    # and the ids returned from the _changes feed
+    # Each user's _changes feed is streamed once and all checks are done in that single pass.
+    # Users are verified concurrently. Returns the errors dictionary, including up to
+    # NUM_ERROR_SAMPLES offending doc ids per error type under 'samples'
+
+    error_keys = [
+        "unexpected_changes_length",
+        "invalid_expected_docs_length",
+        "duplicate_expected_ids",
+        "duplicate_changes_doc_ids",
+        "expected_doc_ids_differ_from_changes_doc_ids",
+        "doc_not_removed",
+        "invalid_rev_id"
+    ]
+
+    user_list = _as_user_list(users)
+
+    if not isinstance(expected_docs, Mapping):
+        raise Exception("Make sure 'expected_docs' is a dictionary or RevCache")
+
+    def verify_user(user):
+        errors = _new_errors(error_keys)
+        num_doc_removed = [0]
+
+        def check_result(doc, expected_rev):
             # Check removed is set to true
-            if result["removed"] is not True:
-                errors["doc_not_removed"] += 1
-            elif result["removed"] is True:
-                num_doc_removed += 1
+            if doc.get("_removed") is not True:
+                _record_error(errors, "doc_not_removed", doc["_id"])
+            else:
+                num_doc_removed[0] += 1
 
             # Compare revision number for id
-            if expected_docs[result["id"]] != result["rev"]:
-                errors["invalid_rev_id"] += 1
+            if expected_rev is not None and expected_rev != doc["_rev"]:
+                _record_error(errors, "invalid_rev_id", doc["_id"])
 
             # TODO - maybe try to ping doc endpoint and asser 4XX response?
 
+        num_results = _scan_changes(user, expected_docs, errors, check_result)
+
+        # Check expected_num_docs matches number of changes results
+        if expected_num_docs != num_results:
+            _record_error(errors, "unexpected_changes_length")
+
+        _check_expected_docs(user.name, expected_num_docs, expected_docs, errors)
+
         log_info(" -> REMOVED |{0}| expected (num_docs: {1}) _changes (num_docs: {2}, num_removed: {3})".format(
             user.name,
             expected_num_docs,
-            len(changes_doc_ids),
-            num_doc_removed
+            num_results,
+            num_doc_removed[0]
         ))
+        return errors
 
-        # Print any error that may have occured
-        error_count = 0
-        for key, val in list(errors.items()):
-            if val != 0:
-                log_error("<!> VERIFY ERROR - name: {}: occurences: {}".format(key, val))
-                error_count += 1
-
-        assert error_count == 0
+    return _verify_in_parallel(user_list, verify_user, error_keys)
 
 
 def verify_changes(users, expected_num_docs, expected_num_revisions, expected_docs, ignore_rev_ids=False):
@@ -128,140 +195,87 @@ def verify_changes(users, expected_num_docs, expected_num_revisions, expected_do
     # is stored in the users cache. 'expected_docs' is a scenario level dictionary created
     # from the combination of these user caches. This is used to create expected results
     # when comparing against the changes feed for each user.
+    # Each user's _changes feed is streamed once and all checks are done in that single pass.
+    # Users are verified concurrently. Returns the errors dictionary, including up to
+    # NUM_ERROR_SAMPLES offending doc ids per error type under 'samples'
+
+    error_keys = [
+        "unexpected_changes_length",
+        "invalid_expected_docs_length",
+        "duplicate_expected_ids",
+        "duplicate_changes_doc_ids",
+        "expected_doc_ids_differ_from_changes_doc_ids",
+        "invalid_rev_id",
+        "unexpected_rev_id_prefix",
+        "unexpected_num_updates"
+    ]
+
+    user_list = _as_user_list(users)
+
+    if not isinstance(expected_docs, Mapping):
+        log_error("expected_docs is not a dictionary")
+        raise Exception("Make sure 'expected_docs' is a dictionary or RevCache")
 
-    errors = {
-        "unexpected_changes_length": 0,
-        "invalid_expected_docs_length": 0,
-        "duplicate_expected_ids": 0,
-        "duplicate_changes_doc_ids": 0,
-        "expected_doc_ids_differ_from_changes_doc_ids": 0,
-        "invalid_rev_id": 0,
-        "unexpected_rev_id_prefix": 0,
-        "unexpected_num_updates": 0
-    }
+    if ignore_rev_ids:
+        log_warn("WARNING: Ignoring rev id verification!!")
 
-    if type(users) is list:
-        user_list = users
-    else:
-        # Allow a single user to be passed
-        user_list = list()
-        user_list.append(users)
+    def verify_user(user):
+        errors = _new_errors(error_keys)
+        # Allow printing updates even if changes feed length is 0
+        updates = [None]
 
-    if type(expected_docs) is not dict:
-        log_error("expected_docs is not a dictionary")
-        raise Exception("Make sure 'expected_docs' is a dictionary")
-
-    for user in user_list:
-        changes = user.get_changes(include_docs=True)
-        results = changes["results"]
-        changes_results = list()
-        for result in results:
-            changes_result = dict()
-            if not result["id"].startswith("_user"):
-                changes_result["id"] = result["doc"]["_id"]
-                changes_result["rev"] = result["doc"]["_rev"]
-                changes_result["updates"] = result["doc"]["updates"]
-                changes_results.append(changes_result)
-        # Check expected_num_docs matches number of changes results
-        if expected_num_docs != len(changes_results):
-            log_error("{0} -> {1} expected_num_docs != {2} len(changes_results)".format(user.name, expected_num_docs, len(changes_results)))
-            changes_results_ids = []
-            for i in changes_results:
-                changes_results_ids.append(i["id"])
-
-            changes_results_ids_tracker = {}
-            for i in changes_results_ids:
-                if i in changes_results_ids_tracker:
-                    changes_results_ids_tracker[i] += 1
-                else:
-                    changes_results_ids_tracker[i] = 1
-
-            for i in changes_results_ids_tracker:
-                if changes_results_ids_tracker[i] > 1:
-                    log_info("Duplicate id {}".format(i))
-
-            errors["unexpected_changes_length"] += 1
-        # Check number of expected num docs matched number of expected doc ids
-        if expected_num_docs != len(expected_docs):
-            log_error("{0} -> {1} expected_num_docs != {2} len(expected_docs)".format(user.name, expected_num_docs, len(expected_docs)))
-            errors["invalid_expected_docs_length"] += 1
-
-        # Get ids from expected docs
-        expected_doc_ids = list(expected_docs.keys())
-
-        # Assert there are no duplicates in expected doc ids
-        if len(expected_doc_ids) != len(set(expected_doc_ids)):
-            log_error("{0} -> Duplicates found in expected_doc_ids".format(user.name))
-            errors["duplicate_expected_ids"] += 1
-
-        # Get ids from all changes results
-        changes_doc_ids = [result["id"] for result in changes_results]
-
-        # Assert there are no duplicates in changes doc ids
-        if len(changes_doc_ids) != len(set(changes_doc_ids)):
-            log_error("{0} -> Duplicates found in changes doc ids".format(user.name))
-            changes_doc_ids_tracker = {}
-            for i in set(changes_doc_ids):
-                if i in changes_doc_ids_tracker:
-                    changes_doc_ids_tracker[i] += 1
-                else:
-                    changes_doc_ids_tracker[i] = 1
-
-            for i in changes_doc_ids_tracker:
-                if changes_doc_ids_tracker[i] > 1:
-                    log_info("Duplicate id {}".format(i))
-
-            errors["duplicate_changes_doc_ids"] += 1
-
-        # Assert the expected doc ids and changes doc ids are the same
-        if set(expected_doc_ids) != set(changes_doc_ids):
-            log_error("{0} -> changes feed doc ids differ from expected doc ids".format(user.name))
-            different_docs = set(expected_doc_ids) - set(changes_doc_ids)
-            log_error("{0} -> Set difference {1}".format(user.name, different_docs))
-            errors["expected_doc_ids_differ_from_changes_doc_ids"] += 1
-
-        if ignore_rev_ids:
-            log_warn("WARNING: Ignoring rev id verification!!")
-
-        for result in changes_results:
-            if not ignore_rev_ids:
-                # Compare revision number for id
-                if expected_docs[result["id"]] != result["rev"]:
-                    errors["invalid_rev_id"] += 1
+        def check_result(doc, expected_rev):
+            doc_id = doc["_id"]
+            rev = doc["_rev"]
+            if updates[0] is None:
+                updates[0] = doc["updates"]
+
+            # Compare revision number for id
+            if not ignore_rev_ids and expected_rev is not None and expected_rev != rev:
+                _record_error(errors, "invalid_rev_id", doc_id)
 
             # IMPORTANT - This assumes that no conflicts are created via new_edits in the doc PUT
             # Assert that the revision id prefix matches the number of expected revisions
-            rev_id_prefix = result["rev"].split("-")[0]
-
             # rev-id prefix will be 1 when document is created
             # For any non-conflicting update, it will be incremented by one
+            rev_id_prefix = rev.split("-")[0]
             if expected_num_revisions != int(rev_id_prefix) - 1:
-                log_error("{0} -> expected_num_revisions {1} does not match stored rev_id_prefix: {2}".format(user.name, expected_num_revisions, rev_id_prefix))
-                errors["unexpected_rev_id_prefix"] += 1
+                _record_error(errors, "unexpected_rev_id_prefix", doc_id)
 
             # Check number of expected updates matched the updates on the _changes doc
-            if expected_num_revisions != result["updates"]:
-                log_error("{0} -> expected_num_revisions {1} does not match number of updates {2}".format(user.name, expected_num_revisions, result["updates"]))
-                errors["unexpected_num_updates"] += 1
-        # Allow printing updates even if changes feed length is 0
-        if len(changes_results) == 0:
-            updates = 0
-        else:
-            updates = changes_results[0]["updates"]
+            if expected_num_revisions != doc["updates"]:
+                _record_error(errors, "unexpected_num_updates", doc_id)
+
+        num_results = _scan_changes(user, expected_docs, errors, check_result)
+
+        # Check expected_num_docs matches number of changes results
+        if expected_num_docs != num_results:
+            log_error("{0} -> {1} expected_num_docs != {2} len(changes_results)".format(user.name, expected_num_docs, num_results))
+            _record_error(errors, "unexpected_changes_length")
+
+        _check_expected_docs(user.name, expected_num_docs, expected_docs, errors)
+
+        if errors["duplicate_changes_doc_ids"]:
+            log_error("{0} -> Duplicates found in changes doc ids: {1}".format(user.name, errors["samples"]["duplicate_changes_doc_ids"]))
+        if errors["expected_doc_ids_differ_from_changes_doc_ids"]:
+            log_error("{0} -> changes feed doc ids differ from expected doc ids: {1}".format(
+                user.name,
+                errors["samples"]["expected_doc_ids_differ_from_changes_doc_ids"]
+            ))
+        if errors["unexpected_rev_id_prefix"] or errors["unexpected_num_updates"]:
+            log_error("{0} -> expected_num_revisions {1} does not match rev_id_prefix / updates for {2}".format(
+                user.name,
+                expected_num_revisions,
+                errors["samples"]["unexpected_rev_id_prefix"] + errors["samples"]["unexpected_num_updates"]
+            ))
 
         log_info(" -> |{0}| expected (num_docs: {1} num_revisions: {2}) _changes (num_docs: {3} updates: {4})".format(
             user.name,
             expected_num_docs,
             expected_num_revisions,
-            len(changes_doc_ids),
-            updates
+            num_results,
+            updates[0] or 0
         ))
+        return errors
 
-        # Print any error that may have occured
-        error_count = 0
-        for key, val in list(errors.items()):
-            if val != 0:
-                log_error("<!> VERIFY ERROR - name: {}: occurences: {}".format(key, val))
-                error_count += 1
-
-        assert error_count == 0
+    return _verify_in_parallel(user_list, verify_user, error_keys)
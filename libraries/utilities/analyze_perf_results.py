@@ -1,12 +1,13 @@
 import json
-import datetime
 import os
 import sys
 import matplotlib
 import matplotlib.pyplot as plt
+import numpy
 
 from optparse import OptionParser
-from collections import OrderedDict
+from libraries.utilities.log_expvars import expvars_path
+from libraries.utilities.metric_store import load_metrics
 from libraries.utilities.provisioning_config_parser import hosts_for_tag
 
 matplotlib.rcParams.update({'font.size': 6})
@@ -20,54 +21,36 @@ def keys_present(keys, dictionary):
     return True
 
 
-def plot_gateload_expvars(figure, json_file_name):
+def plot_gateload_expvars(figure, metrics_file_name):
 
     print("Plotting gateload expvars ...")
 
-    with open(json_file_name, "r") as f:
-        obj = json.loads(f.read(), object_pairs_hook=OrderedDict)
+    series = load_metrics(metrics_file_name)
 
-    datetimes = []
-    p95s = []
-    p99s = []
-    docs_pushed = []
-    docs_pulled = []
-    docs_failed_to_push = []
-    docs_failed_to_pull = []
+    # only plot if p95 and p99 exist in expvars
+    series = series.select(~numpy.isnan(series["gateload/ops/PushToSubscriberInteractive/p95"]))
+    datetimes = series.datetimes()
 
     number_ns_per_sec = 1000000000.0
+    p95s = series["gateload/ops/PushToSubscriberInteractive/p95"] / number_ns_per_sec
+    p99s = series["gateload/ops/PushToSubscriberInteractive/p99"] / number_ns_per_sec
+    docs_pushed = series["gateload/total_doc_pushed"]
+    docs_pulled = series["gateload/total_doc_pulled"]
 
-    for timestamp in obj:
-
-        # only plot if p95 and p99 exist in expvars
-        if "PushToSubscriberInteractive" in obj[timestamp]["expvars"]["gateload"]["ops"]:
-            datetimes.append(datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f"))
-
-            p95 = obj[timestamp]["expvars"]["gateload"]["ops"]["PushToSubscriberInteractive"]["p95"] / number_ns_per_sec
-            p95s.append(p95)
-
-            p99 = obj[timestamp]["expvars"]["gateload"]["ops"]["PushToSubscriberInteractive"]["p99"] / number_ns_per_sec
-            p99s.append(p99)
-
-            docs_pushed.append(obj[timestamp]["expvars"]["gateload"]["total_doc_pushed"])
-            docs_pulled.append(obj[timestamp]["expvars"]["gateload"]["total_doc_pulled"])
-
-            if "total_doc_failed_to_push" in obj[timestamp]["expvars"]["gateload"]:
-                docs_failed = obj[timestamp]["expvars"]["gateload"]["total_doc_failed_to_push"]
-                docs_failed_to_push.append(docs_failed)
-                print(("!!! ERROR: docs failed to push: {} !!!".format(docs_failed_to_push)))
+    docs_failed_to_push = series["gateload/total_doc_failed_to_push"]
+    docs_failed_to_push = docs_failed_to_push[~numpy.isnan(docs_failed_to_push)]
+    if len(docs_failed_to_push) > 0:
+        print(("!!! ERROR: docs failed to push: {} !!!".format(docs_failed_to_push)))
 
-            if "total_doc_failed_to_pull" in obj[timestamp]["expvars"]["gateload"]:
-                docs_failed = obj[timestamp]["expvars"]["gateload"]["total_doc_failed_to_pull"]
-                docs_failed_to_pull.append(docs_failed)
-                print(("!!! ERROR: docs failed to pull: {} !!!".format(docs_failed_to_pull)))
+    docs_failed_to_pull = series["gateload/total_doc_failed_to_pull"]
+    docs_failed_to_pull = docs_failed_to_pull[~numpy.isnan(docs_failed_to_pull)]
+    if len(docs_failed_to_pull) > 0:
+        print(("!!! ERROR: docs failed to pull: {} !!!".format(docs_failed_to_pull)))
 
     # Plot p95 / p99
     ax1 = figure.add_subplot(211)
     ax1.set_title("PushToSubscriberInteractive (seconds): p95 (cyan) / p99 (magenta)")
     ax1.plot(datetimes, p95s, "cs", datetimes, p99s, "m^")
-    # for i, j in zip(datetimes, p95):
-    #     ax1.annotate(str(j), xy=(i, j))
 
     # Plot docs pushed / docs pulled
     ax2 = figure.add_subplot(212)
@@ -104,7 +87,7 @@ def plot_gateload_expvars(figure, json_file_name):
     return True
 
 
-def plot_sync_gateway_expvars(cluster_config, figure, json_file_name):
+def plot_sync_gateway_expvars(cluster_config, figure, metrics_file_name):
 
     print("Plotting sync_gateway expvars ...")
 
@@ -112,36 +95,18 @@ def plot_sync_gateway_expvars(cluster_config, figure, json_file_name):
     sg_writers = hosts_for_tag(cluster_config, "sg_accels")
     sg_writer_hostnames = [sg_writer["ansible_host"] for sg_writer in sg_writers]
 
-    with open(json_file_name, "r") as f:
-        obj = json.loads(f.read(), object_pairs_hook=OrderedDict)
+    series = load_metrics(metrics_file_name)
+    writer_endpoints = [endpoint for endpoint in series.sources if endpoint.split(":")[0] in sg_writer_hostnames]
+    reader_endpoints = [endpoint for endpoint in series.sources if endpoint not in writer_endpoints]
 
-    datetimes = []
-    memstats_alloc = []
-    memstats_sys = []
-
-    writer_datetimes = []
-    writer_memstats_alloc = []
-    writer_memstats_sys = []
-
-    for timestamp in obj:
-
-        endpoint = obj[timestamp]["endpoint"]
-        hostname = endpoint.split(":")[0]
-
-        if hostname in sg_writer_hostnames:
-            writer_datetimes.append(datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f"))
-            writer_memstats_alloc.append(obj[timestamp]["expvars"]["memstats"]["Alloc"])
-            writer_memstats_sys.append(obj[timestamp]["expvars"]["memstats"]["Sys"])
-        else:
-            datetimes.append(datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f"))
-            memstats_alloc.append(obj[timestamp]["expvars"]["memstats"]["Alloc"])
-            memstats_sys.append(obj[timestamp]["expvars"]["memstats"]["Sys"])
+    readers = series.for_sources(reader_endpoints)
+    writers = series.for_sources(writer_endpoints)
 
     # Plot Alloc / Sys
     ax1 = figure.add_subplot(111)
     ax1.set_title("(writers=blue, readers=green) memstats.Alloc (square) / memstats.Sys (triangle)")
-    ax1.plot(datetimes, memstats_alloc, "gs", datetimes, memstats_sys, "g^")
-    ax1.plot(writer_datetimes, writer_memstats_alloc, "bs", writer_datetimes, writer_memstats_sys, "b^")
+    ax1.plot(readers.datetimes(), readers["memstats/Alloc"], "gs", readers.datetimes(), readers["memstats/Sys"], "g^")
+    ax1.plot(writers.datetimes(), writers["memstats/Alloc"], "bs", writers.datetimes(), writers["memstats/Sys"], "b^")
 
     figure.autofmt_xdate()
 
@@ -175,13 +140,9 @@ def plot_machine_stats(cluster_config, figure, folder_path):
     for machine in machine_stats:
         entity = machine_stats[machine]
 
-        datetimes = []
-        cpu_percents = []
-
-        # create a list of timestamps with the corresponding CPU percent
-        for timestamp in list(entity.keys()):
-            datetimes.append(datetime.datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f"))
-            cpu_percents.append(entity[timestamp]["cpu_percent"])
+        # timestamps with the corresponding CPU percent, parsed in one go
+        datetimes = numpy.array(list(entity.keys()), dtype="datetime64[us]")
+        cpu_percents = numpy.array([sample["cpu_percent"] for sample in entity.values()])
 
         # Plot blue if writer, green if reader
         if machine in sg_writer_hostnames:
@@ -199,7 +160,7 @@ def analze_perf_results(cluster_config, test_id):
     # Generate plot of gateload expvars
     fig1 = plt.figure()
     fig1.text(0.5, 0.04, 'Gateload Expvars', ha='center', va='center')
-    valid_results = plot_gateload_expvars(fig1, "testsuites/syncgateway/performance/results/{}/gateload_expvars.json".format(test_id))
+    valid_results = plot_gateload_expvars(fig1, expvars_path(test_id, "gateload_expvars"))
     plt.savefig("testsuites/syncgateway/performance/results/{}/gateload_expvars.png".format(test_id), dpi=300)
     if not valid_results:
         print("FAILURE STATE. Some docs failed to push and/or pull. Exiting...")
@@ -208,7 +169,7 @@ def analze_perf_results(cluster_config, test_id):
     # Generate plot of sync_gateway expvars
     fig2 = plt.figure()
     fig2.text(0.5, 0.04, 'sync_gateway expvars', ha='center', va='center')
-    plot_sync_gateway_expvars(cluster_config, fig2, "testsuites/syncgateway/performance/results/{}/sync_gateway_expvars.json".format(test_id))
+    plot_sync_gateway_expvars(cluster_config, fig2, expvars_path(test_id, "sync_gateway_expvars"))
     plt.savefig("testsuites/syncgateway/performance/results/{}/sync_gateway_expvars.png".format(test_id), dpi=300)
 
     # Generate plot of machine stats
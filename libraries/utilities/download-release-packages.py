@@ -1,10 +1,11 @@
 import os
-import requests
 import shutil
 import tarfile
 import subprocess
 from zipfile import ZipFile
 
+from keywords import artifact_cache
+
 
 def version_and_build(full_version):
     version_parts = full_version.split("-")
@@ -35,6 +36,8 @@ def pull_package_and_dump_contents(package_defs):
     os.mkdir("deps/packages")
     os.mkdir("deps/packages/package-contents")
 
+    # (platform, url, file_name, extracted_file_name) of each package
+    packages = []
     for platform, full_version in package_defs.items():
 
         print(("Platform: {}, Version: {}".format(platform, full_version)))
@@ -77,15 +80,17 @@ def pull_package_and_dump_contents(package_defs):
         else:
             raise ValueError("Unsupported platform")
 
-        # Change to package dir
-        os.chdir("deps/packages/")
+        packages.append((platform, url, file_name, extracted_file_name))
 
-        # Download the packages
+    # Download the packages concurrently
+    for platform, url, file_name, extracted_file_name in packages:
         print(("Downloading: {}".format(url)))
-        resp = requests.get(url)
-        resp.raise_for_status()
-        with open(file_name, "wb") as f:
-            f.write(resp.content)
+    artifact_cache.fetch_many([(url, os.path.join(package_dir, file_name)) for platform, url, file_name, extracted_file_name in packages])
+
+    for platform, url, file_name, extracted_file_name in packages:
+
+        # Change to package dir
+        os.chdir("deps/packages/")
 
         # Extract the package
         if file_name.endswith(".zip"):
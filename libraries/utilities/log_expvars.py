@@ -1,47 +1,65 @@
 import time
-import datetime
-import requests
-import json
+from keywords import transport
 import os
 import sys
 from keywords.utils import log_info
 from libraries.testkit import settings
 
-from collections import OrderedDict
-
 from requests.exceptions import RequestException
 
+from .metrics_scraper import MetricsScraper, expvar_target, prometheus_target
 from .provisioning_config_parser import hosts_for_tag
 
 
-def dump_results(test_folder, gateload_results, sync_gateway_results):
-    filename = "testsuites/syncgateway/performance/results/{}/gateload_expvars.json".format(test_folder)
-    log_info("Writing gateload_expvars to: {}".format(filename))
-    with open(filename, "w") as f:
-        f.write(json.dumps(gateload_results))
-
-    filename = "testsuites/syncgateway/performance/results/{}/sync_gateway_expvars.json".format(test_folder)
-    log_info("Writing sync_gateway_expvars to: {}".format(filename))
-    with open(filename, "w") as f:
-        f.write(json.dumps(sync_gateway_results))
-
-
-def write_expvars(results_obj, endpoint):
-
-    resp = requests.get("http://{}".format(endpoint), timeout=settings.HTTP_REQ_TIMEOUT)
-    resp.raise_for_status()
-    expvars = resp.json()
-
-    now = "{}".format(datetime.datetime.utcnow())
-    results_obj[now] = {
-        "endpoint": endpoint,
-        "expvars": expvars
-    }
+RESULTS_DIR = "testsuites/syncgateway/performance/results"
+
+# Only these expvars are kept from each snapshot
+GATELOAD_METRICS = [
+    "gateload/ops/PushToSubscriberInteractive/p95",
+    "gateload/ops/PushToSubscriberInteractive/p99",
+    "gateload/total_doc_pushed",
+    "gateload/total_doc_pulled",
+    "gateload/total_doc_failed_to_push",
+    "gateload/total_doc_failed_to_pull"
+]
+SYNC_GATEWAY_METRICS = [
+    "memstats/Alloc",
+    "memstats/Sys"
+]
+# Metrics kept from sync_gateway's Prometheus endpoint, summed over databases
+SYNC_GATEWAY_PROMETHEUS_METRICS = [
+    "sgw_resource_utilization_process_cpu_percent_utilization",
+    "sgw_resource_utilization_process_memory_resident",
+    "sgw_resource_utilization_go_memstats_heapalloc",
+    "sgw_database_num_doc_writes",
+    "sgw_database_num_doc_reads_rest",
+    "sgw_database_doc_writes_bytes"
+]
+
+# An endpoint that refuses or drops this many polls in a row is considered gone. Slow responses do not count
+MAX_CONSECUTIVE_DISCONNECTS = 3
+PROGRESS_INTERVAL_SECS = 60
+
+
+def expvars_path(test_folder, name):
+    """ Path of the metric_store capture 'name' ('gateload_expvars' or 'sync_gateway_expvars') for a test run """
+    return "{}/{}/{}.metrics".format(RESULTS_DIR, test_folder, name)
+
+
+def _is_reachable(url):
+    try:
+        transport.get(url, timeout=settings.HTTP_REQ_TIMEOUT).raise_for_status()
+        return True
+    except RequestException:
+        return False
 
 
 def log_expvars(cluster_config, folder_name, sleep_time=30):
     """
     usage: log_expvars.py"
+
+    Scrapes gateload and sync_gateway expvars (and sync_gateway Prometheus metrics, where the
+    metrics interface is enabled) every 'sleep_time' seconds until gateload finishes.
     """
 
     finished_successfully = True
@@ -66,44 +84,50 @@ def log_expvars(cluster_config, folder_name, sleep_time=30):
         # Wait until the gateload expvar endpoints are up, or raise an exception and abort
         wait_for_endpoints_alive_or_raise(lgs_expvar_endpoints)
 
+        gateload_path = expvars_path(folder_name, "gateload_expvars")
+        sync_gateway_path = expvars_path(folder_name, "sync_gateway_expvars")
+        sync_gateway_metrics_path = expvars_path(folder_name, "sync_gateway_metrics")
+
+        targets = [expvar_target(gateload_path, endpoint, "http://{}".format(endpoint)) for endpoint in lgs_expvar_endpoints]
+        targets += [expvar_target(sync_gateway_path, endpoint, "http://{}".format(endpoint)) for endpoint in sgs_expvar_endpoints]
+
+        # Older sync_gateways do not serve Prometheus metrics
+        sgs_metrics_endpoints = [sg + ":4986/_metrics" for sg in sgs if _is_reachable("http://{}:4986/_metrics".format(sg))]
+        targets += [prometheus_target(sync_gateway_metrics_path, endpoint, "http://{}".format(endpoint)) for endpoint in sgs_metrics_endpoints]
+
+        scraper = MetricsScraper(targets, {
+            gateload_path: GATELOAD_METRICS,
+            sync_gateway_path: SYNC_GATEWAY_METRICS,
+            sync_gateway_metrics_path: SYNC_GATEWAY_PROMETHEUS_METRICS
+        }, interval=sleep_time)
+        log_info("Writing expvars to: {}".format(", ".join([gateload_path, sync_gateway_path, sync_gateway_metrics_path])))
+
         start_time = time.time()
-        gateload_results = OrderedDict()
-        sync_gateway_results = OrderedDict()
-
-        gateload_is_running = True
-        sg_is_running = True
-        while gateload_is_running and sg_is_running:
-
-            # Capture expvars for gateloads
-            for endpoint in lgs_expvar_endpoints:
-                try:
-                    log_info("Collecting gateload expvars {}".format(endpoint))
-                    write_expvars(gateload_results, endpoint)
-                    dump_results(folder_name, gateload_results, sync_gateway_results)
-                except RequestException as re:
-                    # connection to gateload expvars has been closed
-                    log_info(re)
-                    log_info("Error: {}.  Gateload {} no longer reachable. Writing expvars to {}".format(re, endpoint, folder_name))
-                    dump_results(folder_name, gateload_results, sync_gateway_results)
-                    gateload_is_running = False
-
-            # Capture expvars for sync_gateways
-            for endpoint in sgs_expvar_endpoints:
-                try:
-                    log_info("Collecting sg expvars {}".format(endpoint))
-                    write_expvars(sync_gateway_results, endpoint)
-                    dump_results(folder_name, gateload_results, sync_gateway_results)
-                except RequestException as re:
-                    # Should not happen unless sg crashes
+        last_progress_log = start_time
+        scraper.start()
+        try:
+            while True:
+                time.sleep(sleep_time)
+
+                # gateload stops serving expvars when its scenario is done
+                gone = [endpoint for endpoint in lgs_expvar_endpoints if scraper.consecutive_disconnects[endpoint] >= MAX_CONSECUTIVE_DISCONNECTS]
+                if gone:
+                    log_info("Gateload {} no longer reachable ({}). Writing expvars to {}".format(gone, scraper.last_errors[gone[0]], folder_name))
+                    break
+
+                # Should not happen unless sg crashes
+                down = [endpoint for endpoint in sgs_expvar_endpoints if scraper.consecutive_disconnects[endpoint] >= MAX_CONSECUTIVE_DISCONNECTS]
+                if down:
                     finished_successfully = False
-                    log_info(re)
-                    log_info("ERROR {}: sync_gateway not reachable. Dumping results to {}".format(re, folder_name))
-                    dump_results(folder_name, gateload_results, sync_gateway_results)
-                    sg_is_running = False
+                    log_info("ERROR {}: sync_gateway {} not reachable. Dumping results to {}".format(scraper.last_errors[down[0]], down, folder_name))
+                    break
 
-            dump_results(folder_name, gateload_results, sync_gateway_results)
-            log_info("Elapsed: {} minutes".format((time.time() - start_time) / 60.0))
-            time.sleep(sleep_time)
+                if time.time() - last_progress_log >= PROGRESS_INTERVAL_SECS:
+                    scraper.flush()
+                    last_progress_log = time.time()
+                    log_info("Elapsed: {} minutes".format((last_progress_log - start_time) / 60.0))
+        finally:
+            scraper.stop()
 
     except RuntimeError as e:
         log_info("Exception trying to log expvars: {}".format(e))
@@ -125,7 +149,7 @@ def wait_for_endpoints_alive_or_raise(endpoints, num_attempts=5):
 
             try:
                 log_info("Checking if endpoint is up: {}".format(endpoint_url))
-                resp = requests.get(endpoint_url, timeout=settings.HTTP_REQ_TIMEOUT)
+                resp = transport.get(endpoint_url, timeout=settings.HTTP_REQ_TIMEOUT)
                 resp.raise_for_status()
                 log_info("Endpoint is up")
             except Exception as e:
@@ -0,0 +1,164 @@
+""" Compact, appendable time series files for expvar and other metric captures.
+
+Only selected metric paths (ex. 'memstats/Alloc') are kept from each snapshot. A capture is two files:
+  <path>       fixed width rows: int64 timestamp (ns since the epoch), int32 source id, one float64 per metric
+  <path>.json  the metric paths and source names (ex. the endpoints that were polled)
+
+Rows are buffered and appended a chunk at a time, so a long run never holds more than one chunk in memory,
+and a capture interrupted mid write loses at most the partial row. load_metrics() reads a capture back as
+numpy columns for analysis and plotting. Metrics missing from a snapshot are stored as NaN.
+"""
+
+import json
+import math
+import os
+import struct
+import time
+
+import numpy
+
+METRIC_STORE_VERSION = 1
+DEFAULT_CHUNK_ROWS = 100
+
+
+def _header_path(path):
+    return "{}.json".format(path)
+
+
+def _row_format(num_metrics):
+    return "<qi" + "d" * num_metrics
+
+
+def _value_at(snapshot, metric_path):
+    """ Returns the number at 'metric_path' in a snapshot, or NaN if it is missing.
+    'metric_path' is either a key of the snapshot (ex. a Prometheus series) or keys separated by '/' in nested dicts.
+    """
+
+    if metric_path in snapshot:
+        value = snapshot[metric_path]
+    else:
+        value = snapshot
+        for key in metric_path.split("/"):
+            if not isinstance(value, dict) or key not in value:
+                return math.nan
+            value = value[key]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class MetricWriter:
+    """ Appends metric samples to a capture at 'path', creating it if needed. Use as a context manager or call close() """
+
+    def __init__(self, path, metric_paths, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.path = path
+        self.metric_paths = list(metric_paths)
+        self.chunk_rows = chunk_rows
+        self._row = struct.Struct(_row_format(len(self.metric_paths)))
+        self._rows = []
+
+        if os.path.isfile(_header_path(path)):
+            with open(_header_path(path)) as f:
+                header = json.load(f)
+            if header["metrics"] != self.metric_paths:
+                raise ValueError("{} was captured with different metrics: {}".format(path, header["metrics"]))
+            self.sources = header["sources"]
+        else:
+            self.sources = []
+            self._write_header()
+
+        self._file = open(path, "ab")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write_header(self):
+        tmp_path = "{}.tmp".format(_header_path(self.path))
+        with open(tmp_path, "w") as f:
+            json.dump({"version": METRIC_STORE_VERSION, "metrics": self.metric_paths, "sources": self.sources}, f)
+        os.rename(tmp_path, _header_path(self.path))
+
+    def _source_id(self, source):
+        try:
+            return self.sources.index(source)
+        except ValueError:
+            self.sources.append(source)
+            self._write_header()
+            return len(self.sources) - 1
+
+    def append(self, source, snapshot, timestamp=None):
+        """ Records the selected metrics from 'snapshot' (ex. a parsed _expvar response) polled from 'source'.
+        'timestamp' is in seconds since the epoch and defaults to now.
+        """
+
+        if timestamp is None:
+            timestamp = time.time()
+        values = [_value_at(snapshot, metric_path) for metric_path in self.metric_paths]
+        self._rows.append(self._row.pack(int(timestamp * 1e9), self._source_id(source), *values))
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self._file.write(b"".join(self._rows))
+            self._file.flush()
+            self._rows = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+class MetricSeries:
+    """ A capture loaded as numpy columns """
+
+    def __init__(self, timestamps, source_ids, sources, metrics):
+        self.timestamps = timestamps
+        self.source_ids = source_ids
+        self.sources = sources
+        self.metrics = metrics
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, metric_path):
+        return self.metrics[metric_path]
+
+    def datetimes(self):
+        """ Timestamps as numpy datetime64, which matplotlib plots directly """
+        return self.timestamps.astype("datetime64[ns]")
+
+    def select(self, mask):
+        """ Returns the rows where 'mask' (a boolean array) is true """
+        return MetricSeries(self.timestamps[mask], self.source_ids[mask], self.sources,
+                            {metric_path: values[mask] for metric_path, values in self.metrics.items()})
+
+    def for_sources(self, sources):
+        """ Returns the rows polled from any of 'sources' """
+        source_ids = [i for i, source in enumerate(self.sources) if source in sources]
+        return self.select(numpy.isin(self.source_ids, source_ids))
+
+
+def load_metrics(path):
+    """ Loads a capture written by MetricWriter as a MetricSeries """
+
+    with open(_header_path(path)) as f:
+        header = json.load(f)
+
+    metric_paths = header["metrics"]
+    dtype = numpy.dtype([("timestamp", "<i8"), ("source", "<i4")] + [(metric_path, "<f8") for metric_path in metric_paths])
+
+    # Ignore a partially written last row
+    num_rows = os.path.getsize(path) // dtype.itemsize
+    rows = numpy.fromfile(path, dtype=dtype, count=num_rows)
+
+    return MetricSeries(
+        rows["timestamp"].copy(),
+        rows["source"].copy(),
+        header["sources"],
+        {metric_path: rows[metric_path].copy() for metric_path in metric_paths}
+    )
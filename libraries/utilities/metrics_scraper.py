@@ -0,0 +1,145 @@
+""" Concurrent, tick aligned scraping of Sync Gateway and load generator metrics into metric_store captures.
+
+Every 'interval' seconds all targets are polled at once, so one slow or dead node does not delay or skew
+the samples of the others. Each sample is stamped with the time of its tick rather than the time its
+response arrived, so samples from different nodes line up. A target that is still being polled when the
+next tick comes is skipped for that tick instead of queueing up requests.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import concurrent.futures
+from requests.exceptions import ConnectionError, Timeout
+
+from keywords import transport
+from keywords.utils import log_info
+from libraries.testkit import prometheus, settings
+from libraries.utilities.metric_store import MetricWriter
+
+
+def parse_json(resp):
+    return resp.json()
+
+
+def parse_prometheus(resp):
+    return prometheus.metrics_snapshot(prometheus.parse_metrics(resp.text))
+
+
+# 'capture' is the metric_store capture the target's samples go to and 'source' the name they are recorded under.
+# 'parser' turns the response into a snapshot: parse_json for _expvar / gateload, parse_prometheus for _metrics
+ScrapeTarget = namedtuple("ScrapeTarget", ["capture", "source", "url", "parser", "auth", "verify"])
+
+
+def expvar_target(capture, source, url, auth=None, verify=False):
+    return ScrapeTarget(capture, source, url, parse_json, auth, verify)
+
+
+def prometheus_target(capture, source, url, auth=None, verify=False):
+    return ScrapeTarget(capture, source, url, parse_prometheus, auth, verify)
+
+
+class MetricsScraper:
+    """ Polls 'targets' every 'interval' seconds (sub second intervals are fine) and appends the samples to
+    the captures in 'captures', a dict of {capture path: metric paths to keep}.
+    Run it in the background with start() / stop(), or in the foreground with run().
+
+    'consecutive_failures' counts every failed poll in a row, 'consecutive_disconnects' only the refused or
+    closed connections, which is how a node that has gone away (ex. a finished gateload) looks. Slow responses
+    are not disconnects.
+    """
+
+    def __init__(self, targets, captures, interval=1.0, timeout=settings.HTTP_REQ_TIMEOUT):
+        self.targets = list(targets)
+        self.interval = interval
+        # Independent of the interval: ticks that come while a poll is still running skip its target
+        self.timeout = timeout
+
+        self._writers = {path: MetricWriter(path, metric_paths) for path, metric_paths in captures.items()}
+        self._write_lock = threading.Lock()
+        self._in_flight = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(len(self.targets), 1))
+
+        self.ticks = 0
+        self.skipped = {target.source: 0 for target in self.targets}
+        self.consecutive_failures = {target.source: 0 for target in self.targets}
+        self.consecutive_disconnects = {target.source: 0 for target in self.targets}
+        self.last_errors = {}
+
+    def _scrape(self, target, timestamp):
+        try:
+            resp = transport.get(target.url, auth=target.auth, verify=target.verify, timeout=self.timeout)
+            resp.raise_for_status()
+            snapshot = target.parser(resp)
+        except Exception as e:
+            self.consecutive_failures[target.source] += 1
+            if isinstance(e, ConnectionError) and not isinstance(e, Timeout):
+                self.consecutive_disconnects[target.source] += 1
+            self.last_errors[target.source] = e
+            return
+
+        self.consecutive_failures[target.source] = 0
+        self.consecutive_disconnects[target.source] = 0
+        with self._write_lock:
+            self._writers[target.capture].append(target.source, snapshot, timestamp=timestamp)
+
+    def tick(self, timestamp=None):
+        """ Polls every target that is not still busy with the previous tick """
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        for target in self.targets:
+            in_flight = self._in_flight.get(target.source)
+            if in_flight is not None and not in_flight.done():
+                self.skipped[target.source] += 1
+                continue
+            self._in_flight[target.source] = self._executor.submit(self._scrape, target, timestamp)
+        self.ticks += 1
+
+    def flush(self):
+        with self._write_lock:
+            for writer in self._writers.values():
+                writer.flush()
+
+    def run(self, duration=None):
+        """ Ticks until stop() is called or 'duration' seconds have passed. Ticks are scheduled from the start
+        time (not from the end of the previous tick) so they do not drift.
+        """
+
+        start_wall = time.time()
+        start = time.monotonic()
+        tick_number = 0
+        while not self._stop.is_set():
+            self.tick(timestamp=start_wall + tick_number * self.interval)
+            tick_number += 1
+
+            next_tick = start + tick_number * self.interval
+            if duration is not None and tick_number * self.interval >= duration:
+                break
+            self._stop.wait(max(next_tick - time.monotonic(), 0))
+
+        concurrent.futures.wait(list(self._in_flight.values()))
+        self.flush()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="metrics-scraper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stops ticking, waits for the polls in flight and closes the captures """
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        with self._write_lock:
+            for writer in self._writers.values():
+                writer.close()
+
+        log_info("Scraped {} ticks of {} targets. Skipped polls: {}".format(
+            self.ticks, len(self.targets), {source: skipped for source, skipped in self.skipped.items() if skipped}
+        ))
@@ -0,0 +1,60 @@
+import os
+
+from libraries.provision import ansible_runner
+from libraries.provision.ansible_runner import AnsibleRunner, TaskTimer
+
+
+class FakeNamed:
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+
+def fake_run_playbooks(inventory_filename, script_names, extra_vars, subset, cache_dir):
+    status = 1 if "fail.yml" in script_names else 0
+    return status, {"{}: task".format(script_name): 1.0 for script_name in script_names}
+
+
+def test_task_timer():
+    timer = TaskTimer()
+    timer.v2_playbook_on_play_start(FakeNamed("sync_gateways"))
+    timer.v2_playbook_on_task_start(FakeNamed("stop"), False)
+    timer.v2_playbook_on_task_start(FakeNamed("delete"), False)
+    timer.v2_playbook_on_handler_task_start(FakeNamed("restart"))
+    timer.v2_playbook_on_stats(None)
+
+    assert list(timer.timings.keys()) == ["sync_gateways: stop", "sync_gateways: delete", "sync_gateways: restart"]
+    assert all(secs >= 0 for secs in timer.timings.values())
+
+
+def test_run_playbooks_parallel(monkeypatch):
+    monkeypatch.setattr(ansible_runner, "_run_playbooks", fake_run_playbooks)
+    runner = AnsibleRunner("resources/cluster_configs/base_cc")
+
+    statuses = runner.run_ansible_playbooks_parallel([
+        (["stop-sync-gateway.yml", "delete-sync-gateway-artifacts.yml"], {}),
+        (["fail.yml"], {})
+    ])
+    assert statuses == [0, 1]
+
+    assert runner.run_ansible_playbook("stop-sync-gateway.yml") == 0
+    assert runner.task_timings == {
+        "stop-sync-gateway.yml: task": 2.0,
+        "delete-sync-gateway-artifacts.yml: task": 1.0,
+        "fail.yml: task": 1.0
+    }
+
+
+def test_fact_cache_is_per_config_and_run(tmpdir, monkeypatch):
+    monkeypatch.setattr(ansible_runner, "FACT_CACHE_ROOT", str(tmpdir))
+
+    base_cache = ansible_runner.fact_cache_dir("resources/cluster_configs/base_cc")
+    assert base_cache == AnsibleRunner("resources/cluster_configs/base_cc").fact_cache_dir
+    assert base_cache != ansible_runner.fact_cache_dir("resources/cluster_configs/base_di")
+    assert ansible_runner._RUN_ID in base_cache
+
+    os.makedirs(base_cache)
+    ansible_runner.clear_fact_cache("resources/cluster_configs/base_cc")
+    assert not os.path.exists(base_cache)
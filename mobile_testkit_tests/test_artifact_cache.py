@@ -0,0 +1,133 @@
+import hashlib
+import os
+
+import pytest
+
+from keywords import artifact_cache
+from keywords.exceptions import ProvisioningError
+
+PACKAGES = {
+    "http://latestbuilds/pkg-1.zip": b"package one" * 1000,
+    "http://latestbuilds/pkg-2.zip": b"package two" * 1000,
+}
+
+
+class FakeResponse:
+    def __init__(self, body, status_code, etag):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"ETag": etag}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    requests_made = []
+
+    def get(url, headers=None, stream=False, verify=True):
+        requests_made.append((url, headers))
+        body = PACKAGES[url]
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        if headers and "Range" in headers and headers.get("If-Range") == etag:
+            offset = int(headers["Range"].split("=")[1].rstrip("-"))
+            return FakeResponse(body[offset:], 206, etag)
+        return FakeResponse(body, 200, etag)
+
+    monkeypatch.setattr(artifact_cache.transport, "get", get)
+    return requests_made
+
+
+def test_fetch_uses_cache(tmpdir, downloads):
+    cache_dir = str(tmpdir.join("cache"))
+    url = "http://latestbuilds/pkg-1.zip"
+
+    artifact_cache.fetch(url, str(tmpdir.join("one", "pkg-1.zip")), cache_dir=cache_dir)
+    artifact_cache.fetch(url, str(tmpdir.join("two", "pkg-1.zip")), cache_dir=cache_dir)
+
+    assert len(downloads) == 1
+    assert tmpdir.join("two", "pkg-1.zip").read_binary() == PACKAGES[url]
+    sha256 = hashlib.sha256(PACKAGES[url]).hexdigest()
+    assert artifact_cache._read_manifest(cache_dir)[url]["sha256"] == sha256
+
+
+def test_fetch_redownloads_corrupt_blob(tmpdir, downloads):
+    cache_dir = str(tmpdir.join("cache"))
+    url = "http://latestbuilds/pkg-1.zip"
+    artifact_cache.fetch(url, str(tmpdir.join("pkg-1.zip")), cache_dir=cache_dir)
+
+    blob_path = artifact_cache._blob_path(cache_dir, hashlib.sha256(PACKAGES[url]).hexdigest())
+    with open(blob_path, "r+b") as f:
+        f.write(b"X")
+
+    artifact_cache.fetch(url, str(tmpdir.join("pkg-1.zip")), cache_dir=cache_dir)
+    assert len(downloads) == 2
+    assert tmpdir.join("pkg-1.zip").read_binary() == PACKAGES[url]
+
+
+def write_partial(cache_dir, url, partial, validator=None):
+    partial_path = os.path.join(cache_dir, "partial", artifact_cache._url_key(url))
+    os.makedirs(os.path.dirname(partial_path))
+    with open(partial_path, "wb") as f:
+        f.write(partial)
+    if validator is not None:
+        with open("{}.validator".format(partial_path), "w") as f:
+            f.write(validator)
+    return partial_path
+
+
+def test_fetch_resumes_partial_download(tmpdir, downloads):
+    cache_dir = str(tmpdir.join("cache"))
+    url = "http://latestbuilds/pkg-2.zip"
+    etag = '"{}"'.format(hashlib.sha1(PACKAGES[url]).hexdigest())
+    partial_path = write_partial(cache_dir, url, PACKAGES[url][:100], validator=etag)
+
+    artifact_cache.fetch(url, str(tmpdir.join("pkg-2.zip")), cache_dir=cache_dir)
+    assert downloads == [(url, {"Range": "bytes=100-", "If-Range": etag})]
+    assert tmpdir.join("pkg-2.zip").read_binary() == PACKAGES[url]
+    assert not os.path.exists("{}.validator".format(partial_path))
+
+
+def test_fetch_restarts_when_package_changed(tmpdir, downloads):
+    cache_dir = str(tmpdir.join("cache"))
+    url = "http://latestbuilds/pkg-2.zip"
+    write_partial(cache_dir, url, b"an older build", validator='"old"')
+
+    artifact_cache.fetch(url, str(tmpdir.join("pkg-2.zip")), cache_dir=cache_dir)
+    # The server sent the whole new package instead of a range
+    assert tmpdir.join("pkg-2.zip").read_binary() == PACKAGES[url]
+    assert artifact_cache._read_manifest(cache_dir)[url]["sha256"] == hashlib.sha256(PACKAGES[url]).hexdigest()
+
+
+def test_fetch_does_not_resume_without_validator(tmpdir, downloads):
+    cache_dir = str(tmpdir.join("cache"))
+    url = "http://latestbuilds/pkg-2.zip"
+    write_partial(cache_dir, url, b"unknown bytes")
+
+    artifact_cache.fetch(url, str(tmpdir.join("pkg-2.zip")), cache_dir=cache_dir)
+    assert downloads == [(url, {})]
+    assert tmpdir.join("pkg-2.zip").read_binary() == PACKAGES[url]
+
+
+def test_fetch_checksum_mismatch(tmpdir, downloads):
+    with pytest.raises(ProvisioningError):
+        artifact_cache.fetch("http://latestbuilds/pkg-1.zip", str(tmpdir.join("pkg-1.zip")), sha256="0" * 64,
+                             cache_dir=str(tmpdir.join("cache")))
+
+
+def test_fetch_many(tmpdir, downloads):
+    wanted = [(url, str(tmpdir.join(url.split("/")[-1]))) for url in PACKAGES]
+    assert artifact_cache.fetch_many(wanted, cache_dir=str(tmpdir.join("cache"))) == [dest for _, dest in wanted]
+    for url, dest in wanted:
+        assert open(dest, "rb").read() == PACKAGES[url]
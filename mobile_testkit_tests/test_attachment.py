@@ -1,5 +1,11 @@
+import base64
+import io
+
 import pytest
+from PIL import Image
+
 from keywords import attachment
+from keywords.constants import DATA_DIR
 
 
 def test_load_from_data_dir_requires_list():
@@ -10,3 +16,28 @@ def test_load_from_data_dir_requires_list():
 def test_load_from_data_dir():
     atts = attachment.load_from_data_dir(["sample_text.txt", "golden_gate_large.jpg"])
     assert len(atts) == 2 and atts[0].name == "sample_text.txt" and atts[1].name == "golden_gate_large.jpg"
+
+
+def test_load_from_data_dir_keeps_binary_content():
+    att = attachment.load_from_data_dir(["golden_gate_large.jpg"])[0]
+    with open("{}/golden_gate_large.jpg".format(DATA_DIR), "rb") as f:
+        assert att.raw == f.read()
+    assert base64.standard_b64decode(att.data) == att.raw
+
+
+def test_generate_png():
+    att = attachment.generate_png(20, 10)[0]
+    assert att.name.endswith(".png")
+    assert Image.open(io.BytesIO(att.raw)).size == (20, 10)
+
+    # Noise is new on every call unless a seed is given
+    assert attachment.generate_png(20, 10)[0].raw != att.raw
+    assert attachment.generate_png(20, 10, seed=3)[0].raw == attachment.generate_png(20, 10, seed=3)[0].raw
+
+
+def test_attachment_from_base64():
+    att = attachment.Attachment("a.txt", base64.standard_b64encode(b"binary\x00\xff"))
+    assert att.raw == b"binary\x00\xff"
+
+    with pytest.raises(ValueError):
+        attachment.Attachment("a.txt")
@@ -20,3 +20,26 @@ def test_validate_cluster():
     sg_accels.append("sga1")
     is_valid, _ = validate_cluster(sync_gateways, sg_accels, config)
     assert is_valid is True
+
+
+def test_reset_fingerprint(tmpdir):
+    """
+    Make sure the fast reset fingerprint changes with the sg config, cluster config and bucket set
+    """
+    from libraries.testkit.cluster import Cluster
+
+    cluster_config = tmpdir.join("base_cc")
+    cluster_config.new(ext="json").write('{"environment": {}}')
+    sg_config = tmpdir.join("sync_gateway_default_cc.json")
+    sg_config.write('{"databases": {"db": {"bucket": "data-bucket"}}}')
+
+    cluster = Cluster.__new__(Cluster)
+    cluster._cluster_config = str(cluster_config)
+
+    fingerprint = cluster._reset_fingerprint(str(sg_config), {"data-bucket"}, "cc")
+    assert fingerprint == cluster._reset_fingerprint(str(sg_config), {"data-bucket"}, "cc")
+    assert fingerprint != cluster._reset_fingerprint(str(sg_config), {"data-bucket", "data-bucket-2"}, "cc")
+    assert fingerprint != cluster._reset_fingerprint(str(sg_config), {"data-bucket"}, "di")
+
+    sg_config.write('{"databases": {"db": {"bucket": "data-bucket", "revs_limit": 20}}}')
+    assert fingerprint != cluster._reset_fingerprint(str(sg_config), {"data-bucket"}, "cc")
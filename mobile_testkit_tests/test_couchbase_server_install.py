@@ -58,3 +58,29 @@ def test_mobile_url_centos6():
     base_url, package_name = server_config.get_baseurl_package(cb_server, cbs_platform)
     assert base_url == "http://cbmobile-packages.s3.amazonaws.com"
     assert package_name == "couchbase-server-enterprise-4.1.1-5914-centos6.x86_64.rpm"
+
+
+def test_create_buckets_waits_once(monkeypatch):
+    cb_server = CouchbaseServer("http://192.168.33.20:8091")
+    version_lookups = []
+    created = []
+    probed = []
+    ready_checks = []
+
+    def server_version(host, cbs_ssl=False):
+        version_lookups.append(host)
+        return "7.0.0-5302"
+
+    monkeypatch.setattr("keywords.couchbaseserver.get_server_version", server_version)
+    monkeypatch.setattr(cb_server, "get_ram_per_bucket", lambda num_buckets: 256)
+    monkeypatch.setattr(cb_server, "_create_bucket_and_user",
+                        lambda cluster_config, name, ram_quota_mb, version: created.append((name, ram_quota_mb, version)))
+    monkeypatch.setattr(cb_server, "_probe_buckets", lambda bucket_names, ipv6=False: probed.append(bucket_names))
+    monkeypatch.setattr(cb_server, "wait_for_ready_state", lambda: ready_checks.append(True))
+
+    cb_server.create_buckets(["data-bucket", "index-bucket", "extra-bucket"], cluster_config=None)
+
+    assert sorted(created) == [(name, 256, "7.0.0-5302") for name in ["data-bucket", "extra-bucket", "index-bucket"]]
+    assert len(version_lookups) == 1
+    assert probed == [["data-bucket", "index-bucket", "extra-bucket"]]
+    assert len(ready_checks) == 1
@@ -0,0 +1,54 @@
+import pytest
+
+from keywords import doc_corpus
+from keywords import document
+from keywords.doc_corpus import DocCorpus
+from keywords.exceptions import DocumentError
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_corpus_round_trip(tmpdir, compress):
+    path = str(tmpdir.join("docs.ndjson"))
+    docs = document.create_docs("doc", 25, content={"text": "line\nbreak"}, channels=["A"])
+    assert doc_corpus.write_corpus(path, iter(docs), block_size=10, compress=compress) == 25
+
+    with DocCorpus(path) as corpus:
+        assert len(corpus) == 25
+        assert list(corpus) == docs
+        assert corpus.get("doc_17") == docs[17]
+        assert corpus.get("doc_3") == docs[3]
+
+        doc_id, body = next(corpus.sdk_docs())
+        assert doc_id == "doc_0" and "_id" not in body
+        assert next(corpus.cbl_docs())["id"] == "doc_0"
+
+        with pytest.raises(DocumentError):
+            corpus.get("doc_25")
+
+
+def test_generated_corpus_is_identical(tmpdir):
+    first = str(tmpdir.join("first.ndjson"))
+    second = str(tmpdir.join("second.ndjson"))
+    doc_corpus.generate_corpus(first, "simple_user", 50, seed=11, channels=["B"])
+    doc_corpus.generate_corpus(second, "simple_user", 50, seed=11, channels=["B"])
+
+    with DocCorpus(first) as corpus_one, DocCorpus(second) as corpus_two:
+        assert corpus_one.doc_ids() == ["doc_{}".format(i) for i in range(50)]
+        for doc_one, doc_two in zip(corpus_one, corpus_two):
+            doc_one.pop("date_time_added")
+            doc_two.pop("date_time_added")
+            assert doc_one == doc_two
+            assert doc_one["channels"] == ["B"]
+
+
+def test_empty_and_invalid_corpus(tmpdir):
+    path = str(tmpdir.join("empty.ndjson"))
+    doc_corpus.write_corpus(path, [])
+    with DocCorpus(path) as corpus:
+        assert list(corpus) == []
+
+    with pytest.raises(DocumentError):
+        doc_corpus.write_corpus(path, [{"no": "id"}])
+
+    with pytest.raises(DocumentError):
+        DocCorpus(str(tmpdir.join("missing.ndjson")))
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from libraries.data import doc_generators
+
+
+def without_timestamp(doc):
+    doc = dict(doc)
+    doc.pop("date_time_added", None)
+    return doc
+
+
+@pytest.mark.parametrize("template", ["simple", "simple_user", "complex_doc", "four_k"])
+def test_generate_matches_template(template):
+    docs = list(doc_generators.generate(template, 25, batch_size=10))
+    assert len(docs) == 25
+
+    # Batched docs have the same shape as the ones built one at a time
+    expected = getattr(doc_generators, template)()
+    for doc in docs:
+        assert sorted(doc.keys()) == sorted(expected.keys())
+        json.dumps(doc)
+
+
+def test_generate_is_reproducible():
+    first = [without_timestamp(doc) for doc in doc_generators.generate("simple_user", 30, seed=7)]
+    again = [without_timestamp(doc) for doc in doc_generators.generate("simple_user", 10, seed=7, batch_size=3)]
+    other = [without_timestamp(doc) for doc in doc_generators.generate("simple_user", 10, seed=8)]
+
+    assert first[:10] == again
+    assert first[:10] != other
+    assert len(set(doc["guid"] for doc in first)) == 30
+    assert len(first[0]["email"]) == 20
+
+
+def test_generate_unknown_template():
+    with pytest.raises(ValueError):
+        list(doc_generators.generate("huge", 1))
+
+
+def test_generate_sized():
+    for doc in doc_generators.generate_sized(3, 4096, seed=1):
+        assert len(json.dumps(doc)) == 4096
+
+    with pytest.raises(ValueError):
+        next(doc_generators.generate_sized(1, 5))
+
+
+def test_random_string():
+    assert len(doc_generators.random_string(10)) == 10
+    assert doc_generators.random_string(5000).isalpha()
+    assert 0 <= doc_generators.random_long() <= doc_generators.MAX_LONG
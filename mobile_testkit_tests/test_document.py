@@ -1,6 +1,7 @@
 import pytest
 from keywords import document
 from keywords import attachment
+from keywords.exceptions import DocumentError
 
 ATTACHMENT_ONE = attachment.generate_png_100_100()
 ATTACHMENT_TWO = attachment.generate_png_100_100()
@@ -51,3 +52,60 @@ def test_document_attachment_not_list():
 def test_document_channels_not_list():
     with pytest.raises(TypeError):
         document.create_doc(None, None, None, None, "B")
+
+
+def test_vbucket_index(tmpdir):
+    index = document.VBucketIndex(prefix="rollback")
+    doc_ids = index.doc_ids_for_vbuckets([0, 66, 1023], 20)
+
+    for vbucket_number, vbucket_doc_ids in doc_ids.items():
+        assert len(set(vbucket_doc_ids)) == 20
+        assert all(document.get_vbucket_number(doc_id) == vbucket_number for doc_id in vbucket_doc_ids)
+
+    # Ids are deterministic for a prefix and survive a save / load
+    index_path = str(tmpdir.join("vbuckets.json"))
+    index.save(index_path)
+    loaded = document.VBucketIndex.load(index_path)
+    assert loaded.doc_ids_for_vbucket(66, 20) == doc_ids[66]
+    assert loaded.doc_ids_for_vbucket(66, 40) == document.VBucketIndex(prefix="rollback").doc_ids_for_vbucket(66, 40)
+
+
+def test_vbucket_index_invalid_vbucket():
+    with pytest.raises(DocumentError):
+        document.generate_doc_ids_for_vbucket(1024, 1)
+
+    doc_id = document.generate_doc_id_for_vbucket(7)
+    assert document.get_vbucket_number(doc_id) == 7
+
+
+def test_create_docs_matches_create_doc():
+    docs = document.create_docs("doc", 3, content={"foo": "bar"}, attachments_generator=lambda: ATTACHMENTS,
+                                expiry=10, channels=["A"], prop_generator=document.update_prop_generator)
+    assert docs == [
+        document.create_doc("doc_{}".format(i), content={"foo": "bar"}, attachments=ATTACHMENTS, expiry=10,
+                            channels=["A"], prop_generator=document.update_prop_generator)
+        for i in range(3)
+    ]
+
+
+def test_iter_docs_is_lazy():
+    generated = []
+
+    def prop_generator():
+        generated.append(1)
+        return {"updates": 0}
+
+    docs = document.iter_docs("doc", 1000000, channels=["A"], prop_generator=prop_generator, cbl=True, start=5)
+    first, second = next(docs), next(docs)
+
+    assert len(generated) == 2
+    assert first == {"id": "doc_5", "channels": ["A"], "updates": 0}
+    assert second["id"] == "doc_6"
+    # Constant fields are shared between docs
+    assert first["channels"] is second["channels"]
+
+
+def test_iter_doc_batches():
+    batches = list(document.iter_doc_batches(document.iter_docs("doc", 25), batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert batches[2][-1]["_id"] == "doc_24"
@@ -0,0 +1,127 @@
+import pytest
+from requests.exceptions import ConnectionError
+
+from keywords import import_monitor
+from keywords.exceptions import ImportStallError
+from keywords.SyncGateway import wait_until_docs_imported_from_server
+
+
+class FakeClient:
+    """ Replays a list of {db: import_count} snapshots as _expvar responses, repeating the last one """
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = 0
+
+    def get_expvars(self, url, auth=None):
+        self.requests += 1
+        counts = self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+        return {"syncgateway": {"per_db": {db: {"shared_bucket_import": {"import_count": count}} for db, count in counts.items()}}}
+
+
+class FakeMetricsResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeMetrics:
+    """ Replays a list of {db: import_count} snapshots as _metrics responses, repeating the last one """
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        counts = self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+        lines = ["# TYPE sgw_shared_bucket_import_import_count counter"]
+        lines += ['sgw_shared_bucket_import_import_count{{database="{}"}} {}'.format(db, count) for db, count in counts.items()]
+        return FakeMetricsResponse("\n".join(lines))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(import_monitor.time, "sleep", sleeps.append)
+    return sleeps
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(sleeps):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def no_metrics_endpoint(monkeypatch):
+    def refuse(url, **kwargs):
+        raise ConnectionError("connection refused")
+    monkeypatch.setattr(import_monitor.transport, "get", refuse)
+
+
+def test_wait_for_many_dbs():
+    client = FakeClient([
+        {"db1": 10, "db2": 0},
+        {"db1": 50, "db2": 20},
+        {"db1": 110, "db2": 60},
+        {"db1": 110, "db2": 100}
+    ])
+    monitor = import_monitor.ImportMonitor(client, "http://sg:4985", ["db1", "db2"])
+    report = monitor.wait({"db1": 100, "db2": 100})
+
+    assert report["db1"]["imported"] == 100
+    assert report["db2"]["imported"] == 100
+    assert client.requests == 4
+
+
+def test_wait_fails_on_stall():
+    client = FakeClient([{"db": 5}])
+
+    with pytest.raises(ImportStallError):
+        wait_until_docs_imported_from_server("http://sg:4985", client, "db", 10, prev_import_count=0, stall_timeout=0)
+
+
+def test_wait_until_docs_imported_from_server():
+    client = FakeClient([{"db": 100}, {"db": 105}, {"db": 110}])
+    report = wait_until_docs_imported_from_server("http://sg:4985", client, "db", 10, prev_import_count=100)
+    assert report["imported"] == 10
+
+
+def test_metrics_url_for_admin_url():
+    assert import_monitor.metrics_url_for_admin_url("http://192.168.33.10:4985") == "http://192.168.33.10:4986/_metrics"
+    assert import_monitor.metrics_url_for_admin_url("https://[fe80::1]:4985") == "https://[fe80::1]:4986/_metrics"
+    assert import_monitor.metrics_url_for_admin_url("http://sg:8080") is None
+
+
+def test_wait_reads_metrics_endpoint(monkeypatch):
+    metrics = FakeMetrics([{"db": 100, "other": 7}, {"db": 100}, {"db": 105}, {"db": 110}])
+    monkeypatch.setattr(import_monitor.transport, "get", metrics.get)
+    client = FakeClient([{"db": 0}])
+
+    report = wait_until_docs_imported_from_server("http://sg:4985", client, "db", 10, prev_import_count=100)
+    assert report["imported"] == 10
+    assert metrics.requests == 4
+    assert client.requests == 0
+
+
+def test_steady_import_polls_at_progress_interval(monkeypatch):
+    clock = [1000.0]
+    sleeps = []
+
+    def sleep(secs):
+        sleeps.append(secs)
+        clock[0] += secs
+
+    monkeypatch.setattr(import_monitor.time, "time", lambda: clock[0])
+    monkeypatch.setattr(import_monitor.time, "sleep", sleep)
+
+    # 100 docs per poll, 10000 to go
+    client = FakeClient([{"db": i * 100} for i in range(101)])
+    import_monitor.ImportMonitor(client, "http://sg:4985", ["db"], baseline={"db": 0}).wait(10000)
+
+    assert len(sleeps) == 100
+    # Polls only speed up for the last few intervals before the ETA
+    assert sum(1 for secs in sleeps if secs < import_monitor.PROGRESS_POLL_INTERVAL_SECS) <= 2 * import_monitor.NEAR_DONE_INTERVALS
+    assert all(secs >= import_monitor.MIN_POLL_INTERVAL_SECS for secs in sleeps)
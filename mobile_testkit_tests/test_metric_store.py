@@ -0,0 +1,54 @@
+import math
+
+import numpy
+import pytest
+
+from libraries.utilities.metric_store import MetricWriter, load_metrics
+
+METRICS = ["memstats/Alloc", "gateload/ops/PushToSubscriberInteractive/p95"]
+
+
+def snapshot(alloc, p95=None):
+    expvars = {"memstats": {"Alloc": alloc, "Sys": 1}, "gateload": {"ops": {}}}
+    if p95 is not None:
+        expvars["gateload"]["ops"]["PushToSubscriberInteractive"] = {"p95": p95}
+    return expvars
+
+
+def test_capture_round_trip(tmpdir):
+    path = str(tmpdir.join("sync_gateway_expvars.metrics"))
+
+    with MetricWriter(path, METRICS, chunk_rows=2) as writer:
+        writer.append("sg1:4985", snapshot(100), timestamp=1000.5)
+        writer.append("sg2:4985", snapshot(200, p95=5), timestamp=1001)
+        writer.append("sg1:4985", snapshot(300, p95=6), timestamp=1002)
+
+    # Captures can be appended to
+    with MetricWriter(path, METRICS) as writer:
+        writer.append("sg2:4985", snapshot(400), timestamp=1003)
+
+    series = load_metrics(path)
+    assert len(series) == 4
+    assert series.sources == ["sg1:4985", "sg2:4985"]
+    assert series.timestamps.dtype == numpy.int64
+    assert series.timestamps[0] == 1000500000000
+    assert series.datetimes()[1] == numpy.datetime64(1001, "s")
+    assert series["memstats/Alloc"].tolist() == [100, 200, 300, 400]
+    assert math.isnan(series["gateload/ops/PushToSubscriberInteractive/p95"][0])
+
+    sg2 = series.for_sources(["sg2:4985"])
+    assert sg2["memstats/Alloc"].tolist() == [200, 400]
+
+    with pytest.raises(ValueError):
+        MetricWriter(path, ["memstats/Sys"])
+
+
+def test_partial_row_is_ignored(tmpdir):
+    path = str(tmpdir.join("gateload_expvars.metrics"))
+    with MetricWriter(path, METRICS) as writer:
+        writer.append("lg1:9876", snapshot(100), timestamp=1)
+
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 5)
+
+    assert load_metrics(path)["memstats/Alloc"].tolist() == [100]
@@ -0,0 +1,122 @@
+import threading
+
+import numpy
+import pytest
+from requests.exceptions import ConnectionError, ReadTimeout
+
+from libraries.testkit import prometheus
+from libraries.utilities import metrics_scraper
+from libraries.utilities.metric_store import load_metrics
+from libraries.utilities.metrics_scraper import MetricsScraper, expvar_target, prometheus_target
+
+METRICS_TEXT = """# HELP sgw_database_num_doc_writes num_doc_writes
+# TYPE sgw_database_num_doc_writes counter
+sgw_database_num_doc_writes{database="db1"} 10
+sgw_database_num_doc_writes{database="db\\"2\\""} 5
+sgw_resource_utilization_process_memory_resident 1.5e+06
+go_gc_duration_seconds{quantile="0.5"} NaN
+"""
+
+
+class FakeResponse:
+    def __init__(self, json_body=None, text=""):
+        self._json = json_body
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._json
+
+
+def test_parse_metrics():
+    samples = prometheus.parse_metrics(METRICS_TEXT)
+    assert samples[1] == prometheus.Sample("sgw_database_num_doc_writes", {"database": 'db"2"'}, 5.0)
+
+    snapshot = prometheus.metrics_snapshot(samples)
+    assert snapshot["sgw_database_num_doc_writes"] == 15
+    assert snapshot['sgw_database_num_doc_writes{database="db1"}'] == 10
+    assert snapshot["sgw_resource_utilization_process_memory_resident"] == 1.5e6
+
+
+def test_tick_aligned_captures(tmpdir, monkeypatch):
+    expvars_path = str(tmpdir.join("sync_gateway_expvars.metrics"))
+    metrics_path = str(tmpdir.join("sync_gateway_metrics.metrics"))
+
+    def fake_get(url, **kwargs):
+        if url.endswith("_metrics"):
+            return FakeResponse(text=METRICS_TEXT)
+        if url.startswith("http://sg2"):
+            raise ConnectionError("sg2 is down")
+        if url.startswith("http://sg3"):
+            raise ReadTimeout("sg3 is slow")
+        return FakeResponse(json_body={"memstats": {"Alloc": 7}})
+
+    monkeypatch.setattr(metrics_scraper.transport, "get", fake_get)
+    scraper = MetricsScraper([
+        expvar_target(expvars_path, "sg1:4985", "http://sg1:4985/_expvar"),
+        expvar_target(expvars_path, "sg2:4985", "http://sg2:4985/_expvar"),
+        expvar_target(expvars_path, "sg3:4985", "http://sg3:4985/_expvar"),
+        prometheus_target(metrics_path, "sg1:4986", "http://sg1:4986/_metrics")
+    ], {
+        expvars_path: ["memstats/Alloc"],
+        metrics_path: ["sgw_database_num_doc_writes"]
+    }, interval=0.01)
+
+    scraper.run(duration=0.05)
+    scraper.stop()
+
+    assert scraper.ticks == 5
+    assert scraper.consecutive_failures["sg2:4985"] == 5
+    assert scraper.consecutive_disconnects["sg2:4985"] == 5
+    # Slow responses are failures but not disconnects
+    assert scraper.consecutive_failures["sg3:4985"] == 5
+    assert scraper.consecutive_disconnects["sg3:4985"] == 0
+    assert scraper.consecutive_disconnects["sg1:4985"] == 0
+    assert isinstance(scraper.last_errors["sg2:4985"], ConnectionError)
+
+    expvars = load_metrics(expvars_path)
+    assert expvars.sources == ["sg1:4985"]
+    assert expvars["memstats/Alloc"].tolist() == [7] * 5
+    # Samples are stamped with their tick, one interval apart
+    assert numpy.allclose(numpy.diff(numpy.sort(expvars.timestamps)), 10000000, rtol=0, atol=1000)
+
+    assert load_metrics(metrics_path)["sgw_database_num_doc_writes"].tolist() == [15] * 5
+
+
+def test_slow_target_is_skipped(tmpdir, monkeypatch):
+    path = str(tmpdir.join("gateload_expvars.metrics"))
+    release = threading.Event()
+
+    def fake_get(url, **kwargs):
+        if "slow" in url:
+            release.wait(5)
+        return FakeResponse(json_body={"gateload": {"total_doc_pushed": 1}})
+
+    monkeypatch.setattr(metrics_scraper.transport, "get", fake_get)
+    scraper = MetricsScraper([
+        expvar_target(path, "fast", "http://fast:9876/debug/vars"),
+        expvar_target(path, "slow", "http://slow:9876/debug/vars")
+    ], {path: ["gateload/total_doc_pushed"]})
+
+    for tick in range(3):
+        scraper.tick(timestamp=tick)
+        scraper._in_flight["fast"].result()
+    release.set()
+    scraper.stop()
+
+    assert scraper.skipped == {"fast": 0, "slow": 2}
+    series = load_metrics(path)
+    assert len(series.for_sources(["fast"])) == 3
+    assert len(series.for_sources(["slow"])) == 1
+
+
+@pytest.mark.parametrize("label, escaped", [
+    ('a"b', 'a\\"b'),
+    ("a\\b", "a\\\\b"),
+    ("a\nb", "a\\nb")
+])
+def test_label_escaping(label, escaped):
+    assert prometheus.series_key("m", {"l": label}) == 'm{{l="{}"}}'.format(escaped)
+    assert prometheus.parse_metrics('m{{l="{}"}} 1'.format(escaped))[0].labels == {"l": label}
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pytest
+from requests.exceptions import HTTPError
+
+from keywords import principals
+from keywords.exceptions import BulkProvisioningError
+from libraries.testkit import settings
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError("{} Error".format(self.status_code))
+
+
+class FakeSession:
+    """ Records PUTs and replays a list of status codes per endpoint (defaults to 201).
+    If 'release' (a threading.Event) is given, every PUT blocks until it is set.
+    """
+
+    def __init__(self, status_codes=None, release=None):
+        self.status_codes = status_codes or {}
+        self.release = release
+        self.puts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.changed = threading.Condition()
+
+    def put(self, endpoint, data=None, auth=None, timeout=None):
+        with self.changed:
+            self.puts.append(endpoint)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            codes = self.status_codes.get(endpoint, [])
+            status_code = codes.pop(0) if codes else 201
+            self.changed.notify_all()
+        if self.release is not None:
+            self.release.wait(5)
+        with self.changed:
+            self.in_flight -= 1
+        return FakeResponse(status_code)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "BACKOFF_FACTOR", 0)
+
+
+def test_put_principals_creates_all_users():
+    release = threading.Event()
+    session = FakeSession(release=release)
+    users = (principals.user_body("user_{}".format(i), "pass", ["ABC"]) for i in range(100))
+
+    created = []
+    consumer = threading.Thread(target=lambda: created.extend(
+        principals.put_principals(session, "http://sg:4985", "db", "user", users, max_in_flight=4)
+    ))
+    consumer.start()
+    try:
+        # The window fills up while every request is blocked, but no further
+        with session.changed:
+            assert session.changed.wait_for(lambda: session.in_flight == 4, timeout=5)
+        time.sleep(0.1)
+        assert session.in_flight == 4
+        assert len(session.puts) == 4
+    finally:
+        release.set()
+        consumer.join()
+
+    assert sorted(user["name"] for user in created) == sorted("user_{}".format(i) for i in range(100))
+    assert "http://sg:4985/db/_user/user_0" in session.puts
+    assert session.max_in_flight == 4
+
+
+def test_put_principals_is_lazy():
+    consumed = []
+
+    def roles():
+        for i in range(1000):
+            consumed.append(i)
+            yield principals.role_body("role_{}".format(i))
+
+    created = principals.put_principals(FakeSession(), "http://sg:4985", "db", "role", roles(), max_in_flight=2)
+    next(created)
+    assert len(consumed) < 10
+    created.close()
+
+
+def test_put_principals_retries_and_reports_failures():
+    session = FakeSession({
+        "http://sg:4985/db/_user/retried": [503, 500],
+        "http://sg:4985/db/_user/failed": [403],
+    })
+    users = [principals.user_body(name, "pass") for name in ["ok", "retried", "failed"]]
+
+    created = []
+    with pytest.raises(BulkProvisioningError) as e:
+        for user in principals.put_principals(session, "http://sg:4985", "db", "user", users, max_retries=2):
+            created.append(user["name"])
+
+    assert sorted(created) == ["ok", "retried"]
+    assert [user["name"] for user in e.value.failed] == ["failed"]
+
+    # Resume with only the failed users
+    resumed = list(principals.put_principals(session, "http://sg:4985", "db", "user", e.value.failed))
+    assert [user["name"] for user in resumed] == ["failed"]
+
+
+def test_put_principals_invalid_type():
+    with pytest.raises(ValueError):
+        list(principals.put_principals(FakeSession(), "http://sg:4985", "db", "group", []))
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from libraries.testkit import prometheus
+from libraries.testkit.prometheus import PrometheusScraper
+from libraries.utilities.metric_store import load_metrics
+
+
+class FakeMetricsEndpoint:
+    """ Serves sgw_database_num_doc_writes, which grows by 10 per scrape, one second apart """
+
+    def __init__(self):
+        self.scrapes = 0
+        self.now = 1000.0
+
+    def get(self, url, **kwargs):
+        self.scrapes += 1
+        return self
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def text(self):
+        lines = ['sgw_database_num_doc_writes{{database="db"}} {}'.format(self.scrapes * 10)]
+        if self.scrapes > 1:
+            lines.append("sgw_replication_sgr_num_docs_pushed 4")
+        return "\n".join(lines)
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    fake = FakeMetricsEndpoint()
+    monkeypatch.setattr(prometheus.transport, "get", fake.get)
+    monkeypatch.setattr(prometheus.time, "time", fake.time)
+    return fake
+
+
+def test_phase_deltas_and_rates(endpoint, tmpdir):
+    path = str(tmpdir.join("sync_gateway_metrics.metrics"))
+    scraper = PrometheusScraper("http://sg:4986/_metrics", max_snapshots=2,
+                                capture_path=path, capture_metrics=["sgw_database_num_doc_writes"])
+
+    scraper.mark("start")
+    scraper.mark("end")
+    assert scraper.delta("sgw_database_num_doc_writes", "start", "end") == 10
+    assert scraper.delta('sgw_database_num_doc_writes{database="db"}', "start", "end") == 10
+    # Not served at 'start' yet
+    assert scraper.delta("sgw_replication_sgr_num_docs_pushed", "start", "end") == 4
+
+    # Up to now: 20 more writes over 2 seconds
+    assert scraper.rate("sgw_database_num_doc_writes", "start") == 10
+
+    with pytest.raises(ValueError):
+        scraper.delta("sgw_database_num_doc_writes", "missing")
+    with pytest.raises(ValueError):
+        scraper.delta("sgw_unknown", "start")
+
+    assert scraper.history("sgw_database_num_doc_writes") == [(1003.0, 30), (1004.0, 40)]
+    scraper.stop()
+    assert load_metrics(path)["sgw_database_num_doc_writes"].tolist() == [10, 20, 30, 40]
+
+
+def test_verify_stat_on_prometheus(endpoint):
+    with pytest.raises(RuntimeError):
+        prometheus.verify_stat_on_prometheus("sgw_database_num_doc_writes")
+
+    scraper = prometheus.start_prometheus("sg", ssl=True, need_auth=True, interval=60)
+    try:
+        assert scraper.url == "https://sg:4986/_metrics"
+        assert scraper.auth == ("sgw_admin", "password")
+        assert prometheus.verify_stat_on_prometheus("sgw_database_num_doc_writes")
+        assert prometheus.verify_stat_on_prometheus("sgw_unknown") is None
+    finally:
+        prometheus.stop_prometheus("sg", ssl=True, need_auth=True)
+    assert prometheus._scraper is None
+
+
+def test_scraper_survives_bad_exposition(monkeypatch):
+    bodies = ["sgw_database_num_doc_writes 1", "not a valid { line", "sgw_database_num_doc_writes 3"]
+    scraped = threading.Event()
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, **kwargs):
+        if len(bodies) == 1:
+            scraped.set()
+        return Response(bodies.pop(0) if len(bodies) > 1 else bodies[0])
+
+    monkeypatch.setattr(prometheus.transport, "get", get)
+    scraper = PrometheusScraper("http://sg:4986/_metrics", interval=0.01)
+    scraper.start()
+    try:
+        assert scraped.wait(5)
+    finally:
+        scraper.stop()
+
+    assert isinstance(scraper.last_error, ValueError)
+    assert scraper.history("sgw_database_num_doc_writes")[-1][1] == 3
@@ -0,0 +1,96 @@
+import pytest
+import requests
+from requests.exceptions import ConnectionError
+
+import keywords.constants
+from keywords import readiness
+from keywords.couchbaseserver import CouchbaseServer
+from keywords.exceptions import TimeoutError
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    readiness.reset_wait_metrics()
+    yield
+    readiness.reset_wait_metrics()
+
+
+def test_wait_until_backs_off_and_returns_result(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(readiness.time, "sleep", sleeps.append)
+    results = iter([None, False, {"nodes": []}])
+
+    assert readiness.wait_until(lambda: next(results), "nodes", timeout=60) == {"nodes": []}
+
+    # Two polls failed, the second interval is roughly double the first
+    assert len(sleeps) == 2
+    assert readiness.INITIAL_DELAY * 0.8 <= sleeps[0] <= readiness.INITIAL_DELAY * 1.2
+    assert sleeps[1] > sleeps[0]
+
+    metrics = readiness.get_wait_metrics()["nodes"]
+    assert metrics["count"] == 1
+    assert metrics["polls"] == 3
+    assert metrics["timeouts"] == 0
+
+
+def test_wait_until_retries_on_given_exceptions(monkeypatch):
+    monkeypatch.setattr(readiness.time, "sleep", lambda secs: None)
+    attempts = []
+
+    def check():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("server starting")
+        return True
+
+    assert readiness.wait_until(check, "server", timeout=60, retry_on=(ConnectionError,)) is True
+    assert len(attempts) == 3
+
+
+def test_wait_until_deadline():
+    with pytest.raises(TimeoutError):
+        readiness.wait_until(lambda: False, "never ready", timeout=0.2)
+
+    assert readiness.wait_until(lambda: False, "never ready", timeout=0.2, raise_on_timeout=False) is False
+    assert readiness.get_wait_metrics()["never ready"]["timeouts"] == 2
+
+
+def response(status_code, url="http://localhost:8091/pools/default/buckets/db/controller/doFlush"):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.request = requests.Request("POST", url).prepare()
+    resp._content = b""
+    return resp
+
+
+class FakeSession:
+    def __init__(self, status_codes):
+        self.status_codes = iter(status_codes)
+
+    def post(self, url, **kwargs):
+        return response(next(self.status_codes), url)
+
+
+def test_flush_bucket_retries_while_warming_up(monkeypatch):
+    monkeypatch.setattr(readiness.time, "sleep", lambda secs: None)
+    server = CouchbaseServer("http://localhost:8091")
+
+    server._session = FakeSession([503, 500, 200])
+    server.flush_bucket("db")
+    assert readiness.get_wait_metrics()["bucket db to flush"]["polls"] == 3
+
+    # Other errors are not retried
+    server._session = FakeSession([404, 200])
+    with pytest.raises(requests.HTTPError):
+        server.flush_bucket("db")
+
+
+def test_retry_request_gives_up_at_deadline(monkeypatch):
+    monkeypatch.setattr(readiness.time, "sleep", lambda secs: None)
+    monkeypatch.setattr(keywords.constants, "REST_RETRY_TIMEOUT_SECS", 0)
+    server = CouchbaseServer("http://localhost:8091")
+
+    server._session = FakeSession([503, 200])
+    with pytest.raises(requests.HTTPError):
+        server.flush_bucket("db")
+    assert readiness.get_wait_metrics()["bucket db to flush"]["timeouts"] == 1
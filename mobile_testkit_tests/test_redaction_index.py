@@ -0,0 +1,78 @@
+import hashlib
+import zipfile
+
+import pytest
+
+from keywords.exceptions import LogScanningError
+from utilities import log_redaction
+from utilities.log_redaction import RedactionIndex
+
+
+def sha1(value):
+    return hashlib.sha1(value.encode()).hexdigest()
+
+
+def write_zip(path, top_dir, files):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in files.items():
+            zf.writestr("{}/{}".format(top_dir, name), content)
+    return path
+
+
+@pytest.fixture
+def sgcollect_zips(tmpdir):
+    plain = write_zip(str(tmpdir.join("sgcollect.zip")), "sgcollect", {
+        "sg_info.log": "ok\nuser <ud>seth</ud> logged in with <ud>password</ud>\n",
+        "sg_debug.log": "doc <ud>doc_1</ud>\n"
+    })
+    redacted = write_zip(str(tmpdir.join("sgcollect-redacted.zip")), "sgcollect-redacted", {
+        "sg_info.log": "ok\nuser <ud>{}</ud> logged in with <ud>{}</ud>\n".format(sha1("seth"), sha1("password")),
+        "sg_debug.log": "doc <ud>{}</ud>\n".format(sha1("doc_1"))
+    })
+    return plain, redacted
+
+
+def test_redaction_index(sgcollect_zips):
+    plain, redacted = sgcollect_zips
+    plain_index = RedactionIndex(plain, patterns=["seth", "salt"])
+    redacted_index = RedactionIndex(redacted, patterns=["seth", "salt"], max_workers=2)
+
+    assert sorted(span.content for span in plain_index.ud_spans) == ["<ud>doc_1</ud>", "<ud>password</ud>", "<ud>seth</ud>"]
+    assert plain_index.find("seth") == [("sg_info.log", 2)]
+    assert redacted_index.find("salt") == []
+
+    log_redaction.verify_ud_tags_redacted(plain_index, redacted_index)
+    log_redaction.verify_pattern_redacted(redacted_index, "seth")
+
+    with pytest.raises(LogScanningError):
+        log_redaction.verify_pattern_redacted(plain_index, "seth")
+    with pytest.raises(LogScanningError):
+        log_redaction.verify_ud_tags_redacted(plain_index, plain_index)
+    with pytest.raises(ValueError):
+        redacted_index.find("password")
+
+
+def test_redaction_tag_count_mismatch(tmpdir, sgcollect_zips):
+    plain, _ = sgcollect_zips
+    redacted = write_zip(str(tmpdir.join("partial-redacted.zip")), "partial-redacted", {
+        "sg_info.log": "user <ud>{}</ud>\n".format(sha1("seth"))
+    })
+
+    with pytest.raises(LogScanningError) as e:
+        log_redaction.verify_ud_tags_redacted(RedactionIndex(plain), RedactionIndex(redacted))
+    assert "count mismatch" in str(e.value)
+
+
+def test_redaction_tag_location_mismatch(tmpdir, sgcollect_zips):
+    plain, _ = sgcollect_zips
+    # Same number of tags, but one moved to another line and one to another file
+    redacted = write_zip(str(tmpdir.join("moved-redacted.zip")), "moved-redacted", {
+        "sg_info.log": "user <ud>{}</ud>\nlogged in with <ud>{}</ud>\n".format(sha1("seth"), sha1("password")),
+        "sg_error.log": "doc <ud>{}</ud>\n".format(sha1("doc_1"))
+    })
+
+    with pytest.raises(LogScanningError) as e:
+        log_redaction.verify_ud_tags_redacted(RedactionIndex(plain), RedactionIndex(redacted))
+    assert "at 4 lines" in str(e.value)
+    assert "('sg_debug.log', 1, 1, 0)" in str(e.value)
+    assert "('sg_error.log', 1, 0, 1)" in str(e.value)
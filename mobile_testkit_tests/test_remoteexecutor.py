@@ -0,0 +1,113 @@
+import pytest
+
+from keywords import remoteexecutor
+from keywords.exceptions import RemoteCommandError
+from keywords.remoteexecutor import RemoteExecutor
+
+
+class FakeChannel:
+    def __init__(self, status):
+        self.status = status
+
+    def recv_exit_status(self):
+        return self.status
+
+
+class FakeStream(list):
+    def __init__(self, lines, status=0):
+        super(FakeStream, self).__init__(lines)
+        self.channel = FakeChannel(status)
+
+    def close(self):
+        pass
+
+
+class FakeTransport:
+    def __init__(self):
+        self.active = True
+
+    def is_active(self):
+        return self.active
+
+    def set_keepalive(self, interval):
+        pass
+
+
+class FakeSSHClient:
+    connects = []
+
+    def __init__(self):
+        self.transport = FakeTransport()
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, host, username=None, password=None, banner_timeout=None):
+        if host == "unreachable":
+            raise remoteexecutor.paramiko.SSHException("Unable to connect to {}".format(host))
+        FakeSSHClient.connects.append(host)
+        self.host = host
+
+    def get_transport(self):
+        return self.transport
+
+    def exec_command(self, command, get_pty=False, timeout=None):
+        lines = ["{} line {}".format(self.host, i) for i in range(1000)]
+        status = 1 if "fail" in command and self.host == "host_2" else 0
+        return FakeStream([]), FakeStream(lines, status), FakeStream([])
+
+    def close(self):
+        self.transport.active = False
+
+
+@pytest.fixture(autouse=True)
+def fake_ssh(monkeypatch):
+    FakeSSHClient.connects = []
+    monkeypatch.setattr(remoteexecutor.paramiko, "SSHClient", FakeSSHClient)
+    remoteexecutor.close_connections()
+    yield
+    remoteexecutor.close_connections()
+
+
+def test_connection_is_reused():
+    executor = RemoteExecutor("host_1")
+    status, stdout, _ = executor.execute("ls")
+    assert status == 0
+    assert len(stdout) == 1000
+
+    RemoteExecutor("host_1").must_execute("ls")
+    assert FakeSSHClient.connects == ["host_1"]
+
+    # A dropped connection is re-established
+    executor.client.get_transport().active = False
+    executor.execute("ls")
+    assert FakeSSHClient.connects == ["host_1", "host_1"]
+
+
+def test_execute_on_hosts_streams_to_files(tmpdir):
+    hosts = ["host_{}".format(i) for i in range(5)]
+    results = remoteexecutor.execute_on_hosts(hosts, "ls", str(tmpdir), max_lines=10)
+
+    for host in hosts:
+        status, stdout_tail, _ = results[host]
+        assert status == 0
+        assert stdout_tail == ["{} line {}".format(host, i) for i in range(990, 1000)]
+        assert len(tmpdir.join("{}.log".format(host)).readlines()) == 1000
+
+
+def test_must_execute_on_hosts_reports_failed_hosts(tmpdir):
+    with pytest.raises(RemoteCommandError) as e:
+        remoteexecutor.must_execute_on_hosts(["host_1", "host_2"], "fail", str(tmpdir))
+    assert "failed on hosts: ['host_2']" in str(e.value)
+
+
+def test_must_execute_on_hosts_reports_unreachable_hosts(tmpdir):
+    results = remoteexecutor.execute_on_hosts(["host_1", "unreachable", "host_2"], "fail", str(tmpdir))
+    assert results["host_1"][0] == 0
+    assert results["host_2"][0] == 1
+    assert isinstance(results["unreachable"], remoteexecutor.paramiko.SSHException)
+
+    with pytest.raises(RemoteCommandError) as e:
+        remoteexecutor.must_execute_on_hosts(["host_1", "unreachable", "host_2"], "fail", str(tmpdir))
+    assert "unreachable (Unable to connect to unreachable)" in str(e.value)
+    assert "host_2" in str(e.value)
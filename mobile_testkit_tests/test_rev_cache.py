@@ -0,0 +1,59 @@
+import pytest
+from libraries.testkit.rev_cache import RevCache
+
+
+def test_rev_cache_round_trip():
+    cache = RevCache()
+    cache["doc_0"] = "1-5a105e8b9d40e1329780d62ea2265d8a"
+    cache["doc_1"] = "3-ad0234829205b9033196ba818f7a872b"
+
+    assert cache["doc_0"] == "1-5a105e8b9d40e1329780d62ea2265d8a"
+    assert cache["doc_1"] == "3-ad0234829205b9033196ba818f7a872b"
+    assert cache.generation("doc_1") == 3
+    assert len(cache) == 2
+    assert set(cache.keys()) == {"doc_0", "doc_1"}
+
+
+def test_rev_cache_update_and_delete():
+    cache = RevCache()
+    cache["doc_0"] = "1-5a105e8b9d40e1329780d62ea2265d8a"
+    cache["doc_0"] = "2-8ad8757baa8564dc136c1e07507f4a98"
+    assert cache["doc_0"] == "2-8ad8757baa8564dc136c1e07507f4a98"
+
+    del cache["doc_0"]
+    assert "doc_0" not in cache
+    with pytest.raises(KeyError):
+        cache["doc_0"]
+
+    # Deleted rows are reused
+    cache["doc_1"] = "1-86985e105f79b95d6bc918fb45ec7727"
+    assert cache["doc_1"] == "1-86985e105f79b95d6bc918fb45ec7727"
+    assert len(cache) == 1
+
+
+def test_rev_cache_non_compact_revs():
+    cache = RevCache()
+    cache["doc_0"] = "1-abc"
+    cache["doc_1"] = "2-5A105E8B9D40E1329780D62EA2265D8A"
+    assert cache["doc_0"] == "1-abc"
+    assert cache["doc_1"] == "2-5A105E8B9D40E1329780D62EA2265D8A"
+    assert cache.generation("doc_0") == 1
+
+    # Compact rev replaces a non compact one
+    cache["doc_0"] = "2-5a105e8b9d40e1329780d62ea2265d8a"
+    assert cache["doc_0"] == "2-5a105e8b9d40e1329780d62ea2265d8a"
+
+
+def test_rev_cache_behaves_like_dict():
+    revs = {
+        "doc_0": "1-5a105e8b9d40e1329780d62ea2265d8a",
+        "doc_1": "1-ad0234829205b9033196ba818f7a872b",
+    }
+    cache = RevCache(revs)
+    assert cache == revs
+    assert {k: v for k, v in list(cache.items())} == revs
+
+    other = RevCache({"doc_1": "2-8ad8757baa8564dc136c1e07507f4a98"})
+    merged = RevCache.merge([cache, other])
+    assert merged["doc_0"] == "1-5a105e8b9d40e1329780d62ea2265d8a"
+    assert merged["doc_1"] == "2-8ad8757baa8564dc136c1e07507f4a98"
@@ -1,3 +1,6 @@
+import os
+import zipfile
+
 import pytest
 from keywords.exceptions import LogScanningError
 
@@ -103,3 +106,36 @@ def test_data_race_log():
 
     error_message = str(e.value)
     assert error_message.startswith("DATA RACE found!!")
+
+
+def test_empty_pattern_list():
+    scan_logs.scan_for_errors("mobile_testkit_tests/test_data/mock_panic_log.txt", [])
+
+
+def test_scan_log_files_in_zips(tmpdir):
+    with zipfile.ZipFile(str(tmpdir.join("sgcollect.zip")), "w") as zf:
+        zf.writestr("sgcollect/sg_info.log", "ok\nPANIC: boom\nWARNING: data race found\n")
+        zf.writestr("sgcollect/sg_debug.log", "ok\nok\n")
+        zf.writestr("sgcollect/sg_info.txt", "panic but not a log file\n")
+    tmpdir.join("sg_accel.log").write("Data Race\n")
+
+    result = scan_logs.scan_log_files([str(tmpdir)], ["panic", "data race", "race"], max_workers=2)
+
+    assert result.files_scanned == 3
+    assert dict(result.counts) == {"panic": 1, "data race": 2, "race": 2}
+    assert sorted((os.path.basename(hit.file), hit.line_number, hit.patterns) for hit in result.hits) == [
+        ("sg_accel.log", 1, ["data race", "race"]),
+        ("sg_info.log", 2, ["panic"]),
+        ("sg_info.log", 3, ["data race", "race"])
+    ]
+    # Logs are read from the zip, not extracted
+    assert not tmpdir.join("sgcollect").check()
+
+    with pytest.raises(LogScanningError):
+        scan_logs.scan_logs(str(tmpdir))
+
+
+def test_scan_log_files_clean():
+    result = scan_logs.scan_log_files("mobile_testkit_tests/test_data/mock_clean_log.txt", ["panic"], extension=".txt")
+    assert not result
+    assert result.files_scanned == 1
@@ -0,0 +1,136 @@
+import threading
+
+import pytest
+from couchbase.diagnostics import PingState
+from couchbase.exceptions import CouchbaseException
+
+from keywords import sdk_connections
+
+
+class FakePingResult:
+    endpoints = {"kv": [type("Report", (), {"state": PingState.OK})()]}
+
+
+class FakeCluster:
+    created = []
+
+    def __init__(self, url, options):
+        self.url = url
+        self.closed = False
+        self.healthy = True
+        FakeCluster.created.append(self)
+
+    def bucket(self, name):
+        return (self.url, name)
+
+    def ping(self):
+        if not self.healthy:
+            raise CouchbaseException(message="unreachable")
+        return FakePingResult()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_cluster(monkeypatch):
+    FakeCluster.created = []
+    monkeypatch.setattr(sdk_connections, "Cluster", FakeCluster)
+    yield
+    sdk_connections.close()
+
+
+def test_connection_url():
+    assert sdk_connections.connection_url("10.0.0.1") == "couchbase://10.0.0.1"
+    assert sdk_connections.connection_url("10.0.0.1", tls=True) == "couchbases://10.0.0.1?ssl=no_verify"
+    assert sdk_connections.connection_url("fe80::1", ipv6=True) == "couchbase://fe80::1?ipv6=allow"
+    assert sdk_connections.connection_url("fe80::1", tls=True, ipv6=True) == "couchbases://fe80::1?ssl=no_verify&ipv6=allow"
+
+
+def test_connections_are_shared():
+    url = sdk_connections.connection_url("10.0.0.1")
+    assert sdk_connections.get_bucket(url, "db") is sdk_connections.get_bucket(url, "db")
+    assert sdk_connections.get_cluster(url) is sdk_connections.get_cluster(url)
+    sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.1", tls=True))
+    assert len(FakeCluster.created) == 2
+
+
+def test_unhealthy_connection_is_replaced(monkeypatch):
+    url = sdk_connections.connection_url("10.0.0.1")
+    cluster = sdk_connections.get_cluster(url)
+    cluster.healthy = False
+
+    # Still within the health check interval
+    assert sdk_connections.get_cluster(url) is cluster
+
+    monkeypatch.setattr(sdk_connections, "HEALTH_CHECK_INTERVAL_SECS", 0)
+    cluster.healthy = True
+    assert sdk_connections.get_cluster(url) is cluster
+
+    cluster.healthy = False
+    replacement = sdk_connections.get_cluster(url)
+    assert replacement is not cluster
+    assert cluster.closed
+
+
+def test_close_by_host():
+    cluster_one = sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.1", tls=True))
+    cluster_two = sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.2"))
+
+    sdk_connections.close("10.0.0.1")
+    assert cluster_one.closed
+    assert not cluster_two.closed
+
+
+def test_slow_bootstrap_does_not_block_other_hosts(monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    class SlowCluster(FakeCluster):
+        def __init__(self, url, options):
+            if "10.0.0.9" in url:
+                started.set()
+                release.wait(5)
+            super().__init__(url, options)
+
+    monkeypatch.setattr(sdk_connections, "Cluster", SlowCluster)
+    slow = threading.Thread(target=sdk_connections.get_cluster, args=(sdk_connections.connection_url("10.0.0.9"),))
+    slow.start()
+    try:
+        assert started.wait(5)
+        # Bootstrapping 10.0.0.9 is still in progress
+        assert sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.1")).url == "couchbase://10.0.0.1"
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join()
+
+
+class FakeCluster3:
+    """ The 3.x SDK Cluster, which has disconnect() and no close() """
+
+    def __init__(self, url, options):
+        self.url = url
+        self.disconnected = False
+
+    def disconnect(self):
+        self.disconnected = True
+
+
+def test_close_3x_cluster(monkeypatch):
+    monkeypatch.setattr(sdk_connections, "Cluster", FakeCluster3)
+    cluster = sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.1"))
+
+    sdk_connections.close("10.0.0.1")
+    assert cluster.disconnected
+
+
+def test_close_errors_do_not_fail_cleanup(monkeypatch):
+    class BrokenCluster:
+        # Neither close() nor disconnect()
+        def __init__(self, url, options):
+            pass
+
+    monkeypatch.setattr(sdk_connections, "Cluster", BrokenCluster)
+    sdk_connections.get_cluster(sdk_connections.connection_url("10.0.0.1"))
+    sdk_connections.close()
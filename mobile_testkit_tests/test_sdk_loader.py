@@ -0,0 +1,154 @@
+import json
+import threading
+import time
+
+import concurrent.futures
+
+import pytest
+from couchbase.exceptions import CouchbaseException
+
+from keywords import sdk_loader
+from keywords.exceptions import CBServerError
+
+
+class FakeUpsertResult:
+    def __init__(self, exceptions):
+        self.exceptions = exceptions
+
+
+class FakeCollection:
+    def __init__(self, failing_ids=()):
+        self.docs = {}
+        self.xattrs = {}
+        self.failing_ids = set(failing_ids)
+        self._lock = threading.Lock()
+
+    def upsert_multi(self, batch):
+        exceptions = {}
+        with self._lock:
+            for doc_id, body in batch.items():
+                if doc_id in self.failing_ids:
+                    exceptions[doc_id] = CouchbaseException(message="temporary failure")
+                else:
+                    self.docs[doc_id] = body
+        return FakeUpsertResult(exceptions)
+
+    def mutate_in(self, doc_id, specs):
+        with self._lock:
+            self.xattrs[doc_id] = specs
+
+
+class FakeOperationResult:
+    def __init__(self, success):
+        self.success = success
+
+
+class FakeMultiMutationResult(dict):
+    """ The 3.x SDK result, a dict of per key results with only 'all_ok' """
+
+    @property
+    def all_ok(self):
+        return all(result.success for result in self.values())
+
+
+class FakeCollection3(FakeCollection):
+    """ upsert_multi like the 3.x SDK, which raises a CouchbaseException with a result per key
+    in 'all_results' if any key fails
+    """
+
+    def upsert_multi(self, batch):
+        result = FakeMultiMutationResult()
+        with self._lock:
+            for doc_id, body in batch.items():
+                if doc_id in self.failing_ids:
+                    result[doc_id] = FakeOperationResult(False)
+                else:
+                    self.docs[doc_id] = body
+                    result[doc_id] = FakeOperationResult(True)
+
+        if not result.all_ok:
+            e = CouchbaseException(message="multi upsert failed")
+            e.all_results = result
+            raise e
+        return result
+
+
+def test_load_generated_docs():
+    collection = FakeCollection()
+    docs = sdk_loader.generate_docs("doc", 1050, channels=["ABC"], prop_generator=lambda: {"foo": "bar"})
+    report = sdk_loader.load_docs(collection, docs, batch_size=100, max_in_flight=4)
+
+    assert report["docs"] == 1050
+    assert report["failed"] == 0
+    assert report["batch_latency_ms"]["p50"] <= report["batch_latency_ms"]["max"]
+    assert collection.docs["doc_1049"] == {"channels": ["ABC"], "foo": "bar"}
+
+
+def test_load_docs_from_file_with_xattrs(tmpdir):
+    corpus = tmpdir.join("docs.json")
+    corpus.write("\n".join(json.dumps({"_id": "doc_{}".format(i), "index": i}) for i in range(10)) + "\n")
+
+    collection = FakeCollection()
+    sdk_loader.load_docs(collection, sdk_loader.docs_from_file(str(corpus)), batch_size=3,
+                         xattr_key="channels", xattr_generator=lambda doc_id: ["ABC"])
+
+    assert collection.docs["doc_9"] == {"index": 9}
+    assert sorted(collection.xattrs) == sorted("doc_{}".format(i) for i in range(10))
+
+
+def test_load_docs_target_rate():
+    report = sdk_loader.load_docs(FakeCollection(), sdk_loader.generate_docs("doc", 50), batch_size=10, target_ops_per_sec=200)
+    # 40 docs are submitted after the first batch, at 200 docs/s that takes at least 0.2s
+    assert report["secs"] >= 0.2
+    assert report["docs"] == 50
+
+
+def test_load_docs_saturated_window_does_not_spin(monkeypatch):
+    class SlowCollection(FakeCollection):
+        def upsert_multi(self, batch):
+            time.sleep(0.2)
+            return super().upsert_multi(batch)
+
+    wait = concurrent.futures.wait
+    wait_calls = []
+
+    def counting_wait(*args, **kwargs):
+        wait_calls.append(kwargs.get("timeout"))
+        return wait(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "wait", counting_wait)
+    # The target rate is far above what the slow upserts achieve, so the window stays full
+    report = sdk_loader.load_docs(SlowCollection(), sdk_loader.generate_docs("doc", 60), batch_size=10,
+                                  max_in_flight=2, target_ops_per_sec=1000)
+
+    assert report["docs"] == 60
+    # About one wake up per completed batch (6 batches), not a poll loop
+    assert len(wait_calls) <= 12
+    assert all(timeout is None or timeout > 0 for timeout in wait_calls)
+
+
+def test_load_docs_reports_failures():
+    collection = FakeCollection(failing_ids=["doc_3"])
+    with pytest.raises(CBServerError) as e:
+        sdk_loader.load_docs(collection, sdk_loader.generate_docs("doc", 10), batch_size=4)
+    assert "doc_3" in str(e.value)
+    assert len(collection.docs) == 9
+
+
+def test_load_docs_3x_results():
+    collection = FakeCollection3()
+    report = sdk_loader.load_docs(collection, sdk_loader.generate_docs("doc", 25), batch_size=10,
+                                  xattr_key="channels", xattr_generator=lambda doc_id: ["ABC"])
+    assert report["docs"] == 25
+    assert len(collection.xattrs) == 25
+
+
+def test_load_docs_3x_reports_failures():
+    collection = FakeCollection3(failing_ids=["doc_3"])
+    with pytest.raises(CBServerError) as e:
+        sdk_loader.load_docs(collection, sdk_loader.generate_docs("doc", 10), batch_size=4,
+                             xattr_key="channels", xattr_generator=lambda doc_id: ["ABC"])
+    assert "Failed to load 1 docs" in str(e.value)
+    assert "doc_3" in str(e.value)
+    assert len(collection.docs) == 9
+    assert "doc_3" not in collection.xattrs
@@ -0,0 +1,173 @@
+import sys
+import threading
+
+import pytest
+from couchbase.exceptions import CouchbaseException, DocumentNotFoundException
+
+from keywords import server_docs
+from keywords.exceptions import CBServerError
+
+
+class FakeScanRow:
+    def __init__(self, doc_id):
+        self.id = doc_id
+
+
+class FakeRemoveResult:
+    def __init__(self, exceptions):
+        self.exceptions = exceptions
+
+
+class FakeCollection:
+    def __init__(self, doc_ids, range_scan=True, failing_ids=()):
+        self.doc_ids = set(doc_ids)
+        self.range_scan = range_scan
+        self.failing_ids = set(failing_ids)
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def scan(self, scan_type, options):
+        if not self.range_scan:
+            def unsupported():
+                raise CouchbaseException(message="range scan not supported")
+                yield
+            return unsupported()
+        return (FakeScanRow(doc_id) for doc_id in sorted(self.doc_ids) if doc_id.startswith(scan_type.prefix))
+
+    def remove_multi(self, batch):
+        exceptions = {}
+        with self._lock:
+            self.batch_sizes.append(len(batch))
+            for doc_id in batch:
+                if doc_id in self.failing_ids:
+                    exceptions[doc_id] = CouchbaseException(message="temporary failure")
+                elif doc_id in self.doc_ids:
+                    self.doc_ids.remove(doc_id)
+                else:
+                    exceptions[doc_id] = DocumentNotFoundException(message="not found")
+        return FakeRemoveResult(exceptions)
+
+    def remove(self, doc_id):
+        with self._lock:
+            if doc_id in self.failing_ids:
+                raise CouchbaseException(message="temporary failure")
+            if doc_id not in self.doc_ids:
+                raise DocumentNotFoundException(message="not found")
+            self.doc_ids.remove(doc_id)
+
+
+class FakeOperationResult:
+    def __init__(self, success):
+        self.success = success
+
+
+class FakeCollection3(FakeCollection):
+    """ Multi ops like the 3.x SDK: a dict result on success, and on any failure a raised
+    CouchbaseException with a result per key in 'all_results'
+    """
+
+    def remove_multi(self, batch):
+        all_results = {}
+        with self._lock:
+            self.batch_sizes.append(len(batch))
+            for doc_id in batch:
+                if doc_id in self.doc_ids and doc_id not in self.failing_ids:
+                    self.doc_ids.remove(doc_id)
+                    all_results[doc_id] = FakeOperationResult(True)
+                else:
+                    all_results[doc_id] = FakeOperationResult(False)
+
+        if all(result.success for result in all_results.values()):
+            return all_results
+        e = CouchbaseException(message="multi remove failed")
+        e.all_results = all_results
+        raise e
+
+
+class FakeCluster:
+    def __init__(self, doc_ids):
+        self.doc_ids = doc_ids
+        self.statements = []
+
+    def query(self, statement, options=None):
+        self.statements.append(statement)
+        return sorted(self.doc_ids)
+
+
+@pytest.fixture(autouse=True)
+def no_index_creation(monkeypatch):
+    class FakeIndexManager:
+        def __init__(self, cluster):
+            pass
+
+        def create_primary_index(self, bucket_name, ignore_exists=False):
+            pass
+
+    monkeypatch.setattr(server_docs, "QueryIndexManager", FakeIndexManager)
+
+
+DOC_IDS = ["_sync:rev:doc_0:1-abc", "_sync:rev:doc_1:1-def", "_sync:seq", "doc_0", "doc_1"]
+
+
+def test_prefix_upper_bound():
+    assert server_docs._prefix_upper_bound("_sync:rev") == "_sync:rew"
+    assert "_sync:rev:zzz" < server_docs._prefix_upper_bound("_sync:rev")
+
+
+def test_scan_doc_ids_range_scan():
+    collection = FakeCollection(DOC_IDS)
+    cluster = FakeCluster(DOC_IDS)
+    assert list(server_docs.scan_doc_ids(cluster, collection, "db", "_sync:rev")) == DOC_IDS[:2]
+    assert cluster.statements == []
+
+
+def test_scan_doc_ids_falls_back_to_query():
+    collection = FakeCollection(DOC_IDS, range_scan=False)
+    cluster = FakeCluster(DOC_IDS)
+    # Query returns the id range, anything outside the prefix is still filtered out
+    assert list(server_docs.scan_doc_ids(cluster, collection, "db", "_sync:rev")) == DOC_IDS[:2]
+    assert "WHERE meta().id >= $start AND meta().id < $end" in cluster.statements[0]
+
+
+def test_scan_doc_ids_without_range_scan_sdk(monkeypatch):
+    # The 3.x SDK has no couchbase.kv_range_scan
+    monkeypatch.setitem(sys.modules, "couchbase.kv_range_scan", None)
+    cluster = FakeCluster(DOC_IDS)
+    assert list(server_docs.scan_doc_ids(cluster, FakeCollection(DOC_IDS), "db", "_sync:rev")) == DOC_IDS[:2]
+    assert len(cluster.statements) == 1
+
+
+def test_delete_docs_in_batches():
+    doc_ids = ["doc_{}".format(i) for i in range(25)]
+    collection = FakeCollection(doc_ids)
+
+    # Docs that are already gone are not an error
+    assert server_docs.delete_docs(collection, iter(doc_ids + ["missing"]), batch_size=10, max_in_flight=2) == 26
+    assert collection.doc_ids == set()
+    assert sorted(collection.batch_sizes) == [6, 10, 10]
+
+
+def test_delete_docs_reports_failures():
+    collection = FakeCollection(["doc_0", "doc_1"], failing_ids=["doc_1"])
+    with pytest.raises(CBServerError) as e:
+        server_docs.delete_docs(collection, ["doc_0", "doc_1"], batch_size=1)
+    assert "doc_1" in str(e.value)
+    assert collection.doc_ids == {"doc_1"}
+
+
+def test_delete_docs_3x_results():
+    doc_ids = ["doc_{}".format(i) for i in range(25)]
+    collection = FakeCollection3(doc_ids)
+
+    # Missing docs make the 3.x multi op raise, but are still not an error
+    assert server_docs.delete_docs(collection, iter(doc_ids + ["missing"]), batch_size=10, max_in_flight=2) == 26
+    assert collection.doc_ids == set()
+
+
+def test_delete_docs_3x_reports_failures():
+    collection = FakeCollection3(["doc_0", "doc_1", "doc_2"], failing_ids=["doc_1"])
+    with pytest.raises(CBServerError) as e:
+        server_docs.delete_docs(collection, ["doc_0", "doc_1", "doc_2", "missing"], batch_size=4)
+    assert "doc_1" in str(e.value)
+    assert "missing" not in str(e.value)
+    assert collection.doc_ids == {"doc_1"}
@@ -0,0 +1,62 @@
+from keywords import transport
+from libraries.testkit import settings
+
+
+def test_sessions_share_pools():
+    session_one = transport.new_session(headers={"Content-Type": "application/json"})
+    session_two = transport.new_session(auth=("user", "pass"), verify=False)
+
+    assert session_one.get_adapter("http://sg:4984") is session_two.get_adapter("https://sg:4985")
+    assert session_one.headers["Content-Type"] == "application/json"
+    assert session_two.auth == ("user", "pass")
+    assert session_two.verify is False
+    assert session_one.auth is None
+
+
+def test_session_close_keeps_shared_pools():
+    session = transport.new_session()
+    adapter = session.get_adapter("http://sg:4984")
+    pool = adapter.poolmanager.connection_from_url("http://sg:4984")
+    session.close()
+    assert adapter.poolmanager.connection_from_url("http://sg:4984") is pool
+
+
+def test_configure_resizes_pools(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_POOL_MAXSIZE", settings.HTTP_POOL_MAXSIZE)
+    monkeypatch.setattr(settings, "HTTP_POOL_CONNECTIONS", settings.HTTP_POOL_CONNECTIONS)
+
+    session = transport.new_session()
+    old_adapter = session.get_adapter("http://sg:4984")
+
+    transport.configure(pool_maxsize=7)
+    new_adapter = session.get_adapter("http://sg:4984")
+    assert new_adapter is not old_adapter
+    assert new_adapter._pool_maxsize == 7
+    assert transport.new_session().get_adapter("http://sg:4984") is new_adapter
+
+    transport.configure(pool_maxsize=settings.MAX_REQUEST_WORKERS)
+
+
+def test_feed_sessions_have_their_own_pools(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_FEED_POOL_MAXSIZE", settings.HTTP_FEED_POOL_MAXSIZE)
+
+    session = transport.new_session()
+    feed_session = transport.new_session(feed=True)
+    feed_adapter = feed_session.get_adapter("http://sg:4984")
+    assert feed_adapter is not session.get_adapter("http://sg:4984")
+    assert feed_adapter is transport.new_session(feed=True).get_adapter("http://sg:4984")
+    assert feed_adapter._pool_maxsize == settings.HTTP_FEED_POOL_MAXSIZE
+
+    transport.configure(feed_pool_maxsize=3)
+    assert feed_session.get_adapter("http://sg:4984")._pool_maxsize == 3
+    assert session.get_adapter("http://sg:4984")._pool_maxsize == settings.HTTP_POOL_MAXSIZE
+
+    transport.close()
+    assert feed_session.get_adapter("http://sg:4984") is not feed_adapter
+
+
+def test_default_session_does_not_keep_cookies():
+    session = transport._get_default_session()
+    # No domain is allowed to set cookies, so responses never add to the jar
+    assert session.cookies.get_policy().allowed_domains() == ()
+    assert transport._get_default_session() is session
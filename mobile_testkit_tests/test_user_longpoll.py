@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from keywords.exceptions import ChangesError
+from libraries.testkit.user import User
+
+
+class FakeTarget:
+    url = "http://localhost:4984"
+
+
+class FakeRequest:
+    method = "POST"
+    url = "http://localhost:4984/db/_changes"
+    headers = {}
+
+    def __init__(self, body):
+        self.body = body
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, obj, body):
+        self._obj = obj
+        self.request = FakeRequest(body)
+
+    def json(self):
+        return self._obj
+
+
+def longpoll_user(responses):
+    """ User whose longpoll requests are answered, in order, by 'responses' """
+    user = User(FakeTarget(), "db", "seth", "password", ["ABC"])
+    responses = list(responses)
+    requests_made = []
+
+    def post(url, data=None):
+        requests_made.append(json.loads(data))
+        return FakeResponse(responses.pop(0), data)
+
+    user._feed_session.post = post
+    return user, requests_made
+
+
+def change(doc_id, rev, leaf_revs=None):
+    leaf_revs = leaf_revs or [rev]
+    return {"seq": 1, "id": doc_id, "changes": [{"rev": leaf} for leaf in leaf_revs], "doc": {"_id": doc_id, "_rev": rev}}
+
+
+def test_longpoll_tracking_until_termination_doc():
+    user, requests_made = longpoll_user([
+        {"results": [{"seq": 1, "id": "_user/seth", "changes": []}, change("doc_0", "1-a")], "last_seq": "2"},
+        {"results": [change("doc_0", "2-b"), change("doc_1", "1-c")], "last_seq": "4"},
+        {"results": [change("killpolling", "1-d")], "last_seq": "5"}
+    ])
+
+    docs, last_seq = user.start_longpoll_changes_tracking(termination_doc_id="killpolling", check_rev_history=True)
+
+    assert docs == {"doc_0": "2-b", "doc_1": "1-c"}
+    assert last_seq == "5"
+    assert [request["since"] for request in requests_made] == ["0", "2", "4"]
+    assert all(request["style"] == "all_docs" for request in requests_made)
+
+
+def test_longpoll_tracking_rev_history_errors():
+    user, _ = longpoll_user([
+        {"results": [change("doc_0", "2-b")], "last_seq": "2"},
+        {"results": [change("doc_0", "1-a", leaf_revs=["2-b"])], "last_seq": "3"},
+        {"results": [change("killpolling", "1-d")], "last_seq": "4"}
+    ])
+
+    with pytest.raises(ChangesError):
+        user.start_longpoll_changes_tracking(termination_doc_id="killpolling", check_rev_history=True)
+
+
+def test_longpoll_tracking_rev_history_requires_all_docs():
+    user, _ = longpoll_user([])
+    with pytest.raises(ValueError):
+        user.start_longpoll_changes_tracking(style=None, check_rev_history=True)
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from keywords.exceptions import ChangesError
+from libraries.testkit import verify
+from libraries.testkit.rev_cache import RevCache
+from libraries.testkit.user import User
+
+
+class FakeTarget:
+    url = "http://localhost:4984"
+
+
+class FakeResponse:
+    def __init__(self, lines):
+        self.url = "http://localhost:4984/db/_changes"
+        self._lines = lines
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        pass
+
+
+def make_user(results):
+    """ Builds a User whose _changes feed is served in the line oriented Sync Gateway layout """
+    user = User(FakeTarget(), "db", "seth", "password", ["ABC"])
+    lines = [b'{"results":[']
+    for i, result in enumerate(results):
+        prefix = b"," if i > 0 else b""
+        lines.append(prefix + json.dumps(result).encode())
+    lines.append(b'],')
+    lines.append(b'"last_seq":"10"}')
+    user._session.post = lambda *args, **kwargs: FakeResponse(lines)
+    return user
+
+
+def change(doc_id, rev, updates=0, removed=None):
+    doc = {"_id": doc_id, "_rev": rev, "updates": updates}
+    if removed is not None:
+        doc["_removed"] = removed
+    return {"seq": 1, "id": doc_id, "changes": [{"rev": rev}], "doc": doc}
+
+
+def test_iter_changes_streams_results():
+    user = make_user([
+        {"seq": 1, "id": "_user/seth", "changes": []},
+        change("doc_0", "1-a"),
+        change("doc_1", "1-b")
+    ])
+    ids = [result["id"] for result in user.iter_changes()]
+    assert ids == ["_user/seth", "doc_0", "doc_1"]
+
+
+def test_iter_changes_single_line_body():
+    user = make_user([])
+    body = json.dumps({"results": [change("doc_0", "1-a")], "last_seq": "1"}).encode()
+    user._session.post = lambda *args, **kwargs: FakeResponse([body])
+    assert [result["id"] for result in user.iter_changes()] == ["doc_0"]
+
+
+def test_iter_changes_raises_on_unparsable_entry():
+    user = make_user([change("doc_0", "1-a")])
+    lines = [b'{"results":[', json.dumps(change("doc_0", "1-a")).encode(), b',{"seq":2,"id":"doc_1","chan', b'],', b'"last_seq":"10"}']
+    user._session.post = lambda *args, **kwargs: FakeResponse(lines)
+
+    with pytest.raises(ChangesError) as e:
+        list(user.iter_changes())
+    assert '{"seq":2,"id":"doc_1","chan' in str(e.value)
+
+
+def test_verify_changes():
+    expected_docs = RevCache({"doc_0": "2-a", "doc_1": "2-b"})
+    users = [
+        make_user([change("doc_0", "2-a", updates=1), change("doc_1", "2-b", updates=1)]),
+        make_user([change("doc_1", "2-b", updates=1), change("doc_0", "2-a", updates=1)])
+    ]
+    errors = verify.verify_changes(users, expected_num_docs=2, expected_num_revisions=1, expected_docs=expected_docs)
+    assert errors["invalid_rev_id"] == 0
+
+
+def test_verify_changes_reports_samples():
+    expected_docs = {"doc_0": "1-a", "doc_1": "1-b"}
+    user = make_user([change("doc_0", "1-x"), change("doc_0", "1-x"), change("doc_2", "1-c")])
+    with pytest.raises(AssertionError) as e:
+        verify.verify_changes(user, expected_num_docs=2, expected_num_revisions=0, expected_docs=expected_docs)
+    message = str(e.value)
+    assert "'duplicate_changes_doc_ids': ['doc_0']" in message
+    assert "'invalid_rev_id': ['doc_0']" in message
+    assert "'expected_doc_ids_differ_from_changes_doc_ids': ['doc_2', 'doc_1']" in message
+
+
+def test_verify_docs_removed():
+    expected_docs = {"doc_0": "2-a", "doc_1": "2-b"}
+    user = make_user([change("doc_0", "2-a", removed=True), change("doc_1", "2-b", removed=True)])
+    errors = verify.verify_docs_removed(user, expected_num_docs=2, expected_docs=expected_docs)
+    assert errors["doc_not_removed"] == 0
+
+    user = make_user([change("doc_0", "2-a", removed=True), change("doc_1", "2-b")])
+    with pytest.raises(AssertionError):
+        verify.verify_docs_removed(user, expected_num_docs=2, expected_docs=expected_docs)
@@ -316,8 +316,6 @@ def params_from_base_suite_setup(request):
         n1ql_query = 'create primary index on {}'.format(enable_sample_bucket)
         sdk_client.query(n1ql_query)
     if prometheus_enable:
-        if not prometheus.is_prometheus_installed():
-            prometheus.install_prometheus()
         prometheus.start_prometheus(sg_ip, sg_ssl, need_sgw_admin_auth)
 
     yield {
@@ -347,8 +347,6 @@ def params_from_base_suite_setup(request):
         log_info("Stopping replication")
         repl_obj.stop(repl)
     if prometheus_enable:
-        if not prometheus.is_prometheus_installed:
-            prometheus.install_prometheus
         prometheus.start_prometheus(sg_ip, sg_ssl, need_sgw_admin_auth)
 
     yield {
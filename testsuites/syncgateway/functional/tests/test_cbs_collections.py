@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from keywords.ClusterKeywords import ClusterKeywords
@@ -6,6 +8,7 @@ from keywords.SyncGateway import sync_gateway_config_path_for_mode
 
 from keywords import couchbaseserver
 from keywords import document
+from keywords import import_monitor
 from libraries.testkit.cluster import Cluster
 from keywords.utils import host_for_url, log_info
 from keywords.remoteexecutor import RemoteExecutor
@@ -15,6 +18,9 @@ from utilities.cluster_config_utils import get_cluster
 from utilities.cluster_config_utils import load_cluster_config_json
 from keywords.constants import RBAC_FULL_ADMIN
 
+# How long to check that docs written to a user defined collection are not imported
+USER_COLLECTION_IMPORT_CHECK_SECS = 5
+
 
 @pytest.mark.syncgateway
 @pytest.mark.collections
@@ -75,19 +81,30 @@ def test_userdefind_collections(params_from_base_test_setup):
     else:
         connection_url = "couchbase://{}".format(cbs_ip)
     sdk_client = get_cluster(connection_url, bucket)
+    auth = need_sgw_admin_auth and (RBAC_FULL_ADMIN['user'], RBAC_FULL_ADMIN['pwd']) or None
+    import_count = import_monitor.import_counts(sg_client.get_expvars(sg_admin_url, auth=auth), [sg_db])[sg_db]
     sdk_doc_bodies = document.create_docs('sdk_default', number=num_sdk_docs, channels=channels)
     sdk_docs = {doc['_id']: doc for doc in sdk_doc_bodies}
     sdk_client.upsert_multi(sdk_docs)
 
+    # 3. Verify docs created in default collections are imported to SGW
+    wait_until_docs_imported_from_server(sg_admin_url, sg_client, sg_db, num_sdk_docs, import_count, auth=auth)
+
     # 2. Create docs via sdk using user defined collections
     scope = cb_server.create_scope(bucket)
     collection = cb_server.create_collection(bucket, scope)
     collection_id = cb_server.get_collection_id(bucket, scope, collection)
-    auth = need_sgw_admin_auth and (RBAC_FULL_ADMIN['user'], RBAC_FULL_ADMIN['pwd']) or None
-    sg_expvars = sg_client.get_expvars(sg_admin_url, auth=auth)
-    import_count = sg_expvars["syncgateway"]["per_db"][sg_db]["shared_bucket_import"]["import_count"]
+    import_count = import_monitor.import_counts(sg_client.get_expvars(sg_admin_url, auth=auth), [sg_db])[sg_db]
     remote_executor.execute("/opt/couchbase/bin/cbworkloadgen -n localhost:8091 -i {} -b {} -j -c 0x{} -u Administrator -p password".format(num_sdk_docs, bucket, collection_id))
-    wait_until_docs_imported_from_server(sg_admin_url, sg_client, sg_db, num_sdk_docs, import_count, auth=auth)
+
+    # 4. Verify docs created in user defined collections will not get imported to SGW.
+    # Nothing should be imported, so watch the import count for a bounded time instead of waiting for it to move.
+    deadline = time.time() + USER_COLLECTION_IMPORT_CHECK_SECS
+    while time.time() < deadline:
+        current_count = import_monitor.import_counts(sg_client.get_expvars(sg_admin_url, auth=auth), [sg_db])[sg_db]
+        assert current_count == import_count, "user defined collection docs are imported to sync gateway"
+        time.sleep(1)
+
     sg_docs = sg_client.get_all_docs(url=sg_admin_url, db=sg_db, auth=auth)["rows"]
     assert sum("sdk_default" in s["id"] for s in sg_docs) == num_sdk_docs, "default collections docs are not imported to sync gateway"
-    assert sum("pymc" in s for s in sg_docs) == 0, "user defined docs are imported to sync gateway"
+    assert sum("pymc" in s["id"] for s in sg_docs) == 0, "user defined docs are imported to sync gateway"
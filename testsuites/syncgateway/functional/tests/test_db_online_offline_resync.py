@@ -9,6 +9,7 @@ from libraries.testkit.admin import Admin
 from multiprocessing.pool import ThreadPool
 from requests.exceptions import HTTPError
 from libraries.testkit.parallelize import in_parallel
+from libraries.testkit.rev_cache import RevCache
 from requests.auth import HTTPBasicAuth
 from keywords.constants import RBAC_FULL_ADMIN
 
@@ -171,7 +172,7 @@ def test_bucket_online_offline_resync_sanity(params_from_base_test_setup, sg_con
     for user in user_objects:
         global_cache.append(user.cache)
 
-    all_docs = {k: v for user_cache in global_cache for k, v in list(user_cache.items())}
+    all_docs = RevCache.merge(global_cache)
 
     verify_changes(user_x, expected_num_docs=expected_docs, expected_num_revisions=num_revisions, expected_docs=all_docs)
 
@@ -362,7 +363,7 @@ def test_bucket_online_offline_resync_with_online(params_from_base_test_setup, s
     for user in user_objects:
         global_cache.append(user.cache)
 
-    all_docs = {k: v for user_cache in global_cache for k, v in list(user_cache.items())}
+    all_docs = RevCache.merge(global_cache)
 
     verify_changes(user_x, expected_num_docs=expected_docs, expected_num_revisions=num_revisions, expected_docs=all_docs)
 
@@ -550,7 +551,7 @@ def test_bucket_online_offline_resync_with_offline(params_from_base_test_setup,
     for user in user_objects:
         global_cache.append(user.cache)
 
-    all_docs = {k: v for user_cache in global_cache for k, v in list(user_cache.items())}
+    all_docs = RevCache.merge(global_cache)
 
     verify_changes(user_x, expected_num_docs=expected_docs, expected_num_revisions=num_revisions, expected_docs=all_docs)
 
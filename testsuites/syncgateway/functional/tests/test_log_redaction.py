@@ -2,10 +2,8 @@ import os
 import shutil
 import time
 import subprocess
-import re
 import pytest
 
-from subprocess import Popen, PIPE
 from keywords.ClusterKeywords import ClusterKeywords
 from keywords.exceptions import LogScanningError, CollectionError
 from keywords.SyncGateway import sync_gateway_config_path_for_mode, get_sync_gateway_version
@@ -14,7 +12,8 @@ from keywords.utils import log_info, host_for_url
 from libraries.testkit.cluster import Cluster
 from utilities.cluster_config_utils import load_cluster_config_json
 from utilities.cluster_config_utils import persist_cluster_config_environment_prop, copy_to_temp_conf
-from utilities.scan_logs import scan_for_pattern, unzip_log_files
+from utilities.scan_logs import scan_for_pattern, scan_log_files, unzip_log_files
+from utilities.log_redaction import RedactionIndex, verify_pattern_redacted, verify_ud_tags_redacted
 from keywords.MobileRestClient import MobileRestClient
 from keywords import document, attachment
 from libraries.provision.ansible_runner import AnsibleRunner
@@ -501,9 +500,8 @@ def verify_log_redaction(cluster_config, log_redaction_level, mode):
                     assert False, str(le)
 
     # verify starting and ending ud tags are equal
-    num_ud_tags = subprocess.check_output("find {} -name '*.log' | xargs grep '<ud>' | wc -l".format(temp_log_path), shell=True)
-    num_end_ud_tags = subprocess.check_output("find {} -name '*.log' | xargs grep '</ud>' | wc -l".format(temp_log_path), shell=True)
-    assert num_ud_tags == num_end_ud_tags, "There is a mismatch of ud tags"
+    ud_tag_counts = scan_log_files([temp_log_path], ["<ud>", "</ud>"]).counts
+    assert ud_tag_counts["<ud>"] == ud_tag_counts["</ud>"], "There is a mismatch of ud tags"
     shutil.rmtree(temp_log_path)
 
 
@@ -556,66 +554,6 @@ def pull_redacted_zip_file(cluster_config, sg_platform, output_dir=None, sa_outp
         raise CollectionError("Could not pull logs")
 
 
-def verify_pattern_redacted(zip_file_name, pattern):
-    if os.path.isdir("/tmp/sg_redaction_logs"):
-        redacted_zip_file = zip_file_name
-        command = "zipgrep -h -o \"" + pattern + "\" " + redacted_zip_file
-        p = Popen(command, shell=True, stdout=PIPE, stderr=PIPE)
-        output, error = p.communicate()
-        assert len(output) == 0, pattern + " did not redacted "
-
-
-def verify_udTags_in_zippedFile(zip_file_name):
-    if os.path.isdir("/tmp/sg_redaction_logs"):
-        non_redacted_zip_file = "/tmp/sg_redaction_logs/sg1/{}.zip".format(zip_file_name)
-        command = "zipgrep -n -o \"<ud>.+</ud>\" " + non_redacted_zip_file + r" | cut -f2 -d/ | cut -f1 -d\<"
-        line_num_output = subprocess.check_output(command, shell=True)
-        ln_output_list = line_num_output.splitlines()
-        command = "zipgrep -h -o \"<ud>.+</ud>\" " + non_redacted_zip_file
-        ud_output = subprocess.check_output(command, shell=True, stderr=subprocess.STDOUT)
-        ud_output_list = ud_output.splitlines()
-        if len(line_num_output) == 0 and len(ud_output) == 0:
-            assert False, "No user data tags found in " + non_redacted_zip_file
-        nonredact_dict = dict(list(zip(ln_output_list, ud_output_list)))
-
-        redacted_zip_file = "/tmp/sg_redaction_logs/sg1/{}-redacted.zip".format(zip_file_name)
-        command = "zipgrep -n -o \"<ud>.+</ud>\" " + redacted_zip_file + r" | cut -f2 -d/ | cut -f1 -d\<"
-
-        line_num_output = subprocess.check_output(command, shell=True)
-        ln_output_list = line_num_output.splitlines()
-        command = "zipgrep -h -o \"<ud>.+</ud>\" " + redacted_zip_file
-        ud_output = subprocess.check_output(command, shell=True)
-        ud_output_list = ud_output.splitlines()
-        if len(line_num_output) == 0 and len(ud_output) == 0:
-            assert False, "No user data tags found in " + redacted_zip_file
-        redact_dict = dict(list(zip(ln_output_list, ud_output_list)))
-        if len(list(nonredact_dict.items())) != len(list(redact_dict.items())):
-            assert False, "User tags count mismatch between redacted and non-redacted files"
-
-        for key, value in list(redact_dict.items()):
-            redact_match = re.search("<ud>.+</ud>", value.decode('ascii'))
-            if redact_match:
-                redact_content = redact_match.group(0)
-            else:
-                assert False, "Line: " + key + "Value: " + value + " did not match <ud>.+</ud> regex"
-            if re.search("[a-f0-9]{40}", redact_content):
-                continue
-            else:
-                assert False, "Hashing failed for Line: " + key
-
-
-def verify_saltvalue_in_redacted_zip_file(zip_file_name, salt_value):
-    if os.path.isdir("/tmp/sg_redaction_logs"):
-
-        redacted_zip_file = "/tmp/sg_redaction_logs/sg1/{}-redacted.zip".format(zip_file_name)
-        zipgrep_command = "zipgrep -n -o \"{}\" ".format(salt_value)
-        command = zipgrep_command + redacted_zip_file + r" | cut -f2 -d/ | cut -f1 -d\<"
-
-        line_num_output = subprocess.check_output(command, shell=True)
-        ln_output_list = line_num_output.splitlines()
-        assert len(ln_output_list) == 0, "salt value shows up in the log files{}".format(line_num_output)
-
-
 def log_verification_withsgCollect(redaction_level, user, password, zip_file_name=None, redaction_salt=None):
     if zip_file_name is None:
         if redaction_level is None:
@@ -630,11 +568,18 @@ def log_verification_withsgCollect(redaction_level, user, password, zip_file_nam
     nonredacted_file_name = "/tmp/sg_redaction_logs/sg1/{}.zip".format(zip_file_name)
     if redaction_level == "partial":
         assert os.path.isfile(redacted_file_name), "redacted file is not generated"
-        verify_udTags_in_zippedFile(zip_file_name)
-        verify_pattern_redacted(redacted_file_name, user)
-        verify_pattern_redacted(redacted_file_name, password)
+        patterns = [user, password]
         if redaction_salt is not None:
-            verify_saltvalue_in_redacted_zip_file(zip_file_name, redaction_salt)
+            patterns.append(redaction_salt)
+        # Read each zip once, then run every check against the indexes
+        plain_index = RedactionIndex(nonredacted_file_name)
+        redacted_index = RedactionIndex(redacted_file_name, patterns=patterns)
+        try:
+            verify_ud_tags_redacted(plain_index, redacted_index)
+            for pattern in patterns:
+                verify_pattern_redacted(redacted_index, pattern)
+        except LogScanningError as e:
+            assert False, str(e)
     else:
         assert not os.path.isfile(redacted_file_name), "redacted file is generated for redaction level None"
     assert os.path.isfile(nonredacted_file_name), "non redacted zip file is not generated"
@@ -6,6 +6,7 @@ from requests.auth import HTTPBasicAuth
 from libraries.testkit.admin import Admin
 from libraries.testkit.cluster import Cluster
 from libraries.testkit.verify import verify_changes
+from libraries.testkit.rev_cache import RevCache
 
 from keywords.constants import RBAC_FULL_ADMIN
 from keywords.SyncGateway import sync_gateway_config_path_for_mode
@@ -68,8 +69,8 @@ def test_multiple_db_unique_data_bucket_unique_index_bucket(params_from_base_tes
     time.sleep(10)
 
     # Build expected docs
-    db_cache_docs = {k: v for user in db_one_users for k, v in list(user.cache.items())}
-    db2_cache_docs = {k: v for user in db_two_users for k, v in list(user.cache.items())}
+    db_cache_docs = RevCache.merge(user.cache for user in db_one_users)
+    db2_cache_docs = RevCache.merge(user.cache for user in db_two_users)
 
     verify_changes(db_one_users, expected_num_docs=num_docs_per_user * num_db_users, expected_num_revisions=0, expected_docs=db_cache_docs)
     verify_changes(db_two_users, expected_num_docs=num_docs_per_user * num_db2_users, expected_num_revisions=0, expected_docs=db2_cache_docs)
@@ -139,7 +140,7 @@ def test_multiple_db_single_data_bucket_single_index_bucket(params_from_base_tes
     time.sleep(10)
 
     # Get list of all docs from users caches
-    cached_docs_from_all_users = {k: v for user in all_users for k, v in list(user.cache.items())}
+    cached_docs_from_all_users = RevCache.merge(user.cache for user in all_users)
 
     # Verify each user has all of the docs
     verify_changes(all_users, expected_num_docs=(num_users * 2) * num_docs_per_user, expected_num_revisions=0, expected_docs=cached_docs_from_all_users)
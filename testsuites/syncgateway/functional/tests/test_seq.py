@@ -5,6 +5,7 @@ import pytest
 from libraries.testkit.admin import Admin
 from libraries.testkit.cluster import Cluster
 from libraries.testkit.verify import verify_changes
+from libraries.testkit.rev_cache import RevCache
 from requests import Session
 from keywords.SyncGateway import sync_gateway_config_path_for_mode
 from keywords.utils import log_info
@@ -105,7 +106,7 @@ def test_seq(params_from_base_test_setup, sg_conf_name, num_users, num_docs, num
             raise ValueError("Unsupported 'mode' !!")
 
     all_doc_caches = [user.cache for user in users]
-    all_docs = {k: v for cache in all_doc_caches for k, v in list(cache.items())}
+    all_docs = RevCache.merge(all_doc_caches)
     verify_changes(users, expected_num_docs=num_users * num_docs, expected_num_revisions=num_revisions, expected_docs=all_docs)
 
 
@@ -8,6 +8,7 @@ from libraries.testkit.cluster import Cluster
 from libraries.testkit.verify import verify_changes
 from libraries.testkit.verify import verify_same_docs
 from libraries.testkit.verify import verify_docs_removed
+from libraries.testkit.rev_cache import RevCache
 from keywords.MobileRestClient import MobileRestClient
 from libraries.data import doc_generators
 from requests.exceptions import HTTPError
@@ -97,7 +98,7 @@ def test_issue_1524(params_from_base_test_setup, sg_conf_name, num_docs):
     log_info("Verifying 'user_no_channels' has same docs as 'a_doc_pusher' + access_doc")
 
     # One off changes verification will include the termination doc
-    expected_docs = {k: v for cache in [a_doc_pusher.cache, terminator.cache] for k, v in list(cache.items())}
+    expected_docs = RevCache.merge([a_doc_pusher.cache, terminator.cache])
     verify_changes(user_no_channels, expected_num_docs=num_docs + 1, expected_num_revisions=0, expected_docs=expected_docs)
 
     # TODO: Fix this inconsistency suite wide
@@ -218,7 +219,7 @@ def test_sync_channel_sanity(params_from_base_test_setup, sg_conf_name):
     time.sleep(20)
 
     # subscriber should recieve all docs
-    all_docs = {k: v for cache in doc_pusher_caches for k, v in list(cache.items())}
+    all_docs = RevCache.merge(doc_pusher_caches)
     verify_changes(subscriber, expected_num_docs=len(channels) * num_docs_per_channel, expected_num_revisions=0, expected_docs=all_docs)
 
     # update subscribers cache so the user knows what docs to update
@@ -296,7 +297,7 @@ def test_sync_role_sanity(params_from_base_test_setup, sg_conf_name):
     # Allow docs to backfill
     time.sleep(5)
 
-    all_tv_docs = {k: v for cache in doc_pusher_caches for k, v in list(cache.items())}
+    all_tv_docs = RevCache.merge(doc_pusher_caches)
     verify_changes(seth, expected_num_docs=num_docs_per_channel * len(tv_channels), expected_num_revisions=0, expected_docs=all_tv_docs)
 
     # Remove seth from tv_stations role
@@ -366,7 +367,7 @@ def test_sync_sanity(params_from_base_test_setup, sg_conf_name):
             kdwb_caches.append(doc_pusher.cache)
 
     # Build global doc_id, rev dict for all docs from all KDWB caches
-    kdwb_docs = {k: v for cache in kdwb_caches for k, v in list(cache.items())}
+    kdwb_docs = RevCache.merge(kdwb_caches)
 
     # wait for changes
     time.sleep(5)
@@ -422,7 +423,7 @@ def test_sync_sanity_backfill(params_from_base_test_setup, sg_conf_name):
     access_doc_pusher.add_doc("access_doc", content="access")
 
     # Build global doc_id, rev dict for all docs from all KDWB caches
-    kdwb_docs = {k: v for cache in kdwb_caches for k, v in list(cache.items())}
+    kdwb_docs = RevCache.merge(kdwb_caches)
 
     # wait for changes
     time.sleep(5)
@@ -484,7 +485,7 @@ def test_sync_require_roles(params_from_base_test_setup, sg_conf_name):
     expected_num_radio_docs = len(radio_stations) * number_of_docs_per_pusher
 
     # All docs that have been pushed with the "radio_stations" role
-    all_radio_docs = {k: v for cache in radio_doc_caches for k, v in list(cache.items())}
+    all_radio_docs = RevCache.merge(radio_doc_caches)
 
     tv_doc_caches = []
     for tv_station in tv_stations:
@@ -495,7 +496,7 @@ def test_sync_require_roles(params_from_base_test_setup, sg_conf_name):
     expected_num_tv_docs = len(tv_stations) * number_of_docs_per_pusher
 
     # All docs that have been pushed with the "tv_stations" role
-    all_tv_docs = {k: v for cache in tv_doc_caches for k, v in list(cache.items())}
+    all_tv_docs = RevCache.merge(tv_doc_caches)
 
     # Read only users
     radio_channels_no_roles_user = admin.register_user(target=cluster.sync_gateways[0], db="db", name="bad_radio_user", password="password", channels=radio_stations)
@@ -507,7 +508,7 @@ def test_sync_require_roles(params_from_base_test_setup, sg_conf_name):
     tv_channel_no_roles_user.add_docs(26, name_prefix="bad_doc", bulk=bulk)
 
     read_only_user_caches = [radio_channels_no_roles_user.cache, tv_channel_no_roles_user.cache]
-    read_only_user_docs = {k: v for cache in read_only_user_caches for k, v in list(cache.items())}
+    read_only_user_docs = RevCache.merge(read_only_user_caches)
 
     # Dictionary should be empty if they were blocked from pushing docs
     assert len(list(read_only_user_docs.items())) == 0
@@ -531,7 +532,7 @@ def test_sync_require_roles(params_from_base_test_setup, sg_conf_name):
     # Verify mogul gets docs for all the channels associated with the radio_stations + tv_stations roles
     all_doc_caches = list(radio_doc_caches)
     all_doc_caches.extend(tv_doc_caches)
-    all_docs = {k: v for cache in all_doc_caches for k, v in list(cache.items())}
+    all_docs = RevCache.merge(all_doc_caches)
 
     for k, v in list(all_docs.items()):
         assert not k.startswith("bad_doc")
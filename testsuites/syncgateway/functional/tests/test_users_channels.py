@@ -5,6 +5,7 @@ import pytest
 from libraries.testkit.admin import Admin
 from libraries.testkit.cluster import Cluster
 from libraries.testkit.verify import verify_changes
+from libraries.testkit.rev_cache import RevCache
 from keywords.MobileRestClient import MobileRestClient
 from keywords.constants import RBAC_FULL_ADMIN
 from requests.auth import HTTPBasicAuth
@@ -87,17 +88,17 @@ def test_multiple_users_multiple_channels(params_from_base_test_setup, sg_conf_n
 
     # Seth should get docs from seth + traun
     seth_subset = [seth.cache, traun.cache]
-    seth_expected_docs = {k: v for cache in seth_subset for k, v in list(cache.items())}
+    seth_expected_docs = RevCache.merge(seth_subset)
     verify_changes([seth], expected_num_docs=num_docs_seth + num_docs_traun, expected_num_revisions=0, expected_docs=seth_expected_docs)
 
     # Adam should get docs from adam + traun
     adam_subset = [adam.cache, traun.cache]
-    adam_expected_docs = {k: v for cache in adam_subset for k, v in list(cache.items())}
+    adam_expected_docs = RevCache.merge(adam_subset)
     verify_changes([adam], expected_num_docs=num_docs_adam + num_docs_traun, expected_num_revisions=0, expected_docs=adam_expected_docs)
 
     # Traun should get docs from seth + adam + traun
     traun_subset = [seth.cache, adam.cache, traun.cache]
-    traun_expected_docs = {k: v for cache in traun_subset for k, v in list(cache.items())}
+    traun_expected_docs = RevCache.merge(traun_subset)
     verify_changes([traun], expected_num_docs=num_docs_seth + num_docs_adam + num_docs_traun, expected_num_revisions=0, expected_docs=traun_expected_docs)
 
 
@@ -167,7 +168,7 @@ def test_muliple_users_single_channel(params_from_base_test_setup, sg_conf_name)
 
     # Each user should get all docs from all users
     all_caches = [seth.cache, adam.cache, traun.cache]
-    all_docs = {k: v for cache in all_caches for k, v in list(cache.items())}
+    all_docs = RevCache.merge(all_caches)
 
     verify_changes([seth, adam, traun], expected_num_docs=num_docs_seth + num_docs_adam + num_docs_traun, expected_num_revisions=0, expected_docs=all_docs)
 
@@ -298,7 +299,7 @@ def test_single_user_single_channel(params_from_base_test_setup, sg_conf_name):
     verify_changes([cbs_user], expected_num_docs=num_cbs_docs, expected_num_revisions=0, expected_docs=cbs_user.cache)
 
     all_doc_caches = [seth.cache, cbs_user.cache]
-    all_docs = {k: v for cache in all_doc_caches for k, v in list(cache.items())}
+    all_docs = RevCache.merge(all_doc_caches)
     verify_changes([admin_user], expected_num_docs=num_cbs_docs + num_seth_docs, expected_num_revisions=0, expected_docs=all_docs)
 
 
@@ -13,7 +13,6 @@ from requests.exceptions import HTTPError
 from keywords.exceptions import ChangesError
 
 from keywords import attachment, document
-from keywords.constants import DATA_DIR
 from keywords.MobileRestClient import MobileRestClient
 from keywords.SyncGateway import sync_gateway_config_path_for_mode
 from keywords.SyncGateway import SyncGateway
@@ -1026,11 +1025,18 @@ def test_sdk_does_not_see_sync_meta(params_from_base_test_setup, sg_conf_name):
     else:
         connection_url = 'couchbase://{}'.format(cbs_ip)
     sdk_client = get_cluster(connection_url, bucket_name)
-    # Add 'number_of_sg_docs' to Sync Gateway
+    # Add 'number_of_sg_docs' to Sync Gateway, keeping the generated attachment content to compare with the server
+    generated_attachments = {}
+
+    def attachments_generator():
+        atts = attachment.generate_2_png_100_100()
+        generated_attachments.update({att.name: att.raw for att in atts})
+        return atts
+
     sg_doc_bodies = document.create_docs(
         doc_id_prefix='sg_docs',
         number=number_of_sg_docs,
-        attachments_generator=attachment.generate_2_png_100_100,
+        attachments_generator=attachments_generator,
         channels=channels
     )
     sg_bulk_resp = sg_client.add_bulk_docs(url=sg_url, db=sg_db, docs=sg_doc_bodies, auth=seth_session)
@@ -1063,20 +1069,15 @@ def test_sdk_does_not_see_sync_meta(params_from_base_test_setup, sg_conf_name):
 
     assert len(doc_ids) == 0
 
-    # Verify attachments stored locally have the same data as those written to the server
+    # Verify the generated attachments have the same data as those written to the server
     if sync_gateway_version < "2.5":
-        for att_file_name, att_doc_id in attachment_name_ids:
+        for att_name, att_doc_id in attachment_name_ids:
 
             att_doc = sdk_client.get(att_doc_id, no_format=True)
             att_bytes = att_doc.content
 
-            local_file_path = '{}/{}'.format(DATA_DIR, att_file_name)
-            log_info('Checking that the generated attachment is the same that is store on server: {}'.format(
-                local_file_path
-            ))
-            with open(local_file_path, 'rb') as local_file:
-                local_bytes = local_file.read()
-                assert att_bytes == local_bytes
+            log_info('Checking that the generated attachment is the same that is store on server: {}'.format(att_name))
+            assert att_bytes == generated_attachments[att_name]
 
 
 @pytest.mark.syncgateway
@@ -12,6 +12,9 @@ from libraries.utilities.log_expvars import log_expvars
 from libraries.utilities.fetch_sync_gateway_profile import fetch_sync_gateway_profile
 from .kill_gateload import kill_gateload
 
+# Seconds between expvar scrapes while gateload runs
+EXPVAR_SCRAPE_INTERVAL_SECS = 5
+
 GateloadParams = collections.namedtuple(
     "GateloadParams",
     [
@@ -97,7 +100,7 @@ def run_gateload_perf_test(gen_gateload_config, test_id, gateload_params, delay_
 
     # write expvars to file, will exit when gateload scenario is done
     print(">>> Logging expvars")
-    gateload_finished_successfully = log_expvars(cluster_config, test_run_id)
+    gateload_finished_successfully = log_expvars(cluster_config, test_run_id, sleep_time=EXPVAR_SCRAPE_INTERVAL_SECS)
 
     print(">>> Fetch Sync Gateway profile")
     fetch_sync_gateway_profile(cluster_config, test_run_id)
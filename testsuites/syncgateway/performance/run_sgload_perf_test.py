@@ -12,7 +12,8 @@ from libraries.utilities.provisioning_config_parser import hosts_for_tag
 from libraries.utilities.fetch_sync_gateway_profile import fetch_sync_gateway_profile
 
 from keywords.utils import log_info
-from keywords.remoteexecutor import RemoteExecutor
+from keywords.constants import RESULTS_DIR
+from keywords.remoteexecutor import RemoteExecutor, TAIL_LINES
 
 
 import argparse
@@ -52,7 +53,13 @@ def execute_sgload(lgs_host, sgload_arg_list, sg_host):
     # eg, "sgload --createreaders --numreaders 100"
     log_info("sgload {}".format(sgload_args_str))
     command = "sgload {}".format(sgload_args_str)
-    rex.must_execute(command)
+    # Keep the full sgload output on disk, only the tail in memory
+    log_dir = os.path.join(RESULTS_DIR, "sgload")
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir)
+    output_file = os.path.join(log_dir, "{}.log".format(lgs_host))
+    log_info("Streaming sgload output to {}".format(output_file))
+    rex.must_execute(command, output_file=output_file, max_lines=TAIL_LINES)
 
     log_info("execute_sgload done.")
 
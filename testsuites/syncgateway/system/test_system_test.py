@@ -7,7 +7,7 @@ from utilities.cluster_config_utils import get_cluster
 from requests import Session
 from requests.exceptions import HTTPError
 
-from keywords import couchbaseserver, document
+from keywords import couchbaseserver, document, sdk_loader
 from keywords.ClusterKeywords import ClusterKeywords
 from keywords.MobileRestClient import MobileRestClient
 from keywords.SyncGateway import sync_gateway_config_path_for_mode, SyncGateway
@@ -745,13 +745,9 @@ def delete_views(cbs_session, cbs_admin_url, bucket_name):
 
 def load_bucket(sdk_client, server_seed_docs):
     # Seed the server with server_seed_docs number of docs
-    num_batches = server_seed_docs / 1000
-    count = 0
-    for batch_num in range(num_batches):
-        docs = {'doc_{}_{}'.format(batch_num, i): {'foo': 'bar'} for i in range(1000)}
-        sdk_client.upsert_multi(docs)
-        count += 1000
-        log_info('Created {} total docs ...'.format(count))
+    docs = (('doc_{}_{}'.format(i // 1000, i % 1000), {'foo': 'bar'}) for i in range(server_seed_docs))
+    report = sdk_loader.load_docs(sdk_client, docs, batch_size=1000)
+    log_info('Created {} total docs ...'.format(report['docs']))
 
 
 def wait_for_view_creation(cbs_session, cbs_admin_url, bucket_name):
@@ -2,12 +2,10 @@ import configparser
 import json
 import os
 import re
-from datetime import timedelta
 from keywords.exceptions import ProvisioningError
 from shutil import copyfile, rmtree
 from subprocess import Popen, PIPE
 from distutils.dir_util import copy_tree
-from couchbase.cluster import PasswordAuthenticator, ClusterTimeoutOptions, ClusterOptions, Cluster
 
 
 class CustomConfigParser(configparser.RawConfigParser):
@@ -37,11 +35,10 @@ class CustomConfigParser(configparser.RawConfigParser):
 
 
 def get_cluster(url, bucket_name):
-    timeout_options = ClusterTimeoutOptions(kv_timeout=timedelta(seconds=30), query_timeout=timedelta(seconds=300))
-    options = ClusterOptions(PasswordAuthenticator("Administrator", "password"), timeout_options=timeout_options)
-    cluster = Cluster(url, options)
-    cluster = cluster.bucket(bucket_name)
-    return cluster.default_collection()
+    """ Returns the default collection of 'bucket_name' over the shared SDK connection for 'url' """
+    # Imported here since keywords.utils imports this module
+    from keywords import sdk_connections
+    return sdk_connections.get_bucket(url, bucket_name).default_collection()
 
 
 def persist_cluster_config_environment_prop(cluster_config, property_name, value, property_name_check=True):
@@ -61,7 +58,7 @@ def persist_cluster_config_environment_prop(cluster_config, property_name, value
         valid_props = ["cbs_ssl_enabled", "xattrs_enabled", "sg_lb_enabled", "sync_gateway_version", "server_version",
                        "no_conflicts_enabled", "sync_gateway_ssl", "sg_use_views", "number_replicas",
                        "delta_sync_enabled", "x509_certs", "hide_product_version", "cbs_developer_preview", "disable_persistent_config",
-                       "server_tls_skip_verify", "disable_tls_server", "disable_admin_auth"]
+                       "server_tls_skip_verify", "disable_tls_server", "disable_admin_auth", "fast_reset"]
         if property_name not in valid_props:
             raise ProvisioningError("Make sure the property you are trying to change is one of: {}".format(valid_props))
 
@@ -370,3 +367,13 @@ def is_admin_auth_disabled(cluster_config):
         return cluster["environment"]["disable_admin_auth"]
     except KeyError:
         return False
+
+
+def is_fast_reset_enabled(cluster_config):
+    """ Loads cluster config to see if fast cluster reset (bucket flush instead of recreate) is enabled """
+
+    cluster = load_cluster_config_json(cluster_config)
+    try:
+        return cluster["environment"]["fast_reset"]
+    except KeyError:
+        return False
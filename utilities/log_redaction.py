@@ -0,0 +1,112 @@
+""" Log redaction checks for sgcollect zips, without zipgrep.
+
+A RedactionIndex reads every member of a zip once, in parallel across members, and records
+each '<ud>...</ud>' span and every line containing one of the patterns given up front
+(ex. user names, passwords, the redaction salt). The checks below then only look at the index.
+"""
+
+import re
+import zipfile
+from collections import Counter, namedtuple
+
+import concurrent.futures
+
+from keywords.exceptions import LogScanningError
+from keywords.utils import log_info
+
+UD_SPAN = re.compile(rb"<ud>.*?</ud>")
+# Redacted user data is replaced with its sha1 digest
+REDACTED_CONTENT = re.compile(r"<ud>[a-f0-9]{40}</ud>")
+
+UdSpan = namedtuple("UdSpan", ["file", "line_number", "content"])
+
+
+def _member_key(member):
+    """ Member path without the top level directory, which differs between the redacted and plain zips """
+    return member.split("/", 1)[-1]
+
+
+def _index_member(zip_path, member, patterns):
+    """ Returns ([UdSpan], {pattern: [(file, line_number)]}) for one zip member """
+
+    encoded_patterns = [(pattern, pattern.encode()) for pattern in patterns]
+    spans = []
+    pattern_lines = {pattern: [] for pattern in patterns}
+    file_key = _member_key(member)
+
+    with zipfile.ZipFile(zip_path) as zf, zf.open(member) as f:
+        for line_number, line in enumerate(f, start=1):
+            if b"<ud>" in line:
+                for match in UD_SPAN.finditer(line):
+                    spans.append(UdSpan(file_key, line_number, match.group(0).decode("utf-8", errors="replace")))
+            for pattern, encoded in encoded_patterns:
+                if encoded in line:
+                    pattern_lines[pattern].append((file_key, line_number))
+
+    return spans, pattern_lines
+
+
+class RedactionIndex:
+    """ '<ud>' spans and pattern occurrences for every member of a zip """
+
+    def __init__(self, zip_path, patterns=None, max_workers=None):
+        self.zip_path = zip_path
+        self.patterns = list(patterns or [])
+        self.ud_spans = []
+        self._pattern_lines = {pattern: [] for pattern in self.patterns}
+
+        with zipfile.ZipFile(zip_path) as zf:
+            members = [info.filename for info in zf.infolist() if not info.is_dir()]
+
+        log_info("Indexing {} members of {}".format(len(members), zip_path))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_index_member, zip_path, member, self.patterns) for member in members]
+            for future in futures:
+                spans, pattern_lines = future.result()
+                self.ud_spans.extend(spans)
+                for pattern, lines in pattern_lines.items():
+                    self._pattern_lines[pattern].extend(lines)
+
+    def find(self, pattern):
+        """ Returns the (file, line_number) of every line containing 'pattern', which must have been indexed """
+
+        try:
+            return self._pattern_lines[pattern]
+        except KeyError:
+            raise ValueError("'{}' was not indexed for {}".format(pattern, self.zip_path))
+
+
+def verify_ud_tags_redacted(plain_index, redacted_index):
+    """ Verifies that both zips have the same number of user data tags on each line of each file
+    and that every tag in the redacted zip is hashed
+    """
+
+    if not plain_index.ud_spans:
+        raise LogScanningError("No user data tags found in {}".format(plain_index.zip_path))
+    if not redacted_index.ud_spans:
+        raise LogScanningError("No user data tags found in {}".format(redacted_index.zip_path))
+
+    # Tags are matched by (file, line_number), so moved tags are caught as well as missing ones
+    plain_locations = Counter((span.file, span.line_number) for span in plain_index.ud_spans)
+    redacted_locations = Counter((span.file, span.line_number) for span in redacted_index.ud_spans)
+    if plain_locations != redacted_locations:
+        mismatches = sorted(
+            (file_key, line_number, plain_locations[(file_key, line_number)], redacted_locations[(file_key, line_number)])
+            for file_key, line_number in set(plain_locations) | set(redacted_locations)
+            if plain_locations[(file_key, line_number)] != redacted_locations[(file_key, line_number)]
+        )
+        raise LogScanningError("User tags count mismatch between redacted ({}) and non-redacted ({}) files at {} lines, "
+                               "ex. (file, line, non-redacted, redacted) {}".format(
+                                   len(redacted_index.ud_spans), len(plain_index.ud_spans), len(mismatches), mismatches[:5]))
+
+    not_hashed = [span for span in redacted_index.ud_spans if REDACTED_CONTENT.fullmatch(span.content) is None]
+    if not_hashed:
+        raise LogScanningError("Hashing failed for {} user data tags, ex. {}".format(len(not_hashed), not_hashed[:5]))
+
+
+def verify_pattern_redacted(redacted_index, pattern):
+    """ Verifies that 'pattern' does not appear anywhere in the redacted zip """
+
+    found = redacted_index.find(pattern)
+    if found:
+        raise LogScanningError("{} was not redacted, found at {}".format(pattern, found[:5]))
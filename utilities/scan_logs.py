@@ -1,6 +1,10 @@
 import argparse
 import os
+import re
 import zipfile
+from collections import namedtuple, OrderedDict
+
+import concurrent.futures
 
 from keywords.utils import log_info
 from keywords.exceptions import LogScanningError
@@ -32,25 +36,131 @@ def unzip_log_files(directory):
             zf.extractall(zip_file_extract_dir)
 
 
-def scan_logs(directory):
-    """ Unzips .zip files and scans directory recursively for .log files and scan them for error key words.
-    Raise an exception if any of the error keywords are found.
+LogHit = namedtuple("LogHit", ["file", "line_number", "patterns", "line"])
+
+# Hits kept per scanned file. Every hit is still counted
+MAX_HITS_PER_FILE = 100
+
+
+class LogScanResult:
+    """ Hits found by scan_log_files and the number of lines each pattern was found on """
+
+    def __init__(self, patterns):
+        self.hits = []
+        self.counts = OrderedDict((pattern, 0) for pattern in patterns)
+        self.files_scanned = 0
+
+    def add(self, hits, counts):
+        self.hits.extend(hits)
+        for pattern, count in counts.items():
+            self.counts[pattern] += count
+        self.files_scanned += 1
+
+    def __bool__(self):
+        return any(self.counts.values())
+
+
+def _compile_patterns(patterns):
+    """ One case insensitive matcher for all of the patterns, so each line is only searched once """
+    if not patterns:
+        # Never matches
+        return re.compile(b"(?!)")
+    return re.compile(b"|".join(re.escape(pattern.encode()) for pattern in patterns), re.IGNORECASE)
+
+
+def _scan_lines(lines, patterns, matcher, file_label, max_hits=MAX_HITS_PER_FILE, stop_at_first=False):
+    """ Scans an iterable of byte lines. Returns (hits, {pattern: number of lines it was found on}).
+    Only lines the combined matcher finds are checked pattern by pattern.
+    """
+
+    lowered_patterns = [(pattern, pattern.lower()) for pattern in patterns]
+    counts = OrderedDict((pattern, 0) for pattern in patterns)
+    hits = []
+    for line_number, line in enumerate(lines, start=1):
+        if matcher.search(line) is None:
+            continue
+
+        text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+        lowered_text = text.lower()
+        found = [pattern for pattern, lowered in lowered_patterns if lowered in lowered_text]
+        for pattern in found:
+            counts[pattern] += 1
+        if len(hits) < max_hits:
+            hits.append(LogHit(file_label, line_number, found, text))
+        if stop_at_first:
+            break
+    return hits, counts
+
+
+def _scan_target(target, patterns, max_hits=MAX_HITS_PER_FILE):
+    """ Scans a log file or, if 'target' is a (zip path, member name) pair, a zip member without extracting it """
+
+    matcher = _compile_patterns(patterns)
+    if isinstance(target, tuple):
+        zip_path, member = target
+        with zipfile.ZipFile(zip_path) as zf, zf.open(member) as f:
+            return _scan_lines(f, patterns, matcher, "{}/{}".format(zip_path, member), max_hits=max_hits)
+
+    with open(target, "rb") as f:
+        return _scan_lines(f, patterns, matcher, target, max_hits=max_hits)
+
+
+def _scan_targets(paths, extension):
+    """ Returns the log files under 'paths' (files or directories), with logs inside .zip files as (zip, member) pairs """
+
+    targets = []
+    for path in paths:
+        if os.path.isdir(path):
+            file_paths = get_file_paths_with_extension(path, extension) + get_file_paths_with_extension(path, ".zip")
+        else:
+            file_paths = [path]
+
+        for file_path in file_paths:
+            if file_path.endswith(".zip"):
+                with zipfile.ZipFile(file_path) as zf:
+                    targets.extend((file_path, name) for name in zf.namelist() if name.endswith(extension))
+            elif file_path.endswith(extension):
+                targets.append(file_path)
+    return targets
+
+
+def scan_log_files(paths, patterns, extension=".log", max_workers=None, max_hits_per_file=MAX_HITS_PER_FILE):
+    """ Scans every 'extension' file under 'paths' (files or directories), including those inside .zip files,
+    for any of 'patterns' (case insensitive). Zipped logs are read as streams rather than extracted.
+    Files are scanned in parallel across a process pool. Returns a LogScanResult.
     """
-    # Unzip logs
-    unzip_log_files(directory)
 
-    log_file_paths = get_file_paths_with_extension(directory, '.log')
+    if isinstance(paths, str):
+        paths = [paths]
+    if not isinstance(patterns, list):
+        raise ValueError("patterns must be a list")
+
+    targets = _scan_targets(paths, extension)
+    result = LogScanResult(patterns)
+    log_info("Scanning {} log files for {}".format(len(targets), patterns))
+
+    if len(targets) <= 1:
+        for target in targets:
+            result.add(*_scan_target(target, patterns, max_hits_per_file))
+        return result
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_scan_target, target, patterns, max_hits_per_file) for target in targets]
+        for future in futures:
+            result.add(*future.result())
+    return result
 
-    found_errors = False
-    for logfile_path in log_file_paths:
-        try:
-            scan_for_errors(logfile_path, ['panic', 'data race'])
-        except LogScanningError:
-            log_info('Error found for: {}'.format(logfile_path))
-            found_errors = True
 
-    if found_errors:
-        raise LogScanningError('Found errors in the sync gateway / sg accel logs!!')
+def scan_logs(directory):
+    """ Scans directory recursively for .log files, including those in .zip files, for error key words.
+    Raise an exception if any of the error keywords are found.
+    """
+
+    result = scan_log_files([directory], ['panic', 'data race'])
+    if result:
+        for hit in result.hits:
+            log_info('Error found for: {}:{}: {}'.format(hit.file, hit.line_number, hit.line))
+        raise LogScanningError('Found errors in the sync gateway / sg accel logs!! {}'.format(dict(result.counts)))
 
 
 def scan_for_errors(log_file_path, error_strings):
@@ -65,14 +175,12 @@ def scan_for_errors(log_file_path, error_strings):
     if not isinstance(error_strings, list):
         raise ValueError('error_strings must be a list')
 
-    # Scan each line in the log file for the words to search for
-    with open(log_file_path) as f:
-        for line in f:
-            for word in error_strings:
-                # convert the word to lowercase and the line to all lower case
-                # which handles the case where 'warning' will catch 'WARNING' and 'Warning', etc
-                if word.lower() in line.lower():
-                    raise LogScanningError('{} found!! Please review: {} '.format(word, log_file_path))
+    # Matching is case insensitive, which handles the case where 'warning' will catch 'WARNING' and 'Warning', etc
+    with open(log_file_path, "rb") as f:
+        hits, _ = _scan_lines(f, error_strings, _compile_patterns(error_strings), log_file_path, stop_at_first=True)
+
+    if hits:
+        raise LogScanningError('{} found!! Please review: {} '.format(hits[0].patterns[0], log_file_path))
 
 
 def scan_for_pattern(logfile_path, pattern_list):
@@ -84,14 +192,11 @@ def scan_for_pattern(logfile_path, pattern_list):
     if not isinstance(pattern_list, list):
         raise ValueError('error_strings must be a list')
 
-    # Scan each line in the log file for the words to search for
-    flag = False
-    for line in open(logfile_path):
-        for word in pattern_list:
-            # convert the word to lowercase and the line to all lower case
-            if word.lower() in line.lower():
-                flag = True
-    if flag is False:
+    # Stop at the first line with any of the words
+    with open(logfile_path, "rb") as f:
+        hits, _ = _scan_lines(f, pattern_list, _compile_patterns(pattern_list), logfile_path, stop_at_first=True)
+
+    if not hits:
         raise LogScanningError('{} Did not find the words !! Please review: {} '.format(pattern_list, logfile_path))
 
 